@@ -0,0 +1,27 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+if [[ "$#" -lt 1 ]]; then
+    echo "Usage: $0 <instance-name> [topic...]" >&2
+    echo "Topics: popup workspace brightness volume metrics (default: all)" >&2
+    exit 1
+fi
+
+INSTANCE_NAME="$1"
+shift
+
+if ! command -v socat >/dev/null 2>&1; then
+    echo "error: socat not found in PATH" >&2
+    exit 1
+fi
+
+# The astal CLI waits for a complete reply, so talk to the instance socket directly.
+SOCKET="${XDG_RUNTIME_DIR:-/run/user/$(id -u)}/astal/${INSTANCE_NAME}.sock"
+if [[ ! -S "${SOCKET}" ]]; then
+    echo "error: no Astal socket at ${SOCKET}" >&2
+    exit 1
+fi
+
+# Requests end with \x04. The app ends the stream when our side closes, so shut-none keeps
+# the socket's write side open after the request and -t keeps reading until the app goes away.
+printf 'subscribe %s\x04' "$*" | exec socat -t 2147483647 - UNIX-CONNECT:"${SOCKET}",shut-none
@@ -1,19 +1,31 @@
 import pathlib
 import json
 
-from gi.repository import Astal, AstalNiri, Gio, AstalIO
+from gi.repository import Astal, AstalNiri, AstalWp, Gio, GLib, AstalIO
 from ui.quicksettings.DeviceMenuWindow import DeviceMenuWindow
 from ui.bar.Bar import Bar
+from ui.bar.Workspaces import Workspaces
 from ui.common.Overlay import Overlay
+from services.Compositor import Compositor
+from services.event_bus import EventBus, StreamSubscriber, encode_event, parse_topics
+from services.ipc_requests import batch_reply, split_batch
+from services.metrics import Metrics, counter_deltas, rss_bytes
+from services.stall_watchdog import StallWatchdog
 
 BASE_DIR = pathlib.Path(__file__).resolve().parent
 CSS_FILE = BASE_DIR.parent / 'generated' / 'style.css'
+# Seconds between "metrics" events while someone is subscribed to them.
+METRICS_INTERVAL_S = 5
 
 class App(Astal.Application):
     system_menu = None
     bars = {}
     overlays = {}
     active_popup = None
+    wp = None
+    speaker = None
+    speaker_handlers = []
+    metrics_ticker = 0
     
     def __init__(self,instance_name = "py_desktop", **kwargs):
         super().__init__(
@@ -30,6 +42,7 @@ class App(Astal.Application):
                 self.add_window(self.bars[mon])
         for bar in self.bars.values():
             bar.present()
+        self._watch_volume()
         
     def _ensure_overlays(self):
         if not self.overlays:
@@ -49,11 +62,14 @@ class App(Astal.Application):
             ov.show()
             
         window.show()
+        EventBus.get_default().publish("popup", {"event": "open", "popup": type(window).__name__})
 
     def close_popups(self):
         if self.active_popup:
+            popup = type(self.active_popup).__name__
             self.active_popup.hide()
             self.active_popup = None
+            EventBus.get_default().publish("popup", {"event": "close", "popup": popup})
         
         for ov in self.overlays.values():
             ov.hide()
@@ -70,25 +86,150 @@ class App(Astal.Application):
         else:
             self.show_popup(self.system_menu)
 
-    def do_astal_application_request(self, msg: str, conn: Gio.SocketConnection) -> None:
-        request = (msg or "").strip().lower()
+    def metrics_snapshot(self):
+        """Counters and latency percentiles for the metrics request; cheap enough to scrape often."""
+        payload = Metrics.get_default().snapshot()
+        compositor = Compositor.get_default()
+        payload["compositor"] = {
+            "events": compositor.event_stats,
+            "event_latency": compositor.event_latency,
+            "focus": compositor.focus_stats,
+        }
+        payload["workspace_widgets"] = Workspaces.widget_stats()
+        watchdog = StallWatchdog.get_default()
+        # Main-loop lag is sampled by the watchdog heartbeat; without it the idle app takes no wakeups.
+        if watchdog is not None:
+            payload["main_loop"] = {"lag": watchdog.lag.summary(), "stalls": watchdog.stalls}
+        else:
+            payload["main_loop"] = {
+                "lag": None,
+                "stalls": None,
+                "reason": "watchdog disabled; set PY_DESKTOP_STALL_WATCHDOG_MS",
+            }
+        return payload
 
-        if request == "ping":
-            AstalIO.write_sock(conn, "pong")
+    def _watch_volume(self):
+        wp = AstalWp.get_default()
+        if wp is None or self.wp is not None:
             return
+        self.wp = wp
+        # Usually unset this early, and it changes with the default sink.
+        wp.connect("notify::default-speaker", self._bind_speaker)
+        self._bind_speaker()
 
-        if request == "status":
-            payload = {
-                "instance_name": self.props.instance_name,
-                "bars": len(self.bars),
-                "overlays": len(self.overlays),
-                "popup_open": self.active_popup is not None,
-                "device_menu_visible": bool(
-                    self.system_menu is not None and self.system_menu.is_visible()
-                ),
-            }
-            AstalIO.write_sock(conn, json.dumps(payload))
+    def _bind_speaker(self, *args):
+        if self.speaker is not None:
+            for handler_id in self.speaker_handlers:
+                self.speaker.disconnect(handler_id)
+        self.speaker_handlers = []
+        self.speaker = self.wp.get_default_speaker()
+        if self.speaker is None:
             return
+        self.speaker_handlers = [
+            self.speaker.connect("notify::volume", self._publish_volume),
+            self.speaker.connect("notify::mute", self._publish_volume),
+        ]
+        if args:
+            self._publish_volume(self.speaker, None)
+
+    def _publish_volume(self, speaker, _pspec):
+        bus = EventBus.get_default()
+        if bus.has_subscribers("volume"):
+            bus.publish("volume", {"volume": round(speaker.get_volume(), 3), "mute": speaker.get_mute()})
+
+    def _start_metrics_ticker(self):
+        if self.metrics_ticker:
+            return
+        previous = Metrics.get_default().counters()
+
+        def tick():
+            nonlocal previous
+            if not EventBus.get_default().has_subscribers("metrics"):
+                self.metrics_ticker = 0
+                return GLib.SOURCE_REMOVE
+            current = Metrics.get_default().counters()
+            deltas = counter_deltas(previous, current)
+            previous = current
+            if deltas:
+                EventBus.get_default().publish("metrics", {"counters": deltas, "rss_bytes": rss_bytes()})
+            return GLib.SOURCE_CONTINUE
+
+        self.metrics_ticker = GLib.timeout_add_seconds(METRICS_INTERVAL_S, tick)
+
+    def status_snapshot(self):
+        return {
+            "instance_name": self.props.instance_name,
+            "bars": len(self.bars),
+            "overlays": len(self.overlays),
+            "popup_open": self.active_popup is not None,
+            "device_menu_visible": bool(
+                self.system_menu is not None and self.system_menu.is_visible()
+            ),
+            "workspace_buttons": Workspaces.widget_stats(),
+        }
+
+    def _subscribe(self, topics_spec, conn):
+        """Keep ``conn`` open and stream NDJSON events to it until the client hangs up.
+
+        The client's end of input (or a failed write) ends the subscription, so a
+        client must keep its side open while it listens.
+        """
+        try:
+            topics = parse_topics(topics_spec.lower())
+        except ValueError as error:
+            AstalIO.write_sock(conn, str(error))
+            return
+
+        def write(data, done):
+            def on_written(stream, result):
+                try:
+                    stream.write_all_finish(result)
+                except GLib.Error:
+                    done(False)
+                    return
+                done(True)
+
+            conn.get_output_stream().write_all_async(data, GLib.PRIORITY_DEFAULT, None, on_written)
+
+        bus = EventBus.get_default()
+        subscriber = StreamSubscriber(write, lambda: conn.close(None))
+        token = bus.subscribe(subscriber.push, topics)
+        subscriber.on_closed = lambda: bus.unsubscribe(token)
+
+        def on_client_read(stream, result):
+            # Anything the client sends after the request is ignored; EOF means it hung up.
+            try:
+                data = stream.read_bytes_finish(result)
+            except GLib.Error:
+                data = None
+            if data is not None and data.get_size() > 0 and not subscriber.closed:
+                stream.read_bytes_async(64, GLib.PRIORITY_DEFAULT, None, on_client_read)
+                return
+            subscriber.close()
+
+        conn.get_input_stream().read_bytes_async(64, GLib.PRIORITY_DEFAULT, None, on_client_read)
+        subscriber.push(encode_event("subscribed", {
+            "topics": sorted(topics) if topics is not None else None,
+            "status": self.status_snapshot(),
+        }))
+        if topics is None or "metrics" in topics:
+            self._start_metrics_ticker()
+
+    def _respond(self, request):
+        request = request.strip().lower()
+
+        if request == "ping":
+            return "pong"
+
+        if request == "status":
+            return json.dumps(self.status_snapshot())
+
+        if request == "metrics":
+            return json.dumps(self.metrics_snapshot())
+
+        if request == "stalls":
+            watchdog = StallWatchdog.get_default()
+            return json.dumps(watchdog.stats() if watchdog is not None else {"enabled": False})
 
         if request == "toggle-device-menu":
             self.toggle_device_menu()
@@ -98,12 +239,32 @@ class App(Astal.Application):
                     self.system_menu is not None and self.system_menu.is_visible()
                 ),
             }
-            AstalIO.write_sock(conn, json.dumps(payload))
-            return
+            return json.dumps(payload)
 
         if request == "close-popups":
             self.close_popups()
-            AstalIO.write_sock(conn, "ok")
+            return "ok"
+
+        if request.split(" ", 1)[0] == "subscribe":
+            return "subscribe cannot be batched"
+
+        return f"unknown request: {request}"
+
+    def do_astal_application_request(self, msg: str, conn: Gio.SocketConnection) -> None:
+        request = (msg or "").strip()
+
+        command, _, argument = request.partition(" ")
+        if command.lower() == "subscribe":
+            self._subscribe(argument, conn)
+            return
+
+        try:
+            batch = split_batch(request)
+        except ValueError as error:
+            AstalIO.write_sock(conn, str(error))
+            return
+        if batch is not None:
+            AstalIO.write_sock(conn, batch_reply([self._respond(command) for command in batch]))
             return
 
-        AstalIO.write_sock(conn, f"unknown request: {request}")
+        AstalIO.write_sock(conn, self._respond(request))
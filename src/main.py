@@ -12,7 +12,6 @@ except OSError:
     sys.exit(1)
 
 import versions
-import asyncio
 from gi.repository import GLib
 
 def parse_args():
@@ -74,18 +73,14 @@ def configure_logging(args):
 
 
 from App import App
-
-def loop_step(loop):
-    loop.call_soon(loop.stop)
-    loop.run_forever()
-    return True
+from services.stall_watchdog import StallWatchdog
+from utils.glib_asyncio import install_glib_event_loop
 
 if __name__ == "__main__":
     args = parse_args()
     configure_logging(args)
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    GLib.timeout_add(10, loop_step, loop)
+    install_glib_event_loop()
+    StallWatchdog.start_from_env(GLib.timeout_add)
 
     app = App(instance_name=args.instance_name)
     app.acquire_socket()
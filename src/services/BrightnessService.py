@@ -6,6 +6,9 @@ import pathlib
 from gi.repository import GObject
 from gi.repository import GLib
 
+from services.event_bus import EventBus
+from services.metrics import Metrics
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("BrightnessService")
 
@@ -26,6 +29,12 @@ def should_skip_ddc_display(connector: str | None, has_sysfs_internal: bool) ->
 def clamp_internal_percent(percent: int, min_percent: int = 1) -> int:
     return max(min_percent, min(100, int(percent)))
 
+def _publish_brightness(monitor) -> None:
+    bus = EventBus.get_default()
+    if bus.has_subscribers("brightness"):
+        bus.publish("brightness", {"monitor": monitor.name, "brightness": monitor.brightness})
+
+
 class SysfsMonitor(GObject.Object):
     name = GObject.Property(type=str)
     brightness = GObject.Property(type=int)
@@ -47,6 +56,7 @@ class SysfsMonitor(GObject.Object):
         self.connect("notify::brightness", self.on_change)
         
     def on_change(self, *args):
+        _publish_brightness(self)
         if self._update_task and not self._update_task.done():
             self._update_task.cancel()
         self._update_task = asyncio.get_event_loop().create_task(self.worker())
@@ -55,8 +65,10 @@ class SysfsMonitor(GObject.Object):
         target = clamp_internal_percent(self.brightness)
         try:
             if shutil.which("brightnessctl"):
+                command = ["brightnessctl", "-d", self.path.name, "s", f"{target}%"]
+                Metrics.get_default().count_spawn(command)
                 proc = await asyncio.create_subprocess_exec(
-                    "brightnessctl", "-d", self.path.name, "s", f"{target}%",
+                    *command,
                     stdout=asyncio.subprocess.DEVNULL,
                     stderr=asyncio.subprocess.DEVNULL
                 )
@@ -84,6 +96,7 @@ class DDCMonitor(GObject.Object):
         self.connect("notify::brightness", self.on_change)
         
     def on_change(self, *args):
+        _publish_brightness(self)
         if self._update_task is None or self._update_task.done():
             self._update_task = asyncio.get_event_loop().create_task(self.worker())
             
@@ -125,13 +138,15 @@ class BrightnessService(GObject.Object):
 
             # 2. External Displays (DDC)
             if shutil.which("ddcutil"):
-                detect = await asyncio.create_subprocess_exec(
-                    "ddcutil", "--terse", "detect",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                
-                stdout, stderr = await detect.communicate()
+                command = ["ddcutil", "--terse", "detect"]
+                Metrics.get_default().count_spawn(command)
+                with Metrics.get_default().timed("ddc.detect"):
+                    detect = await asyncio.create_subprocess_exec(
+                        *command,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                    stdout, stderr = await detect.communicate()
                 output = stdout.decode()
                 
                 if detect.returncode != 0:
@@ -180,10 +195,21 @@ class BrightnessService(GObject.Object):
             self.busy = False
         
     async def read_brightness(self, bus_id) -> int | None:
+        metrics = Metrics.get_default()
+        with metrics.timed("ddc.read"):
+            value = await self._read_brightness(bus_id)
+        metrics.increment("ddc.reads")
+        if value is None:
+            metrics.increment("ddc.read_failures")
+        return value
+
+    async def _read_brightness(self, bus_id) -> int | None:
         try:
             # Short timeout for reading
+            command = ["ddcutil", "--bus", str(bus_id), "--terse", "getvcp", "10"]
+            Metrics.get_default().count_spawn(command)
             proc = await asyncio.create_subprocess_exec(
-                "ddcutil", "--bus", str(bus_id), "--terse", "getvcp", "10",
+                *command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
@@ -205,13 +231,24 @@ class BrightnessService(GObject.Object):
         return None
     
     async def write_brightness(self, bus_id, target_brightness) -> None:
+        metrics = Metrics.get_default()
+        with metrics.timed("ddc.write"):
+            written = await self._write_brightness(bus_id, target_brightness)
+        metrics.increment("ddc.writes")
+        if not written:
+            metrics.increment("ddc.write_failures")
+
+    async def _write_brightness(self, bus_id, target_brightness) -> bool:
         # RETRY LOOP: Try up to 3 times to coerce the monitor
         max_retries = 3
         for attempt in range(1, max_retries + 1):
             try:
                 # 1. Write the value
+                command = ["ddcutil", "--bus", str(bus_id), "setvcp", "10", str(target_brightness)]
+                Metrics.get_default().increment("ddc.write_attempts")
+                Metrics.get_default().count_spawn(command)
                 proc = await asyncio.create_subprocess_exec(
-                    "ddcutil", "--bus", str(bus_id), "setvcp", "10", str(target_brightness),
+                    *command,
                     stdout=asyncio.subprocess.DEVNULL,
                     stderr=asyncio.subprocess.DEVNULL
                 )
@@ -227,7 +264,7 @@ class BrightnessService(GObject.Object):
                 if actual is not None and abs(actual - target_brightness) <= 1:
                     if attempt > 1:
                         logger.info(f"Bus {bus_id}: Coerced brightness to {actual} on attempt {attempt}")
-                    return # Success!
+                    return True # Success!
                 
                 logger.warning(f"Bus {bus_id}: Mismatch (Set: {target_brightness}, Got: {actual}). Retrying {attempt}/{max_retries}...")
                 
@@ -239,6 +276,7 @@ class BrightnessService(GObject.Object):
                 logger.warning(f"Bus {bus_id}: Write error: {e}")
                 
         logger.error(f"Bus {bus_id}: Gave up after {max_retries} attempts. Monitor may be unresponsive.")
+        return False
     
     def update_brightness(self, _object, _psspec):
         # When global brightness changes, update all monitors
@@ -1,15 +1,52 @@
+import asyncio
+import atexit
 import logging
 import os
+import time
+from contextlib import contextmanager
 from typing import Optional
 import versions
-from gi.repository import GObject, Gdk, GLib, AstalHyprland, AstalNiri
+from gi.repository import GObject, Gdk, Gio, GLib, AstalHyprland, AstalNiri
+from services.active_workspace import ActiveWorkspaceTracker
 from services.compositor_match import MonitorTarget, workspace_matches_monitor
-from services.scroll_ipc import ScrollIPC, ScrollWorkspace as ScrollIPCWorkspace
+from services.event_bus import EventBus
+from services.event_coalescer import EventCoalescer
+from services.event_replay import EventRecorder, ReplayBackend
+from services.hyprland_ipc import HyprlandIPC
+from services.latency_stats import LatencyStats
+from services.list_diff import list_splices
+from services.metrics import Metrics
+from services.monitor_index import MonitorBuckets
+from services.monitor_sources import MonitorSources
+from services.niri_ipc import NiriIPC
+from services.optimistic_focus import OptimisticFocus
+from services.scroll_ipc import ScrollIPC
+from services.synthetic_compositor import SyntheticCompositor
+from services.workspace_backend import WorkspaceBackend
+from services.workspace_reconcile import reconcile
+from services.workspace_table import WorkspaceRecord, WorkspaceTable
 
 _log = logging.getLogger("py_desktop.compositor")
 if not logging.getLogger().handlers:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
+_background_tasks = set()
+
+
+def _spawn(coro):
+    """Run ``coro`` on the asyncio loop driven by main.py, keeping a reference until it finishes."""
+    task = asyncio.get_event_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    task.add_done_callback(_log_task_error)
+    return task
+
+
+def _log_task_error(task):
+    # Fire-and-forget tasks (e.g. logout) are never awaited; report failures here instead of at GC.
+    if not task.cancelled() and task.exception() is not None:
+        _log.error("Background task failed", exc_info=task.exception())
+
 class Monitor(GObject.Object):
     __gtype_name__ = "CompositorMonitor"
     
@@ -24,8 +61,8 @@ class Monitor(GObject.Object):
         super().__init__()
         self.native = native
         self.compositor_type = compositor_type
-        self._hyprland_bound = False
-        self._niri_bound = False
+        self._bound_native = None
+        self._bindings = []
         
         match compositor_type:
             case "hyprland":
@@ -33,26 +70,53 @@ class Monitor(GObject.Object):
             case "niri":
                 self.bind_niri(native, niri_connector)
 
+    def _unbind_native(self):
+        for binding in self._bindings:
+            binding.unbind()
+        self._bindings = []
+        self._bound_native = None
+
     def bind_hyprland(self, native):
         if native is None:
             return
         self.native = native
         self.compositor_type = "hyprland"
-        if not self._hyprland_bound:
-            native.bind_property("id", self, "id", GObject.BindingFlags.SYNC_CREATE)
-            native.bind_property("name", self, "name", GObject.BindingFlags.SYNC_CREATE)
-            self._hyprland_bound = True
+        if self._bound_native is not native:
+            # A reconnected output comes back as a new native object; drop the stale bindings.
+            self._unbind_native()
+            self._bindings = [
+                native.bind_property("id", self, "id", GObject.BindingFlags.SYNC_CREATE),
+                native.bind_property("name", self, "name", GObject.BindingFlags.SYNC_CREATE),
+            ]
+            self._bound_native = native
         self.set_property("object", native)
 
     def bind_niri(self, native=None, niri_connector=None):
         self.native = native
         self.compositor_type = "niri"
-        if native is not None and not self._niri_bound:
-            native.bind_property("name", self, "name", GObject.BindingFlags.SYNC_CREATE)
-            self._niri_bound = True
-        elif niri_connector:
+        if native is not None and self._bound_native is not native:
+            self._unbind_native()
+            self._bindings = [
+                native.bind_property("name", self, "name", GObject.BindingFlags.SYNC_CREATE),
+            ]
+            self._bound_native = native
+        elif native is None and niri_connector:
             self.set_property("name", niri_connector)
 
+    def dispose(self):
+        """Release the bindings to native compositor objects; called when the output is gone."""
+        self._unbind_native()
+        self.native = None
+        if self.object is not None:
+            self.set_property("object", None)
+        if self.gdk_monitor is not None:
+            self.gdk_monitor = None
+
+    def bind_output(self, source, connector):
+        self.compositor_type = source
+        if connector and self.name != connector:
+            self.set_property("name", connector)
+
     def update_gdk(self, gdk_monitor=None, gdk_id=None):
         if gdk_monitor is not None:
             self.gdk_monitor = gdk_monitor
@@ -71,7 +135,9 @@ class Monitor(GObject.Object):
         match self.compositor_type:
             case "hyprland":
                 return self.object
-            case "niri":
+            case None:
+                return None
+            case _:
                 return self.name
         
 class Workspace(GObject.Object):
@@ -82,72 +148,123 @@ class Workspace(GObject.Object):
     monitor = GObject.Property(type=Monitor, default=None)
     is_active = GObject.Property(type=bool, default=False)
     is_focused = GObject.Property(type=bool, default=False)
+    is_urgent = GObject.Property(type=bool, default=False)
 
     def __init__(self, native_workspace, compositor_type=None):
         super().__init__()
-        self.native = native_workspace
+        self.native = None
         self.compositor_type = compositor_type
-        self._hypr_focused_binding = None
-        self._hypr_active_binding = None
+        self._native_bindings = []
+        self._native_handlers = []
         
         match compositor_type:
+            case "hyprland" | "niri":
+                self._bind_native(native_workspace)
+            case None:
+                pass
+            case _:
+                # Event-stream backends hand in a BackendWorkspaceHandle snapshot.
+                self.update_record(native_workspace)
+
+    def _bind_native(self, native_workspace):
+        self.native = native_workspace
+        match self.compositor_type:
             case "hyprland":
-                native_workspace.bind_property("id", self, "id", GObject.BindingFlags.SYNC_CREATE)
-                native_workspace.bind_property("name", self, "name", GObject.BindingFlags.SYNC_CREATE)
+                self._native_bindings += [
+                    native_workspace.bind_property("id", self, "id", GObject.BindingFlags.SYNC_CREATE),
+                    native_workspace.bind_property("name", self, "name", GObject.BindingFlags.SYNC_CREATE),
+                ]
                 self._on_hyprland_monitor_changed()
-                native_workspace.connect("notify::monitor", self._on_hyprland_monitor_changed)
+                self._native_handlers.append(
+                    native_workspace.connect("notify::monitor", self._on_hyprland_monitor_changed)
+                )
             case "niri":
-                native_workspace.bind_property("id", self, "id", GObject.BindingFlags.SYNC_CREATE)
-                native_workspace.bind_property("name", self, "name", GObject.BindingFlags.SYNC_CREATE)
-                native_workspace.bind_property("is_active", self, "is_active", GObject.BindingFlags.SYNC_CREATE)
-                native_workspace.bind_property("is_focused", self, "is_focused", GObject.BindingFlags.SYNC_CREATE)
+                self._native_bindings += [
+                    native_workspace.bind_property("id", self, "id", GObject.BindingFlags.SYNC_CREATE),
+                    native_workspace.bind_property("name", self, "name", GObject.BindingFlags.SYNC_CREATE),
+                    native_workspace.bind_property("is_active", self, "is_active", GObject.BindingFlags.SYNC_CREATE),
+                    native_workspace.bind_property("is_focused", self, "is_focused", GObject.BindingFlags.SYNC_CREATE),
+                    native_workspace.bind_property("is_urgent", self, "is_urgent", GObject.BindingFlags.SYNC_CREATE),
+                ]
                 self._on_niri_output_changed(native_workspace)
-                native_workspace.connect("notify::output", self._on_niri_output_changed)
-            case "scroll":
-                self.id = int(getattr(native_workspace, "num", 0))
-                self.name = str(getattr(native_workspace, "name", self.id))
-                self.is_active = bool(getattr(native_workspace, "visible", False))
-                self.is_focused = bool(getattr(native_workspace, "focused", False))
-                output = getattr(native_workspace, "output", None)
-                if output:
-                    self.monitor = Compositor.get_default().get_monitor_for_niri_connector(output)
+                self._native_handlers.append(
+                    native_workspace.connect("notify::output", self._on_niri_output_changed)
+                )
+
+    def _unbind_native(self):
+        for binding in self._native_bindings:
+            binding.unbind()
+        self._native_bindings = []
+        if self.native is not None:
+            for handler_id in self._native_handlers:
+                self.native.disconnect(handler_id)
+        self._native_handlers = []
+
+    def rebind(self, native_workspace):
+        """Point this wrapper at ``native_workspace``; returns whether anything changed."""
+        if native_workspace is self.native:
+            return False
+        self._unbind_native()
+        self._bind_native(native_workspace)
+        return True
+
+    def dispose(self):
+        """Release every binding and handler held on native objects; the wrapper is dead afterwards."""
+        if self.compositor_type in ("hyprland", "niri"):
+            self._unbind_native()
+        self.native = None
+
+    def update_record(self, handle):
+        """Apply a backend workspace snapshot in place; only changed properties notify."""
+        self.native = handle
+        workspace_id = int(handle.id)
+        name = str(handle.name)
+        is_active = bool(handle.active)
+        is_focused = bool(handle.focused)
+        is_urgent = bool(handle.urgent)
+        output = handle.output
+        monitor = Compositor.get_default().get_monitor_for_connector(output) if output else None
+        changed = False
+        if self.id != workspace_id:
+            self.id = workspace_id
+            changed = True
+        if self.name != name:
+            self.name = name
+            changed = True
+        if self.is_active != is_active:
+            self.is_active = is_active
+            changed = True
+        if self.is_focused != is_focused:
+            self.is_focused = is_focused
+            changed = True
+        if self.is_urgent != is_urgent:
+            self.is_urgent = is_urgent
+            changed = True
+        if self.monitor is not monitor:
+            self.monitor = monitor
+            changed = True
+        return changed
     
     def _on_hyprland_monitor_changed(self, *args):
+        # is_active/is_focused are driven by Compositor's per-monitor handlers.
         hypr_monitor = getattr(self.native.props, "monitor", None)
         if hypr_monitor is None:
             _log.warning(
-                "Workspace id=%s name=%s has no monitor; skipping monitor bindings",
+                "Workspace id=%s name=%s has no monitor",
                 self.id,
                 self.name,
             )
             self.monitor = None
-            self.is_focused = False
-            self.is_active = False
+            self.set_active_state(False, False)
             return
 
-        if self._hypr_focused_binding is not None:
-            self._hypr_focused_binding.unbind()
-            self._hypr_focused_binding = None
-        if self._hypr_active_binding is not None:
-            self._hypr_active_binding.unbind()
-            self._hypr_active_binding = None
-
         self.monitor = Compositor.get_default().get_monitor_for_hyprland(hypr_monitor)
-        self._hypr_focused_binding = hypr_monitor.bind_property(
-            "focused",
-            self,
-            "is_focused",
-            GObject.BindingFlags.SYNC_CREATE,
-        )
-        self._hypr_active_binding = hypr_monitor.bind_property(
-            "active_workspace",
-            self,
-            "is_active",
-            GObject.BindingFlags.SYNC_CREATE,
-            lambda _binding, workspace: bool(
-                workspace is not None and workspace.props.id == self.id
-            ),
-        )
+
+    def set_active_state(self, is_active, is_focused):
+        if self.is_active != is_active:
+            self.is_active = is_active
+        if self.is_focused != is_focused:
+            self.is_focused = is_focused
 
     def _on_niri_output_changed(self, *args):
         output = getattr(self.native.props, "output", None)
@@ -156,38 +273,43 @@ class Workspace(GObject.Object):
             self.monitor = Compositor.get_default().get_monitor_for_niri_connector(output)
 
     def focus(self):
-        self.native.focus()
+        """Ask the compositor to focus this workspace; backend handles return the request task."""
+        return self.native.focus()
 
 
-class ScrollWorkspaceHandle:
-    def __init__(self, workspace: ScrollIPCWorkspace, ipc: ScrollIPC):
-        self.num = workspace.num
-        self.name = workspace.name
-        self.output = workspace.output
-        self.focused = workspace.focused
-        self.visible = workspace.visible
-        self._ipc = ipc
+class BackendWorkspaceHandle:
+    def __init__(self, record: WorkspaceRecord, backend: WorkspaceBackend):
+        self.record = record
+        self.key = record.key
+        self.id = record.id
+        self.name = record.name
+        self.output = record.output
+        self.focused = record.focused
+        self.active = record.active
+        self.urgent = record.urgent
+        self._backend = backend
 
     def focus(self):
-        ws = ScrollIPCWorkspace(
-            num=self.num,
-            name=self.name,
-            output=self.output,
-            focused=self.focused,
-            visible=self.visible,
-        )
-        self._ipc.focus_workspace(ws)
+        return _spawn(self._backend.focus_record_async(self.record))
 
 class MonitorManager:
-    def __init__(self, gdk_display, niri=None, hyprland=None):
+    def __init__(self, gdk_display, niri=None, hyprland=None, on_monitor_removed=None):
         self._gdk_display = gdk_display
         self._niri = niri
         self._hyprland = hyprland
+        self._on_monitor_removed = on_monitor_removed
+        # Which sources still report each connector; a Monitor is dropped once none does.
+        self._sources = MonitorSources()
 
         self._monitors = []
         self._monitors_by_name = {}
         self._monitors_by_gdk_monitor = {}
         self._monitors_by_gdk_id = {}
+        # Connector -> Monitor for Niri; rebuilt only on notify::outputs.
+        self._monitors_by_niri_connector = {}
+        # Source -> {connector: Monitor} for event-stream backends (Scroll, ...);
+        # rebuilt only when that source's output set changes.
+        self._monitors_by_output = {}
 
         self._sync_gdk_monitors()
         if self._gdk_display is not None:
@@ -229,6 +351,9 @@ class MonitorManager:
             self._monitors_by_gdk_id[gdk_id] = monitor
         return monitor
 
+    def get_monitor_for_gdk_id(self, gdk_id):
+        return self._monitors_by_gdk_id.get(gdk_id)
+
     def get_monitor_for_hyprland(self, hypr_monitor):
         if hypr_monitor is None:
             return None
@@ -248,15 +373,80 @@ class MonitorManager:
     def get_monitor_for_niri_connector(self, connector):
         if not connector:
             return None
-        if self._niri is not None:
-            for output in self._niri.get_outputs():
-                name = getattr(output.props, "name", None)
-                if name == connector:
-                    return self.get_monitor_for_niri_output(output)
+        monitor = self._monitors_by_niri_connector.get(connector)
+        if monitor is not None:
+            return monitor
+        # Not (yet) among the outputs; the next notify::outputs binds it to the real output
+        # or prunes it.
+        self._sources.add("niri", connector)
         monitor = self._get_or_create_monitor_by_name(connector)
         monitor.bind_niri(None, connector)
         return monitor
 
+    def get_monitor_for_hyprland_name(self, name):
+        if not name:
+            return None
+        monitor = self._monitors_by_name.get(name)
+        if monitor is None:
+            # Reported by socket2 before AstalHyprland; notify::monitors binds or prunes it.
+            self._sources.add("hyprland", name)
+            monitor = self._get_or_create_monitor_by_name(name)
+        return monitor
+
+    def get_monitor_for_output(self, source, connector):
+        if not connector:
+            return None
+        by_connector = self._monitors_by_output.setdefault(source, {})
+        monitor = by_connector.get(connector)
+        if monitor is None:
+            # Output list not known yet (or lagging a hotplug); index it until the next sync.
+            self._sources.add(source, connector)
+            monitor = self._get_or_create_monitor_by_name(connector)
+            monitor.bind_output(source, connector)
+            by_connector[connector] = monitor
+        return monitor
+
+    def sync_outputs(self, source, outputs):
+        connectors = {output.name for output in outputs}
+        if connectors == set(self._monitors_by_output.get(source, ())):
+            return False
+        by_connector = {}
+        for connector in connectors:
+            monitor = self._get_or_create_monitor_by_name(connector)
+            monitor.bind_output(source, connector)
+            by_connector[connector] = monitor
+        self._monitors_by_output[source] = by_connector
+        self._prune(source, connectors)
+        return True
+
+    def get_monitor_for_scroll_connector(self, connector):
+        return self.get_monitor_for_output("scroll", connector)
+
+    def sync_scroll_outputs(self, outputs):
+        return self.sync_outputs("scroll", outputs)
+
+    def _prune(self, source, names):
+        for name in self._sources.update(source, names):
+            self._remove_monitor(name)
+
+    def _remove_monitor(self, name):
+        monitor = self._monitors_by_name.pop(name, None)
+        if monitor is None:
+            return
+        self._monitors.remove(monitor)
+        for index in (
+            self._monitors_by_gdk_monitor,
+            self._monitors_by_gdk_id,
+            self._monitors_by_niri_connector,
+            *self._monitors_by_output.values(),
+        ):
+            for key in [key for key, value in index.items() if value is monitor]:
+                del index[key]
+        monitor.dispose()
+        _log.info("Monitor removed: %s", name)
+        if self._on_monitor_removed is not None:
+            self._on_monitor_removed(monitor)
+
     def _sync_gdk_monitors(self, *args):
         if self._gdk_display is None:
             return
@@ -270,26 +460,45 @@ class MonitorManager:
             monitor = self.get_monitor_for_gdk_monitor(gdk_monitor, i)
             by_gdk[gdk_monitor] = monitor
             by_gdk_id[i] = monitor
+        for monitor in self._monitors_by_gdk_monitor.values():
+            if monitor not in by_gdk.values() and monitor.gdk_monitor is not None:
+                monitor.gdk_monitor = None
         self._monitors_by_gdk_monitor = by_gdk
         self._monitors_by_gdk_id = by_gdk_id
+        self._prune("gdk", [monitor.name for monitor in by_gdk.values()])
 
     def _sync_niri_outputs(self, *args):
         if self._niri is None:
             return
+        by_connector = {}
         for output in self._niri.get_outputs():
-            self.get_monitor_for_niri_output(output)
+            monitor = self.get_monitor_for_niri_output(output)
+            connector = getattr(output.props, "name", None)
+            if connector:
+                by_connector[connector] = monitor
+        self._monitors_by_niri_connector = by_connector
+        self._prune("niri", by_connector)
 
     def _sync_hyprland_monitors(self, *args):
         if self._hyprland is None:
             return
+        names = []
         for h_mon in self._hyprland.get_monitors():
-            self.get_monitor_for_hyprland(h_mon)
+            monitor = self.get_monitor_for_hyprland(h_mon)
+            names.append(monitor.name)
+        self._prune("hyprland", names)
 
 class Compositor(GObject.GObject):
     _instance = None
     
     __gsignals__ = {
-        'workspaces-changed': (GObject.SignalFlags.RUN_FIRST, None, ()),
+        # Emitted as workspaces-changed::<connector> once per monitor whose workspaces changed, or
+        # undetailed when no monitor's list did; undetailed handlers therefore run once per monitor.
+        'workspaces-changed': (GObject.SignalFlags.RUN_FIRST | GObject.SignalFlags.DETAILED, None, ()),
+        'workspace-added': (GObject.SignalFlags.RUN_FIRST, None, (Workspace,)),
+        'workspace-removed': (GObject.SignalFlags.RUN_FIRST, None, (Workspace,)),
+        'workspace-changed': (GObject.SignalFlags.RUN_FIRST, None, (Workspace,)),
+        'monitor-removed': (GObject.SignalFlags.RUN_FIRST, None, (Monitor,)),
     }
 
     @classmethod
@@ -310,30 +519,89 @@ class Compositor(GObject.GObject):
         self._monitor_manager = None
         
         self._workspaces = []
+        # Native id -> Workspace; wrappers survive syncs and are updated in place.
+        self._workspaces_by_key = {}
+        self._batch_depth = 0
+        self._layout_dirty = False
+        self._workspace_model = Gio.ListStore(item_type=Workspace)
+        # Monitor -> Gio.ListStore of its workspaces, created on first request.
+        self._monitor_models = {}
+        # Monitor -> its workspaces, maintained from notify::monitor.
+        self._workspaces_by_monitor = MonitorBuckets(order=lambda ws: ws.id)
+        # One notify::active-workspace/notify::focused pair per Hyprland monitor.
+        self._hypr_monitor_handlers = {}
+        self._hypr_active = ActiveWorkspaceTracker(self._workspaces_by_key.get, self._set_hyprland_active)
+        # Event-stream backend (Scroll, Hyprland socket2, Niri IPC, synthetic) mirrored through a WorkspaceTable.
+        self._backend: Optional[WorkspaceBackend] = None
+        self._backend_table = WorkspaceTable()
+        self._backend_events = EventCoalescer(GLib.idle_add, self._flush_backend_events)
+        self._backend_resync_task = None
+        # Events that arrive while a resync query is in flight; replayed on top of its result.
+        self._backend_deferred_events = []
+        # Arrival times of events whose effect is only visible once the pending resync lands.
+        self._backend_resync_waiting = []
+        # Event in -> workspaces-changed handlers (bars included) returned.
+        self._event_latency = LatencyStats()
+        self._event_recorder = None
+        # Clicked workspace shown active before the compositor confirms it.
+        self._focus_prediction = OptimisticFocus(timeout=1.0)
+        # Last workspace sent to "workspace" subscribers of the IPC event stream.
+        self._published_focus = None
         
         if "hyprland" in self._desktop:
             self._hyprland = AstalHyprland.get_default()
-            self._hyprland.connect("notify::workspaces", self._sync_hyprland_workspaces)
+            if os.environ.get("PY_DESKTOP_HYPRLAND_BACKEND") == "socket2":
+                backend = HyprlandIPC()
+                if backend.available():
+                    self._backend = backend
+                else:
+                    _log.warning("Hyprland socket2 not found, using AstalHyprland workspaces")
+            if self._backend is None:
+                self._hyprland.connect("notify::workspaces", self._sync_hyprland_workspaces)
+                self._hyprland.connect("notify::monitors", self._sync_hyprland_monitor_handlers)
         elif "niri" in self._desktop:
             self._niri = AstalNiri.get_default()
-            self._niri.connect("notify::workspaces", self._sync_niri_workspaces)
+            if os.environ.get("PY_DESKTOP_NIRI_BACKEND") == "ipc":
+                backend = NiriIPC()
+                if backend.available():
+                    self._backend = backend
+                else:
+                    _log.warning("NIRI_SOCKET not found, using AstalNiri workspaces")
+            if self._backend is None:
+                self._niri.connect("notify::workspaces", self._sync_niri_workspaces)
         elif "scroll" in self._desktop:
             self._scroll = ScrollIPC()
+            self._backend = self._scroll
+        elif "synthetic" in self._desktop:
+            # Headless generated monitors/workspaces for scale and performance tests.
+            self._backend = SyntheticCompositor.from_env()
+        elif "replay" in self._desktop:
+            # PY_DESKTOP_REPLAY=<recording>; reports latency percentiles once played back.
+            self._backend = ReplayBackend.from_env()
+            self._backend.on_finished = lambda: GLib.idle_add(self._on_replay_finished)
+
+        record_path = os.environ.get("PY_DESKTOP_RECORD_EVENTS")
+        if record_path and self._backend is not None:
+            self._event_recorder = EventRecorder(record_path, self._backend)
+            # A .gz recording is only readable in full once closed; also covers sys.exit from main.py.
+            atexit.register(self.stop_recording)
+            _log.info("Recording %s events to %s", self._backend.compositor_type, record_path)
         
         self._monitor_manager = MonitorManager(
             self._gdk_display,
             niri=self._niri,
             hyprland=self._hyprland,
+            on_monitor_removed=self._on_monitor_removed,
         )
 
-        if self.is_hyprland:
+        if self._backend is not None:
+            self._sync_backend_workspaces(refresh_outputs=True)
+            self._backend.start_event_monitor(self._on_backend_event)
+        elif self.is_hyprland:
+            self._sync_hyprland_monitor_handlers()
             self._sync_hyprland_workspaces()
         elif self.is_niri:
             self._sync_niri_workspaces()
-        elif self.is_scroll:
-            self._sync_scroll_workspaces()
-            if self._scroll is not None:
-                self._scroll.start_event_monitor(self._on_scroll_event)
 
     @property
     def is_hyprland(self):
@@ -347,6 +615,14 @@ class Compositor(GObject.GObject):
     def is_scroll(self):
         return "scroll" in self._desktop
 
+    @property
+    def is_synthetic(self):
+        return "synthetic" in self._desktop
+
+    @property
+    def backend(self):
+        return self._backend
+
     @property
     def hyprland(self):
         return self._hyprland
@@ -356,13 +632,36 @@ class Compositor(GObject.GObject):
         return self._workspaces
         
 
+    @property
+    def workspace_model(self):
+        """All workspaces as a Gio.ListModel; emits positional items-changed on every sync."""
+        return self._workspace_model
+
     @property
     def monitors(self):
         return self._monitor_manager.monitors
 
+    @property
+    def event_stats(self):
+        """Coalescing counters of the event-stream backend."""
+        return self._backend_events.stats()
+
+    @property
+    def focus_stats(self):
+        """How often optimistic focus was right, and how long confirmation took."""
+        return self._focus_prediction.stats()
+
+    @property
+    def event_latency(self):
+        """Percentiles of backend event -> handled workspaces-changed latency."""
+        return self._event_latency.summary()
+
     def get_monitor_for_gdk_monitor(self, gdk_monitor, gdk_id=None):
         return self._monitor_manager.get_monitor_for_gdk_monitor(gdk_monitor, gdk_id)
 
+    def get_monitor_for_gdk_id(self, gdk_id):
+        return self._monitor_manager.get_monitor_for_gdk_id(gdk_id)
+
     def get_monitor_for_hyprland(self, hypr_monitor):
         return self._monitor_manager.get_monitor_for_hyprland(hypr_monitor)
 
@@ -372,8 +671,50 @@ class Compositor(GObject.GObject):
     def get_monitor_for_niri_connector(self, connector):
         return self._monitor_manager.get_monitor_for_niri_connector(connector)
 
+    def get_monitor_for_scroll_connector(self, connector):
+        return self._monitor_manager.get_monitor_for_scroll_connector(connector)
+
+    def get_monitor_for_connector(self, connector):
+        """Monitor for an output name reported by the event-stream backend."""
+        match self._backend.monitor_source:
+            case "hyprland":
+                return self._monitor_manager.get_monitor_for_hyprland_name(connector)
+            case "niri":
+                return self._monitor_manager.get_monitor_for_niri_connector(connector)
+            case source:
+                return self._monitor_manager.get_monitor_for_output(source, connector)
+
+    def _resolve_monitor(self, monitor=None, gdk_id=None, gdk_monitor=None):
+        if isinstance(monitor, Monitor):
+            return monitor
+        if isinstance(monitor, Gdk.Monitor):
+            gdk_monitor = monitor
+        if gdk_monitor is not None:
+            return self._monitor_manager.get_monitor_for_gdk_monitor(gdk_monitor)
+        if gdk_id is not None:
+            return self._monitor_manager.get_monitor_for_gdk_id(gdk_id)
+        return None
+
+    def get_workspace_model(self, monitor=None, gdk_id=None, gdk_monitor=None):
+        """Gio.ListModel of the workspaces on one monitor, or of all when no monitor is given."""
+        if monitor is None and gdk_id is None and gdk_monitor is None:
+            return self._workspace_model
+        target = self._resolve_monitor(monitor, gdk_id, gdk_monitor)
+        if target is None:
+            return Gio.ListStore(item_type=Workspace)
+        model = self._monitor_models.get(target)
+        if model is None:
+            model = Gio.ListStore(item_type=Workspace)
+            model.splice(0, 0, self._workspaces_by_monitor.get(target))
+            self._monitor_models[target] = model
+        return model
+
     def get_workspaces_for_monitor(self, monitor=None, gdk_id=None, gdk_monitor=None):
-        target_monitor = None
+        target_monitor = self._resolve_monitor(monitor, gdk_id, gdk_monitor)
+        if target_monitor is not None:
+            return list(self._workspaces_by_monitor.get(target_monitor))
+
+        # Monitor not known to MonitorManager (yet): fall back to matching every workspace.
         if isinstance(monitor, Monitor):
             target_monitor = monitor
         elif isinstance(monitor, Gdk.Monitor):
@@ -390,6 +731,98 @@ class Compositor(GObject.GObject):
             if workspace_matches_monitor(ws.monitor, target)
         ]
 
+    def focus_workspace(self, workspace):
+        """Focus ``workspace``, showing it active right away and rolling back if the compositor disagrees."""
+        touched = [workspace]
+        for other in self._workspaces_by_monitor.get(workspace.monitor):
+            if other is not workspace and other.is_active:
+                other.set_active_state(False, False)
+                touched.append(other)
+        for other in self._workspaces:
+            if other is not workspace and other.is_focused:
+                other.set_active_state(other.is_active, False)
+                touched.append(other)
+        workspace.set_active_state(True, True)
+        prediction = self._focus_prediction.predict(
+            self._workspace_key(workspace),
+            self._actual_focused_key(),
+            touched,
+        )
+        GLib.timeout_add(int(self._focus_prediction.timeout * 1000), self._on_focus_timeout, prediction)
+
+        request = workspace.focus()
+        if isinstance(request, asyncio.Future):
+            request.add_done_callback(lambda task: self._on_focus_request_done(prediction, task))
+
+    def _on_focus_request_done(self, prediction, task):
+        ok = not task.cancelled() and task.exception() is None and task.result() is not False
+        if not ok and self._focus_prediction.fail(prediction):
+            _log.warning("Workspace focus request failed; rolling back")
+            self._restore_active_state(prediction.touched)
+
+    def _on_focus_timeout(self, prediction):
+        if self._focus_prediction.expire(prediction):
+            _log.warning("Workspace focus not confirmed in time; rolling back")
+            self._restore_active_state(prediction.touched)
+        return False
+
+    def _observe_focus(self, *args):
+        if self._focus_prediction.pending is not None:
+            self._focus_prediction.observe(self._actual_focused_key())
+        self._publish_focus()
+
+    def _publish_focus(self):
+        bus = EventBus.get_default()
+        if not bus.has_subscribers("workspace"):
+            self._published_focus = None
+            return
+        # Compositor-confirmed focus only; optimistic clicks are not announced. Niri notifies
+        # the old workspace before the new one, so skip the moment nothing is focused.
+        focused = self._workspaces_by_key.get(self._actual_focused_key())
+        if focused is None or focused is self._published_focus:
+            return
+        self._published_focus = focused
+        bus.publish("workspace", {
+            "event": "focus",
+            "id": focused.id,
+            "name": focused.name,
+            "monitor": focused.monitor.name if focused.monitor is not None else None,
+        })
+
+    @staticmethod
+    def _workspace_key(workspace):
+        if isinstance(workspace.native, BackendWorkspaceHandle):
+            return workspace.native.key
+        return workspace.id
+
+    def _actual_focused_key(self):
+        """Focused workspace key as last reported by the compositor, ignoring optimistic state."""
+        if self._backend is not None:
+            return self._backend_table.focused_key
+        if self.is_hyprland:
+            focused = self._hyprland.props.focused_workspace
+            return focused.props.id if focused is not None else None
+        for key, workspace in self._workspaces_by_key.items():
+            if workspace.native is not None and workspace.native.props.is_focused:
+                return key
+        return None
+
+    def _restore_active_state(self, workspaces):
+        for workspace in workspaces:
+            if workspace.native is None:
+                continue
+            if isinstance(workspace.native, BackendWorkspaceHandle):
+                record = self._backend_table.get(workspace.native.key)
+                if record is not None:
+                    workspace.set_active_state(record.active, record.focused)
+            elif workspace.compositor_type == "hyprland":
+                self._set_hyprland_active(workspace, self._hypr_active.is_active(workspace.id))
+            else:
+                workspace.set_active_state(
+                    bool(workspace.native.props.is_active),
+                    bool(workspace.native.props.is_focused),
+                )
+
     def do_screen_transition(self, delay_ms=0):
         """
         Triggers a screen transition if the compositor supports it.
@@ -403,49 +836,284 @@ class Compositor(GObject.GObject):
             except Exception as e:
                 _log.warning(f"Failed to trigger Niri screen transition: {e}")
 
+    def stop_recording(self):
+        """Close the PY_DESKTOP_RECORD_EVENTS recording, if one is running."""
+        recorder, self._event_recorder = self._event_recorder, None
+        if recorder is not None:
+            recorder.close()
+
     def logout(self):
+        # The compositor may take this process down with it; finish the recording first.
+        self.stop_recording()
         if self.is_hyprland and self._hyprland is not None:
+             if self._backend is not None:
+                 self._backend.stop_event_monitor()
              self._hyprland.dispatch("exit", "")
         elif self.is_niri:
+             if self._backend is not None:
+                 self._backend.stop_event_monitor()
              AstalNiri.msg.quit(True)
         elif self.is_scroll:
              if self._scroll is not None:
                  self._scroll.stop_event_monitor()
-                 self._scroll.quit()
+                 _spawn(self._scroll.quit_async())
+
+    @contextmanager
+    def _workspace_batch(self):
+        """Collapse every layout change made inside the block into one workspaces-changed per affected monitor."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._layout_dirty:
+                self._layout_dirty = False
+                self._emit_layout_changed()
+
+    def _mark_layout_changed(self):
+        if self._batch_depth:
+            self._layout_dirty = True
+        else:
+            self._emit_layout_changed()
+
+    def _emit_layout_changed(self):
+        touched = self._workspaces_by_monitor.take_touched()
+        self._update_models(touched)
+        connectors = sorted({monitor.name for monitor in touched if monitor is not None and monitor.name})
+        if not connectors:
+            self.emit("workspaces-changed")
+        for connector in connectors:
+            self.emit(f"workspaces-changed::{connector}")
+
+    def _update_models(self, monitors):
+        self._splice_model(self._workspace_model, self._workspaces)
+        for monitor in monitors:
+            model = self._monitor_models.get(monitor)
+            if model is not None:
+                self._splice_model(model, self._workspaces_by_monitor.get(monitor))
+
+    @staticmethod
+    def _splice_model(model, workspaces):
+        current = [model.get_item(i) for i in range(model.get_n_items())]
+        for position, n_removed, added in list_splices(current, workspaces):
+            model.splice(position, n_removed, added)
+
+    def _on_monitor_removed(self, monitor):
+        self._monitor_models.pop(monitor, None)
+        # Workspaces still pointing at it get refiled on their next notify::monitor.
+        self._workspaces_by_monitor.drop(monitor)
+        self.emit("monitor-removed", monitor)
+
+    def _add_workspace(self, workspace):
+        self._workspaces_by_monitor.assign(workspace, workspace.monitor)
+        workspace.connect("notify::monitor", self._on_workspace_monitor_changed)
+        if workspace.compositor_type == "hyprland":
+            self._set_hyprland_active(workspace, self._hypr_active.is_active(workspace.id))
+        elif workspace.compositor_type == "niri":
+            # Focus reaches the wrapper through its is-focused binding.
+            workspace.connect("notify::is-focused", self._observe_focus)
+        self.emit("workspace-added", workspace)
+
+    def _remove_workspace(self, workspace):
+        self._workspaces_by_monitor.remove(workspace)
+        workspace.disconnect_by_func(self._on_workspace_monitor_changed)
+        if workspace.compositor_type == "niri":
+            workspace.disconnect_by_func(self._observe_focus)
+        workspace.dispose()
+        self.emit("workspace-removed", workspace)
+
+    def _on_workspace_monitor_changed(self, workspace, _pspec):
+        if workspace.compositor_type == "hyprland" and workspace.native is not None:
+            self._set_hyprland_active(workspace, self._hypr_active.is_active(workspace.id))
+        if self._workspaces_by_monitor.assign(workspace, workspace.monitor):
+            self.emit("workspace-changed", workspace)
+            self._mark_layout_changed()
+
+    def _reconcile_native_workspaces(self, natives, compositor_type):
+        Metrics.get_default().increment("compositor.workspace_syncs")
+        with Metrics.get_default().timed("compositor.workspace_sync"), self._workspace_batch():
+            result = reconcile(
+                self._workspaces_by_key,
+                natives,
+                key=lambda native: native.props.id,
+                create=lambda native: Workspace(native, compositor_type),
+                update=lambda workspace, native: workspace.rebind(native),
+            )
+            for workspace in result.removed:
+                self._remove_workspace(workspace)
+            for workspace in result.added:
+                self._add_workspace(workspace)
+            for workspace in result.changed:
+                self.emit("workspace-changed", workspace)
+            if result.layout_changed:
+                self._workspaces = result.ordered
+                self._mark_layout_changed()
+        return result
+
+    def _sync_hyprland_monitor_handlers(self, *args):
+        current = list(self._hyprland.get_monitors())
+        for hypr_monitor in list(self._hypr_monitor_handlers):
+            if hypr_monitor not in current:
+                for handler_id in self._hypr_monitor_handlers.pop(hypr_monitor):
+                    hypr_monitor.disconnect(handler_id)
+                self._hypr_active.forget(hypr_monitor)
+        for hypr_monitor in current:
+            if hypr_monitor in self._hypr_monitor_handlers:
+                continue
+            self._hypr_monitor_handlers[hypr_monitor] = [
+                hypr_monitor.connect("notify::active-workspace", self._on_hyprland_active_workspace),
+                hypr_monitor.connect("notify::focused", self._on_hyprland_monitor_focused),
+            ]
+            self._on_hyprland_active_workspace(hypr_monitor)
+
+    def _on_hyprland_active_workspace(self, hypr_monitor, *_args):
+        active = hypr_monitor.props.active_workspace
+        self._hypr_active.activate(hypr_monitor, active.props.id if active is not None else None)
+        self._observe_focus()
+
+    def _on_hyprland_monitor_focused(self, hypr_monitor, *_args):
+        workspace_id = self._hypr_active.active(hypr_monitor)
+        workspace = self._workspaces_by_key.get(workspace_id)
+        if workspace is not None:
+            workspace.set_active_state(True, bool(hypr_monitor.props.focused))
+        self._observe_focus()
+
+    def _set_hyprland_active(self, workspace, is_active):
+        hypr_monitor = getattr(workspace.native.props, "monitor", None) if workspace.native is not None else None
+        is_focused = bool(is_active and hypr_monitor is not None and hypr_monitor.props.focused)
+        workspace.set_active_state(is_active, is_focused)
 
     def _sync_hyprland_workspaces(self, *args):
         _log.info("Sync hyprland workspaces")
-        ws_list = []
-        for h_ws in sorted(self._hyprland.props.workspaces, key=lambda w: w.props.id):
-            if h_ws.props.id >= 0:
-                ws_list.append(Workspace(h_ws, "hyprland"))
-        
-        self._workspaces = ws_list
-        _log.info("Hyprland workspaces count=%s ids=%s", len(self._workspaces), [w.id for w in self._workspaces])
-        self.emit("workspaces-changed")
+        natives = sorted(
+            (h_ws for h_ws in self._hyprland.props.workspaces if h_ws.props.id >= 0),
+            key=lambda w: w.props.id,
+        )
+        result = self._reconcile_native_workspaces(natives, "hyprland")
+        _log.info(
+            "Hyprland workspaces count=%s added=%s removed=%s",
+            len(self._workspaces),
+            len(result.added),
+            len(result.removed),
+        )
 
     def _sync_niri_workspaces(self, *args):
         _log.info("Sync niri workspaces")
-        ws_list = []
-        for n_ws in self._niri.get_workspaces():
-            ws_list.append(Workspace(n_ws, "niri"))
-            
-        self._workspaces = sorted(ws_list, key=lambda w: w.id if isinstance(w.id, int) else str(w.id))
-        _log.info("Niri workspaces count=%s ids=%s", len(self._workspaces), [w.id for w in self._workspaces])
-        self.emit("workspaces-changed")
+        natives = sorted(self._niri.get_workspaces(), key=lambda w: w.props.id)
+        result = self._reconcile_native_workspaces(natives, "niri")
+        _log.info(
+            "Niri workspaces count=%s added=%s removed=%s",
+            len(self._workspaces),
+            len(result.added),
+            len(result.removed),
+        )
+
+    def _on_backend_event(self, payload=None):
+        # Called from the monitor thread; bursts are applied together on the main loop.
+        recorder = self._event_recorder
+        if recorder is not None:
+            recorder.event(payload)
+        self._backend_events.push((time.perf_counter(), payload))
+
+    def feed_backend_events(self, payloads):
+        """Apply ``payloads`` synchronously, as one coalesced batch would be."""
+        now = time.perf_counter()
+        self._flush_backend_events([(now, payload) for payload in payloads])
 
-    def _on_scroll_event(self):
-        GLib.idle_add(self._sync_scroll_workspaces)
+    def _flush_backend_events(self, events):
+        if self._backend_resync_task is not None:
+            self._backend_deferred_events.extend(events)
+            return
+        changed = set()
+        applied = []
+        for index, (received_at, payload) in enumerate(events):
+            if self._backend.needs_output_refresh(payload):
+                # Hotplug can also move workspaces; resync both, outputs first.
+                self._backend_resync_waiting.extend(stamp for stamp, _payload in events[index:])
+                self._sync_backend_workspaces(refresh_outputs=True)
+                break
+            delta = self._backend.apply_event(self._backend_table, payload)
+            if delta is None:
+                # The resync query reflects every later event of the batch too.
+                _log.debug("%s event needs full resync: %s", self._backend.compositor_type, payload)
+                self._backend_resync_waiting.extend(stamp for stamp, _payload in events[index:])
+                self._sync_backend_workspaces()
+                break
+            changed |= delta
+            applied.append(received_at)
+        self._apply_backend_changes(changed)
+        self._record_latency(applied)
+
+    def _record_latency(self, stamps):
+        done = time.perf_counter()
+        for received_at in stamps:
+            self._event_latency.add(done - received_at)
 
-    def _sync_scroll_workspaces(self, *args):
-        if self._scroll is None:
+    def _on_replay_finished(self):
+        _log.info("Replay latency %s", self.event_latency)
+        return False
+
+    def _sync_backend_workspaces(self, *args, refresh_outputs=False):
+        if self._backend is None or self._backend_resync_task is not None:
             return
-        _log.debug("Sync scroll workspaces")
-        ws_list = []
-        for scroll_ws in self._scroll.get_workspaces():
-            handle = ScrollWorkspaceHandle(scroll_ws, self._scroll)
-            workspace = Workspace(handle, "scroll")
-            ws_list.append(workspace)
-
-        self._workspaces = sorted(ws_list, key=lambda w: w.id if isinstance(w.id, int) else str(w.id))
-        self.emit("workspaces-changed")
+        _log.debug("Sync %s workspaces", self._backend.compositor_type)
+        self._backend_resync_task = _spawn(self._resync_backend_workspaces(refresh_outputs))
+
+    async def _resync_backend_workspaces(self, refresh_outputs=False):
+        backend = self._backend
+        outputs = None
+        try:
+            if refresh_outputs:
+                outputs = await backend.get_outputs_async()
+                if outputs is not None and self._monitor_manager.sync_outputs(backend.monitor_source, outputs):
+                    _log.info("%s outputs changed: %s", backend.compositor_type, [output.name for output in outputs])
+            records = await backend.get_records_async()
+        except (RuntimeError, OSError, ValueError) as err:
+            _log.warning("Failed to query %s workspaces: %s", backend.compositor_type, err)
+            records = None
+        finally:
+            self._backend_resync_task = None
+
+        deferred, self._backend_deferred_events = self._backend_deferred_events, []
+        waiting, self._backend_resync_waiting = self._backend_resync_waiting, []
+        if records is not None:
+            if self._event_recorder is not None:
+                self._event_recorder.snapshot(outputs, records)
+            Metrics.get_default().increment("compositor.workspace_syncs")
+            with Metrics.get_default().timed("compositor.workspace_sync"):
+                self._apply_backend_changes(self._backend_table.replace_all(records))
+        self._record_latency(waiting)
+        if deferred:
+            self._flush_backend_events(deferred)
+
+    def _apply_backend_changes(self, changed):
+        """Update only the wrappers of ``changed`` keys; the list is rebuilt only when membership or order moved."""
+        with self._workspace_batch():
+            order_changed = False
+            for key in changed:
+                record = self._backend_table.get(key)
+                workspace = self._workspaces_by_key.get(key)
+                if record is None:
+                    if workspace is not None:
+                        del self._workspaces_by_key[key]
+                        self._remove_workspace(workspace)
+                        order_changed = True
+                    continue
+                handle = BackendWorkspaceHandle(record, self._backend)
+                if workspace is None:
+                    workspace = Workspace(handle, self._backend.compositor_type)
+                    self._workspaces_by_key[key] = workspace
+                    self._add_workspace(workspace)
+                    order_changed = True
+                    continue
+                previous_id = workspace.id
+                if workspace.update_record(handle):
+                    self.emit("workspace-changed", workspace)
+                if workspace.id != previous_id:
+                    self._workspaces_by_monitor.reorder(workspace)
+                    order_changed = True
+
+            if order_changed:
+                self._workspaces = sorted(self._workspaces_by_key.values(), key=lambda w: w.id)
+                self._mark_layout_changed()
+        self._observe_focus()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable
+
+
+class ActiveWorkspaceTracker:
+    """Remembers the active workspace of every monitor.
+
+    A switch flips ``set_active`` on the previously and newly active workspace
+    only, instead of re-evaluating every workspace on the monitor.
+    """
+
+    def __init__(
+        self,
+        lookup: Callable[[Hashable], Any | None],
+        set_active: Callable[[Any, bool], None],
+    ) -> None:
+        self._lookup = lookup
+        self._set_active = set_active
+        self._active: dict[Hashable, Hashable] = {}
+        self._monitor_of: dict[Hashable, Hashable] = {}
+
+    def active(self, monitor_key: Hashable) -> Hashable | None:
+        return self._active.get(monitor_key)
+
+    def is_active(self, workspace_key: Hashable) -> bool:
+        return workspace_key in self._monitor_of
+
+    def activate(self, monitor_key: Hashable, workspace_key: Hashable | None) -> int:
+        """Record ``workspace_key`` as active on ``monitor_key``; returns how many workspaces were touched."""
+        previous = self._active.get(monitor_key)
+        if previous == workspace_key:
+            return 0
+        touched = 0
+        if previous is not None:
+            del self._active[monitor_key]
+            # It may already be active elsewhere after a move; leave that monitor's state alone.
+            if self._monitor_of.get(previous) == monitor_key:
+                del self._monitor_of[previous]
+                item = self._lookup(previous)
+                if item is not None:
+                    self._set_active(item, False)
+                    touched += 1
+        if workspace_key is not None:
+            other_monitor = self._monitor_of.get(workspace_key)
+            if other_monitor is not None and other_monitor != monitor_key:
+                self._active.pop(other_monitor, None)
+            self._active[monitor_key] = workspace_key
+            self._monitor_of[workspace_key] = monitor_key
+            item = self._lookup(workspace_key)
+            if item is not None:
+                self._set_active(item, True)
+                touched += 1
+        return touched
+
+    def forget(self, monitor_key: Hashable) -> None:
+        workspace_key = self._active.pop(monitor_key, None)
+        if workspace_key is not None and self._monitor_of.get(workspace_key) == monitor_key:
+            del self._monitor_of[workspace_key]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger("py_desktop.event_bus")
+
+TOPICS = ("popup", "workspace", "brightness", "volume", "metrics")
+
+
+def parse_topics(spec: str) -> frozenset[str] | None:
+    """``"popup,workspace"`` -> those topics; empty means every topic (None)."""
+    topics = frozenset(topic for topic in spec.replace(",", " ").split() if topic)
+    if not topics:
+        return None
+    unknown = topics.difference(TOPICS)
+    if unknown:
+        raise ValueError(f"unknown topics: {', '.join(sorted(unknown))} (known: {', '.join(TOPICS)})")
+    return topics
+
+
+def encode_event(topic: str, payload: dict[str, Any], ts: float | None = None) -> str:
+    """One NDJSON line."""
+    event = {"topic": topic, "ts": round(time.time() if ts is None else ts, 3), **payload}
+    return json.dumps(event, separators=(",", ":")) + "\n"
+
+
+class EventBus:
+    """Topic fan-out behind the ``subscribe`` request.
+
+    Publishers call ``publish`` on the main loop; it is a dict lookup when no
+    one listens, and ``has_subscribers`` lets callers skip building payloads.
+    Subscribers receive ready-encoded NDJSON lines.
+    """
+
+    _instance: EventBus | None = None
+
+    @classmethod
+    def get_default(cls) -> EventBus:
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self) -> None:
+        self._subscribers: dict[int, tuple[Callable[[str], None], frozenset[str] | None]] = {}
+        self._next_token = 0
+        self.published = 0
+
+    def subscribe(self, callback: Callable[[str], None], topics: Iterable[str] | None = None) -> int:
+        self._next_token += 1
+        self._subscribers[self._next_token] = (callback, None if topics is None else frozenset(topics))
+        return self._next_token
+
+    def unsubscribe(self, token: int) -> None:
+        self._subscribers.pop(token, None)
+
+    def has_subscribers(self, topic: str) -> bool:
+        return any(topics is None or topic in topics for _callback, topics in self._subscribers.values())
+
+    def publish(self, topic: str, payload: dict[str, Any]) -> int:
+        """Returns how many subscribers got the event."""
+        line = None
+        delivered = 0
+        for callback, topics in list(self._subscribers.values()):
+            if topics is not None and topic not in topics:
+                continue
+            if line is None:
+                line = encode_event(topic, payload)
+                self.published += 1
+            callback(line)
+            delivered += 1
+        return delivered
+
+
+class StreamSubscriber:
+    """Writes NDJSON lines to one client connection, one write in flight at a time.
+
+    ``write(data, done)`` starts an asynchronous write and later calls
+    ``done(ok)``. Lines published meanwhile are batched into the next write. A
+    client that falls ``max_pending`` lines behind, or whose write fails, is
+    closed rather than buffered without bound.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[bytes, Callable[[bool], None]], None],
+        close: Callable[[], None],
+        max_pending: int = 1000,
+    ) -> None:
+        self._write = write
+        self._close = close
+        self._max_pending = max_pending
+        self._pending: deque[str] = deque()
+        self._writing = False
+        self.closed = False
+        self.on_closed: Callable[[], None] | None = None
+
+    def push(self, line: str) -> None:
+        if self.closed:
+            return
+        if len(self._pending) >= self._max_pending:
+            logger.warning("Dropping subscriber %s lines behind", len(self._pending))
+            self.close()
+            return
+        self._pending.append(line)
+        if not self._writing:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.closed or not self._pending:
+            self._writing = False
+            return
+        data = "".join(self._pending).encode("utf-8")
+        self._pending.clear()
+        self._writing = True
+        self._write(data, self._on_written)
+
+    def _on_written(self, ok: bool) -> None:
+        if not ok:
+            self.close()
+            return
+        self._flush()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._pending.clear()
+        if self.on_closed is not None:
+            self.on_closed()
+        self._close()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+
+class EventCoalescer:
+    """Collapse bursts of events into one flush per main-loop iteration.
+
+    ``schedule`` arranges for a callback to run later on the main loop (for
+    example ``GLib.idle_add``); it is only called when no flush is pending.
+    ``push`` is safe to call from worker threads.
+    """
+
+    def __init__(
+        self,
+        schedule: Callable[[Callable[[], Any]], Any],
+        flush: Callable[[list[Any]], None],
+    ) -> None:
+        self._schedule = schedule
+        self._flush = flush
+        self._lock = threading.Lock()
+        self._pending: list[Any] = []
+        self._scheduled = False
+        self.events_received = 0
+        self.flushes = 0
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def push(self, event: Any = None) -> None:
+        with self._lock:
+            self._pending.append(event)
+            self.events_received += 1
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._schedule(self._run)
+
+    def _run(self) -> bool:
+        with self._lock:
+            batch = self._pending
+            self._pending = []
+            self._scheduled = False
+        if batch:
+            self.flushes += 1
+            self._flush(batch)
+        # Returning False removes the GLib idle source.
+        return False
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "events_received": self.events_received,
+            "syncs_performed": self.flushes,
+            "events_coalesced": self.events_received - self.flushes,
+        }
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import astuple, dataclass
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from services.hyprland_ipc import HyprlandIPC
+from services.niri_ipc import NiriIPC
+from services.scroll_ipc import ScrollIPC
+from services.synthetic_compositor import SyntheticCompositor
+from services.workspace_table import WorkspaceRecord, WorkspaceTable
+
+logger = logging.getLogger("py_desktop.event_replay")
+
+RECORDING_VERSION = 1
+
+# compositor_type -> backend whose apply_event/needs_output_refresh interpret the recorded payloads.
+REPLAY_INTERPRETERS: dict[str, Callable[[], Any]] = {
+    "scroll": lambda: ScrollIPC(native=False),
+    "hyprland-socket2": HyprlandIPC,
+    "niri-ipc": NiriIPC,
+    "synthetic": SyntheticCompositor,
+}
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class EventRecorder:
+    """Append-only JSONL (optionally gzip) log of backend events and resync snapshots."""
+
+    def __init__(self, path: str, backend: Any) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._file = _open(path, "w")
+        self._write(
+            {
+                "version": RECORDING_VERSION,
+                "backend": backend.compositor_type,
+                "monitor_source": backend.monitor_source,
+            }
+        )
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            # Recording is a debugging mode; keep the file usable if the session dies.
+            self._file.flush()
+
+    def _elapsed(self) -> float:
+        return round(time.monotonic() - self._started, 6)
+
+    def event(self, payload: Any) -> None:
+        # Called from backend monitor threads.
+        self._write({"t": self._elapsed(), "event": payload})
+
+    def snapshot(self, outputs: Iterable[Any] | None, records: Iterable[WorkspaceRecord]) -> None:
+        self._write(
+            {
+                "t": self._elapsed(),
+                "outputs": None if outputs is None else [output.name for output in outputs],
+                "records": [list(astuple(record)) for record in records],
+            }
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+@dataclass(frozen=True)
+class RecordedOutput:
+    name: str
+
+
+@dataclass
+class Recording:
+    backend: str
+    monitor_source: str
+    events: list[tuple[float, Any]]
+    snapshots: list[tuple[list[RecordedOutput] | None, list[WorkspaceRecord]]]
+
+
+def _complete_lines(stream: IO[str], path: str) -> Iterator[str]:
+    # A session that died without closing the recorder leaves a gzip stream with no
+    # end-of-stream marker; every line flushed before that is still good.
+    try:
+        for line in stream:
+            if not line.endswith("\n"):
+                logger.warning("Ignoring truncated last line of %s", path)
+                return
+            yield line
+    except EOFError:
+        logger.warning("Recording %s was not closed; using the events read so far", path)
+
+
+def read_recording(path: str) -> Recording:
+    with _open(path, "r") as stream:
+        header = json.loads(stream.readline())
+        if header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"unsupported recording version: {header.get('version')!r}")
+        recording = Recording(header["backend"], header["monitor_source"], [], [])
+        for line in _complete_lines(stream, path):
+            entry = json.loads(line)
+            if "event" in entry:
+                recording.events.append((entry["t"], entry["event"]))
+            elif "records" in entry:
+                outputs = entry["outputs"]
+                recording.snapshots.append(
+                    (
+                        None if outputs is None else [RecordedOutput(name) for name in outputs],
+                        [WorkspaceRecord(*fields) for fields in entry["records"]],
+                    )
+                )
+    return recording
+
+
+class ReplayBackend:
+    """Feeds a recording back through Compositor's backend path.
+
+    Events are re-sent from a worker thread with their original spacing divided
+    by ``speed`` (0 sends them back to back); resyncs are answered from the
+    recorded snapshots in order, so the same sync paths run as in the session.
+    """
+
+    def __init__(self, recording: Recording, speed: float = 1.0) -> None:
+        self.recording = recording
+        self.compositor_type = recording.backend
+        self.monitor_source = recording.monitor_source
+        self.speed = speed
+        self.on_finished: Callable[[], None] | None = None
+        self._interpreter = REPLAY_INTERPRETERS[recording.backend]()
+        self._snapshot_index = 0
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @classmethod
+    def from_env(cls) -> ReplayBackend:
+        path = os.environ["PY_DESKTOP_REPLAY"]
+        try:
+            speed = float(os.environ.get("PY_DESKTOP_REPLAY_SPEED", "1"))
+        except ValueError:
+            logger.warning("Ignoring invalid PY_DESKTOP_REPLAY_SPEED, replaying at 1x")
+            speed = 1.0
+        return cls(read_recording(path), speed)
+
+    def _next_snapshot(self):
+        snapshots = self.recording.snapshots
+        if not snapshots:
+            return None, []
+        snapshot = snapshots[min(self._snapshot_index, len(snapshots) - 1)]
+        self._snapshot_index += 1
+        return snapshot
+
+    def apply_event(self, table: WorkspaceTable, payload: Any) -> set | None:
+        return self._interpreter.apply_event(table, payload)
+
+    def needs_output_refresh(self, payload: Any) -> bool:
+        return self._interpreter.needs_output_refresh(payload)
+
+    async def get_outputs_async(self) -> list[RecordedOutput] | None:
+        snapshots = self.recording.snapshots
+        if not snapshots:
+            return None
+        return snapshots[min(self._snapshot_index, len(snapshots) - 1)][0]
+
+    async def get_records_async(self) -> list[WorkspaceRecord]:
+        return self._next_snapshot()[1]
+
+    async def focus_record_async(self, record: WorkspaceRecord) -> bool:
+        return False
+
+    async def quit_async(self) -> bool:
+        self.stop_event_monitor()
+        return True
+
+    def start_event_monitor(self, on_event: Callable[[Any], None]) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+
+        def worker() -> None:
+            previous = None
+            for timestamp, payload in self.recording.events:
+                if previous is not None and self.speed > 0:
+                    delay = (timestamp - previous) / self.speed
+                    if delay > 0 and self._stopped.wait(delay):
+                        return
+                if self._stopped.is_set():
+                    return
+                previous = timestamp
+                on_event(payload)
+            logger.info("Replay finished: %s events", len(self.recording.events))
+            if self.on_finished is not None:
+                self.on_finished()
+
+        self._thread = threading.Thread(target=worker, name="event-replay", daemon=True)
+        self._thread.start()
+
+    def stop_event_monitor(self) -> None:
+        self._stopped.set()
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from services.workspace_table import WorkspaceRecord, WorkspaceTable
+
+logger = logging.getLogger("py_desktop.hyprland_ipc")
+
+# Events after which the table can no longer be patched; the consumer runs a full resync.
+RESYNC_EVENTS = frozenset(
+    {
+        "monitoradded",
+        "monitoraddedv2",
+        "monitorremoved",
+        "monitorremovedv2",
+        "configreloaded",
+    }
+)
+
+
+def hyprland_socket_dir(signature: str | None = None, runtime_dir: str | None = None) -> str | None:
+    signature = signature or os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")
+    if not signature:
+        return None
+    runtime_dir = runtime_dir or os.environ.get("XDG_RUNTIME_DIR") or f"/run/user/{os.getuid()}"
+    return os.path.join(runtime_dir, "hypr", signature)
+
+
+def parse_event(line: str) -> tuple[str, list[str]] | None:
+    name, separator, data = line.rstrip("\n").partition(">>")
+    if not separator:
+        return None
+    match name:
+        case "workspacev2" | "createworkspacev2" | "destroyworkspacev2" | "renameworkspace":
+            # ID,NAME; names may contain commas.
+            return name, data.split(",", 1)
+        case "focusedmonv2":
+            # MONNAME,WORKSPACEID
+            return name, data.rsplit(",", 1)
+        case "moveworkspacev2":
+            # ID,NAME,MONNAME
+            workspace_id, _, rest = data.partition(",")
+            workspace_name, _, monitor = rest.rpartition(",")
+            return name, [workspace_id, workspace_name, monitor]
+        case _:
+            return name, [data]
+
+
+@dataclass
+class HyprlandEventState:
+    focused_output: str | None = None
+
+
+def _workspace_id(value: str) -> int | None:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def apply_hyprland_event(table: WorkspaceTable, state: HyprlandEventState, line: Any) -> set | None:
+    """Apply one socket2 line to ``table``.
+
+    Returns the keys that changed (empty for unrelated events), or ``None`` when
+    the event cannot be applied and the caller has to query the full state.
+    """
+    if not isinstance(line, str):
+        return None
+    event = parse_event(line)
+    if event is None:
+        return set()
+    name, args = event
+    if name in RESYNC_EVENTS:
+        return None
+
+    match name, args:
+        case "workspacev2", [raw_id, _workspace_name]:
+            workspace_id = _workspace_id(raw_id)
+            if workspace_id is None or workspace_id < 0:
+                return set()
+            record = table.get(workspace_id)
+            if record is None:
+                return None
+            state.focused_output = record.output
+            return table.activate(workspace_id, focused=True)
+        case "focusedmonv2", [monitor, raw_id]:
+            state.focused_output = monitor
+            workspace_id = _workspace_id(raw_id)
+            if workspace_id is None or workspace_id < 0:
+                return set()
+            record = table.get(workspace_id)
+            if record is None:
+                return None
+            changed = set()
+            if record.output != monitor:
+                changed |= table.update(workspace_id, output=monitor)
+            return changed | table.activate(workspace_id, focused=True)
+        case "createworkspacev2", [raw_id, workspace_name]:
+            workspace_id = _workspace_id(raw_id)
+            if workspace_id is None or workspace_id < 0:
+                return set()
+            if workspace_id in table:
+                return table.update(workspace_id, name=workspace_name)
+            # New workspaces open on the focused monitor; moveworkspacev2 corrects anything else.
+            output = state.focused_output
+            if output is None and (focused := table.get(table.focused_key)) is not None:
+                output = focused.output
+            return table.upsert(
+                WorkspaceRecord(
+                    key=workspace_id,
+                    id=workspace_id,
+                    name=workspace_name,
+                    output=output,
+                )
+            )
+        case "destroyworkspacev2", [raw_id, _workspace_name]:
+            workspace_id = _workspace_id(raw_id)
+            if workspace_id is None:
+                return set()
+            return table.remove(workspace_id)
+        case "moveworkspacev2", [raw_id, _workspace_name, monitor]:
+            workspace_id = _workspace_id(raw_id)
+            if workspace_id is None or workspace_id < 0:
+                return set()
+            if workspace_id not in table:
+                return None
+            return table.update(workspace_id, output=monitor)
+        case "renameworkspace", [raw_id, workspace_name]:
+            workspace_id = _workspace_id(raw_id)
+            if workspace_id is None or workspace_id not in table:
+                return set()
+            return table.update(workspace_id, name=workspace_name)
+        case _:
+            return set()
+
+
+def parse_state(workspaces_payload: str, monitors_payload: str) -> tuple[list[WorkspaceRecord], str | None]:
+    """Build records from ``j/workspaces`` and ``j/monitors`` replies; also returns the focused monitor."""
+    monitors = json.loads(monitors_payload)
+    active_by_output = {}
+    focused_output = None
+    for monitor in monitors:
+        name = monitor.get("name")
+        active = monitor.get("activeWorkspace") or {}
+        if name and active.get("id") is not None:
+            active_by_output[name] = int(active["id"])
+        if monitor.get("focused"):
+            focused_output = name
+
+    records = []
+    for item in json.loads(workspaces_payload):
+        workspace_id = int(item.get("id", 0))
+        if workspace_id < 0:
+            continue
+        output = item.get("monitor")
+        active = active_by_output.get(output) == workspace_id
+        records.append(
+            WorkspaceRecord(
+                key=workspace_id,
+                id=workspace_id,
+                name=str(item.get("name", workspace_id)),
+                output=output,
+                active=active,
+                focused=active and output == focused_output,
+            )
+        )
+    return records, focused_output
+
+
+class HyprlandIPC:
+    """Workspace event backend reading Hyprland's socket2 directly instead of AstalHyprland."""
+
+    compositor_type = "hyprland-socket2"
+    monitor_source = "hyprland"
+
+    def __init__(self, socket_dir: str | None = None, timeout: float = 2.0) -> None:
+        self._socket_dir = socket_dir or hyprland_socket_dir()
+        self._timeout = timeout
+        self._state = HyprlandEventState()
+        self._event_sock: socket.socket | None = None
+        self._monitor_thread: threading.Thread | None = None
+
+    @property
+    def request_socket(self) -> str | None:
+        return os.path.join(self._socket_dir, ".socket.sock") if self._socket_dir else None
+
+    @property
+    def event_socket(self) -> str | None:
+        return os.path.join(self._socket_dir, ".socket2.sock") if self._socket_dir else None
+
+    def available(self) -> bool:
+        return bool(self.event_socket and os.path.exists(self.event_socket))
+
+    async def request_async(self, command: str) -> str:
+        if not self.request_socket:
+            raise OSError("HYPRLAND_INSTANCE_SIGNATURE is not set")
+        try:
+            return await asyncio.wait_for(self._request(command), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            # Callers treat OSError as "compositor unavailable"; a wedged Hyprland is the same.
+            raise OSError(f"Hyprland request {command!r} timed out after {self._timeout} s") from None
+
+    async def _request(self, command: str) -> str:
+        reader, writer = await asyncio.open_unix_connection(self.request_socket)
+        try:
+            writer.write(command.encode("utf-8"))
+            await writer.drain()
+            # Hyprland answers once and closes the connection.
+            return (await reader.read()).decode("utf-8")
+        finally:
+            writer.close()
+
+    def apply_event(self, table: WorkspaceTable, payload: Any) -> set | None:
+        return apply_hyprland_event(table, self._state, payload)
+
+    def needs_output_refresh(self, payload: Any) -> bool:
+        # Monitors still come from AstalHyprland through MonitorManager.
+        return False
+
+    async def get_outputs_async(self) -> None:
+        return None
+
+    async def get_records_async(self) -> list[WorkspaceRecord]:
+        workspaces = await self.request_async("j/workspaces")
+        monitors = await self.request_async("j/monitors")
+        records, self._state.focused_output = parse_state(workspaces, monitors)
+        return records
+
+    async def focus_record_async(self, record: WorkspaceRecord) -> bool:
+        reply = await self.request_async(f"dispatch workspace {record.id}")
+        if reply.strip() != "ok":
+            logger.warning("Failed to focus Hyprland workspace %s: %s", record.id, reply.strip())
+            return False
+        return True
+
+    async def quit_async(self) -> bool:
+        return (await self.request_async("dispatch exit")).strip() == "ok"
+
+    def start_event_monitor(self, on_event: Callable[[Any], None]) -> None:
+        if self._monitor_thread is not None and self._monitor_thread.is_alive():
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.event_socket)
+        self._event_sock = sock
+
+        def worker() -> None:
+            buffer = b""
+            while True:
+                try:
+                    chunk = sock.recv(65536)
+                except OSError:
+                    return
+                if not chunk:
+                    return
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line:
+                        on_event(line.decode("utf-8", errors="replace"))
+
+        self._monitor_thread = threading.Thread(
+            target=worker,
+            name="hyprland-socket2-monitor",
+            daemon=True,
+        )
+        self._monitor_thread.start()
+
+    def stop_event_monitor(self) -> None:
+        sock = self._event_sock
+        self._event_sock = None
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
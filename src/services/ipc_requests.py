@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+
+
+def split_batch(msg: str) -> list[str] | None:
+    """Commands of a batched request, or None for a single command.
+
+    A batch is either a JSON array of command strings (``["status", "metrics"]``)
+    or commands separated by ``;`` (``status; metrics``).
+    """
+    text = msg.strip()
+    if text.startswith("["):
+        try:
+            commands = json.loads(text)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"invalid batch: {error}") from None
+        if not isinstance(commands, list) or not all(isinstance(command, str) for command in commands):
+            raise ValueError("invalid batch: expected a JSON array of strings")
+        return [command.strip() for command in commands]
+    if ";" in text:
+        return [command.strip() for command in text.split(";") if command.strip()]
+    return None
+
+
+def batch_reply(replies: list[str]) -> str:
+    """One JSON array holding each reply; replies that are JSON are embedded as values."""
+    values = []
+    for reply in replies:
+        if reply[:1] in ("{", "["):
+            try:
+                values.append(json.loads(reply))
+                continue
+            except json.JSONDecodeError:
+                pass
+        values.append(reply)
+    return json.dumps(values)
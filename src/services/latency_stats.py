@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+
+
+class LatencyStats:
+    """Sorted sample window reporting latency percentiles in milliseconds."""
+
+    def __init__(self, limit: int = 10000) -> None:
+        self._limit = limit
+        self._samples: list[float] = []
+        self._order: list[float] = []
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        if len(self._order) >= self._limit:
+            oldest = self._order.pop(0)
+            self._samples.remove(oldest)
+        self._order.append(seconds)
+        insort(self._samples, seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        if not self._samples:
+            return None
+        index = min(len(self._samples) - 1, int(round(fraction * (len(self._samples) - 1))))
+        return self._samples[index] * 1000
+
+    def summary(self) -> dict[str, float | int | None]:
+        return {
+            "count": self.count,
+            "p50_ms": self.percentile(0.50),
+            "p90_ms": self.percentile(0.90),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.percentile(1.0),
+        }
+
+
+class LatencyHistogram:
+    """Bucketed duration counts; unlike LatencyStats it keeps every sample however long the tail."""
+
+    DEFAULT_BOUNDS_MS = (16, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self, bounds_ms: tuple[float, ...] = DEFAULT_BOUNDS_MS) -> None:
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms: float | None = None
+
+    def add(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        if self.max_ms is None or ms > self.max_ms:
+            self.max_ms = ms
+
+    def summary(self) -> dict[str, object]:
+        labels = [f"<={bound:g}" for bound in self.bounds_ms] + [f">{self.bounds_ms[-1]:g}"]
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(labels, self.counts)),
+        }
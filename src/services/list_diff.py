@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from typing import Any, Sequence
+
+
+def list_splices(old: Sequence[Any], new: Sequence[Any]) -> list[tuple[int, int, list[Any]]]:
+    """Minimal ``(position, n_removed, added)`` splices that turn ``old`` into ``new``.
+
+    Items are compared by identity-based hashing, so they must be hashable.
+    Positions account for the splices before them, so applying the result in
+    order (e.g. with ``Gio.ListStore.splice``) yields ``new``.
+    """
+    splices = []
+    offset = 0
+    matcher = SequenceMatcher(None, list(old), list(new), autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        splices.append((i1 + offset, i2 - i1, list(new[j1:j2])))
+        offset += (j2 - j1) - (i2 - i1)
+    return splices
+
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Sequence
+
+from services.latency_stats import LatencyStats
+
+DURATION_SAMPLES = 1000
+
+
+def rss_bytes() -> int | None:
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def counter_deltas(previous: dict[str, int], current: dict[str, int]) -> dict[str, int]:
+    """Counters that moved between two ``Metrics.counters`` snapshots, by how much."""
+    return {
+        name: value - previous.get(name, 0)
+        for name, value in sorted(current.items())
+        if value != previous.get(name, 0)
+    }
+
+
+class Metrics:
+    """Process-wide counters and duration percentiles behind the ``metrics`` request.
+
+    Updates are cheap and thread-safe so hot paths (backend monitor threads,
+    subprocess spawns) can record unconditionally; ``snapshot`` is what the
+    request serializes.
+    """
+
+    _instance: Metrics | None = None
+
+    @classmethod
+    def get_default(cls) -> Metrics:
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._counters: dict[str, int] = {}
+        self._durations: dict[str, LatencyStats] = {}
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._durations.get(name)
+            if stats is None:
+                stats = self._durations[name] = LatencyStats(limit=DURATION_SAMPLES)
+            stats.add(seconds)
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def count_spawn(self, argv: Sequence[str]) -> None:
+        """Record one subprocess spawn, in total and per executable."""
+        self.increment("subprocess.spawns")
+        self.increment(f"subprocess.spawns.{os.path.basename(argv[0])}")
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(sorted(self._counters.items()))
+            durations = {name: stats.summary() for name, stats in sorted(self._durations.items())}
+        return {
+            "uptime_s": round(time.monotonic() - self._started, 3),
+            "rss_bytes": rss_bytes(),
+            "counters": counters,
+            "durations": durations,
+        }
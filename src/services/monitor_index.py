@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Hashable
+
+
+class MonitorBuckets:
+    """Monitor key -> its workspaces, kept ordered by ``order``.
+
+    Moving an item only touches the two buckets involved, so looking up one
+    monitor's workspaces costs O(its own workspaces) regardless of how many
+    monitors and workspaces exist in total. Keys whose bucket changed are
+    remembered until ``take_touched`` so callers can notify only those monitors.
+    """
+
+    def __init__(self, order: Callable[[Any], Any]) -> None:
+        self._order = order
+        self._buckets: dict[Hashable, list[Any]] = {}
+        # Parallel to each bucket: its items' order values, cached so inserts bisect
+        # instead of calling ``order`` (often a GObject property getter) per comparison.
+        self._orders: dict[Hashable, list[Any]] = {}
+        self._order_of: dict[int, Any] = {}
+        self._key_of: dict[int, Hashable] = {}
+        self._touched: set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._key_of)
+
+    def get(self, key: Hashable) -> list[Any]:
+        return self._buckets.get(key, [])
+
+    def key_of(self, item: Any) -> Hashable | None:
+        return self._key_of.get(id(item))
+
+    def keys(self) -> list[Hashable]:
+        return list(self._buckets)
+
+    def take_touched(self) -> set[Hashable]:
+        """Keys whose bucket changed since the last call."""
+        touched, self._touched = self._touched, set()
+        return touched
+
+    def assign(self, item: Any, key: Hashable | None) -> bool:
+        """File ``item`` under ``key`` (``None`` unfiles it); returns whether it moved."""
+        previous = self._key_of.get(id(item))
+        if previous == key:
+            return False
+        self.remove(item)
+        if key is None:
+            return previous is not None
+        bucket = self._buckets.setdefault(key, [])
+        orders = self._orders.setdefault(key, [])
+        order = self._order(item)
+        position = bisect_right(orders, order)
+        bucket.insert(position, item)
+        orders.insert(position, order)
+        self._order_of[id(item)] = order
+        self._key_of[id(item)] = key
+        self._touched.add(key)
+        return True
+
+    def remove(self, item: Any) -> Hashable | None:
+        key = self._key_of.pop(id(item), None)
+        if key is None:
+            return None
+        self._touched.add(key)
+        bucket = self._buckets[key]
+        orders = self._orders[key]
+        order = self._order_of.pop(id(item))
+        for index in range(bisect_left(orders, order), len(bucket)):
+            if bucket[index] is item:
+                del bucket[index]
+                del orders[index]
+                break
+        if not bucket:
+            del self._buckets[key]
+            del self._orders[key]
+        return key
+
+    def reorder(self, item: Any) -> None:
+        """Re-file ``item`` after its ``order`` value changed."""
+        key = self._key_of.get(id(item))
+        if key is not None:
+            self.remove(item)
+            self.assign(item, key)
+
+    def drop(self, key: Hashable) -> list[Any]:
+        """Forget a monitor (e.g. unplugged); returns the items that were filed under it."""
+        items = self._buckets.pop(key, [])
+        self._orders.pop(key, None)
+        self._touched.discard(key)
+        for item in items:
+            self._key_of.pop(id(item), None)
+            self._order_of.pop(id(item), None)
+        return items
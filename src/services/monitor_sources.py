@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Hashable, Iterable
+
+
+class MonitorSources:
+    """Tracks which backends (GDK, Hyprland, Niri, Scroll, ...) currently report each connector.
+
+    A connector is gone once no source reports it any more; ``update`` returns
+    those so the owner can tear the matching Monitor down.
+    """
+
+    def __init__(self) -> None:
+        self._sources: dict[str, set[Hashable]] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sources
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def sources(self, name: str) -> set[Hashable]:
+        return set(self._sources.get(name, ()))
+
+    def add(self, source: Hashable, name: str) -> None:
+        self._sources.setdefault(name, set()).add(source)
+
+    def update(self, source: Hashable, names: Iterable[str]) -> list[str]:
+        """Replace everything ``source`` reports; returns connectors no source reports any more."""
+        current = {name for name in names if name}
+        for name in current:
+            self.add(source, name)
+        gone = []
+        for name, sources in list(self._sources.items()):
+            if source in sources and name not in current:
+                sources.discard(source)
+                if not sources:
+                    del self._sources[name]
+                    gone.append(name)
+        return gone
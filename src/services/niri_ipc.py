@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Any, Callable
+
+from services.workspace_table import WorkspaceRecord, WorkspaceTable
+
+logger = logging.getLogger("py_desktop.niri_ipc")
+
+
+def encode_request(request: Any) -> bytes:
+    # Niri IPC is one JSON value per line in both directions.
+    return (json.dumps(request) + "\n").encode("utf-8")
+
+
+def parse_reply(line: str | bytes) -> Any:
+    reply = json.loads(line)
+    if not isinstance(reply, dict):
+        raise ValueError(f"unexpected niri reply: {reply!r}")
+    if "Err" in reply:
+        raise RuntimeError(reply["Err"])
+    return reply.get("Ok")
+
+
+def record_from_json(item: dict[str, Any]) -> WorkspaceRecord:
+    workspace_id = int(item["id"])
+    return WorkspaceRecord(
+        key=workspace_id,
+        id=workspace_id,
+        name=item.get("name") or "",
+        output=item.get("output"),
+        active=bool(item.get("is_active", False)),
+        focused=bool(item.get("is_focused", False)),
+        urgent=bool(item.get("is_urgent", False)),
+    )
+
+
+def parse_workspaces(reply: Any) -> list[WorkspaceRecord]:
+    return [record_from_json(item) for item in reply["Workspaces"]]
+
+
+def apply_niri_event(table: WorkspaceTable, event: Any) -> set | None:
+    """Apply one event-stream message to ``table``.
+
+    Returns the keys that changed (empty for events that carry no workspace
+    state), or ``None`` when the event cannot be applied and a full query is needed.
+    """
+    if not isinstance(event, dict) or len(event) != 1:
+        return None
+    (name, body), = event.items()
+    if not isinstance(body, dict):
+        return None
+
+    match name:
+        case "WorkspacesChanged":
+            # Full list, but diffed by id: unchanged workspaces are not touched.
+            return table.replace_all(record_from_json(item) for item in body.get("workspaces", []))
+        case "WorkspaceActivated":
+            workspace_id = body.get("id")
+            if workspace_id not in table:
+                return None
+            return table.activate(workspace_id, focused=bool(body.get("focused", False)))
+        case "WorkspaceUrgencyChanged":
+            workspace_id = body.get("id")
+            if workspace_id not in table:
+                return None
+            return table.update(workspace_id, urgent=bool(body.get("urgent", False)))
+        case "WorkspaceActiveWindowChanged":
+            # The active window is not part of the workspace strip; nothing to redraw.
+            return set()
+        case _:
+            return set()
+
+
+class NiriIPC:
+    """Workspace event backend reading Niri's IPC event stream instead of AstalNiri workspaces."""
+
+    compositor_type = "niri-ipc"
+    monitor_source = "niri"
+
+    def __init__(self, socket_path: str | None = None, timeout: float = 2.0) -> None:
+        self._socket = socket_path or os.environ.get("NIRI_SOCKET")
+        self._timeout = timeout
+        self._event_sock: socket.socket | None = None
+        self._monitor_thread: threading.Thread | None = None
+
+    def available(self) -> bool:
+        return bool(self._socket and os.path.exists(self._socket))
+
+    async def request_async(self, request: Any) -> Any:
+        if not self._socket:
+            raise OSError("NIRI_SOCKET is not set")
+        try:
+            return await asyncio.wait_for(self._request(request), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            # Callers treat OSError as "compositor unavailable"; a wedged Niri is the same.
+            raise OSError(f"Niri request {request!r} timed out after {self._timeout} s") from None
+
+    async def _request(self, request: Any) -> Any:
+        reader, writer = await asyncio.open_unix_connection(self._socket)
+        try:
+            writer.write(encode_request(request))
+            await writer.drain()
+            return parse_reply(await reader.readline())
+        finally:
+            writer.close()
+
+    def apply_event(self, table: WorkspaceTable, payload: Any) -> set | None:
+        return apply_niri_event(table, payload)
+
+    def needs_output_refresh(self, payload: Any) -> bool:
+        # Outputs still come from AstalNiri through MonitorManager.
+        return False
+
+    async def get_outputs_async(self) -> None:
+        return None
+
+    async def get_records_async(self) -> list[WorkspaceRecord]:
+        return parse_workspaces(await self.request_async("Workspaces"))
+
+    async def focus_record_async(self, record: WorkspaceRecord) -> bool:
+        try:
+            await self.request_async({"Action": {"FocusWorkspace": {"reference": {"Id": record.id}}}})
+            return True
+        except RuntimeError as err:
+            logger.warning("Failed to focus Niri workspace %s: %s", record.id, err)
+            return False
+
+    async def quit_async(self) -> bool:
+        try:
+            await self.request_async({"Action": {"Quit": {"skip_confirmation": True}}})
+            return True
+        except RuntimeError as err:
+            logger.warning("Failed to quit Niri: %s", err)
+            return False
+
+    def start_event_monitor(self, on_event: Callable[[Any], None]) -> None:
+        if self._monitor_thread is not None and self._monitor_thread.is_alive():
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self._socket)
+        sock.sendall(encode_request("EventStream"))
+        self._event_sock = sock
+
+        def worker() -> None:
+            with sock.makefile("rb") as stream:
+                try:
+                    handshake = stream.readline()
+                    parse_reply(handshake)
+                except (OSError, ValueError, RuntimeError) as err:
+                    logger.warning("Niri event stream refused: %s", err)
+                    return
+                while True:
+                    try:
+                        line = stream.readline()
+                    except OSError:
+                        return
+                    if not line:
+                        return
+                    if not line.strip():
+                        continue
+                    try:
+                        event_payload = json.loads(line)
+                    except ValueError:
+                        # None asks the consumer for a full resync
+                        event_payload = None
+                    on_event(event_payload)
+
+        self._monitor_thread = threading.Thread(
+            target=worker,
+            name="niri-ipc-monitor",
+            daemon=True,
+        )
+        self._monitor_thread.start()
+
+    def stop_event_monitor(self) -> None:
+        sock = self._event_sock
+        self._event_sock = None
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable
+
+from services.latency_stats import LatencyStats
+
+
+@dataclass(eq=False)
+class FocusPrediction:
+    key: Hashable
+    focused_before: Hashable | None
+    started: float
+    # Wrappers whose state was changed optimistically; restored on rollback.
+    touched: list[Any] = field(default_factory=list)
+    # Focus moved to a third workspace while this was pending.
+    diverged: bool = False
+
+
+class OptimisticFocus:
+    """Bookkeeping for one in-flight optimistic workspace focus.
+
+    ``predict`` records that ``key`` was shown as focused before the compositor
+    confirmed it. ``observe`` is fed the compositor's actual focused key
+    whenever it may have changed and confirms the prediction once it matches.
+    Otherwise ``fail`` (the request was rejected) or ``expire`` (timeout) end
+    it and the caller rolls back; an expired prediction that saw focus go to
+    another workspace counts as mispredicted rather than timed out.
+    """
+
+    def __init__(self, timeout: float = 1.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.timeout = timeout
+        self._clock = clock
+        self.pending: FocusPrediction | None = None
+        self.predictions = 0
+        self.confirmed = 0
+        self.mispredicted = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.superseded = 0
+        self.confirmation_latency = LatencyStats()
+
+    def predict(self, key: Hashable, focused_before: Hashable | None, touched: list[Any] | None = None) -> FocusPrediction:
+        touched = list(touched or ())
+        if self.pending is not None:
+            # A newer click replaces the prediction; a rollback of it must also restore
+            # the wrappers the superseded click changed.
+            self.superseded += 1
+            touched.extend(item for item in self.pending.touched if not any(item is seen for seen in touched))
+        self.predictions += 1
+        self.pending = FocusPrediction(key, focused_before, self._clock(), touched)
+        return self.pending
+
+    def observe(self, actual_focused: Hashable | None) -> FocusPrediction | None:
+        """Returns the prediction if ``actual_focused`` confirmed it."""
+        prediction = self.pending
+        if prediction is None:
+            return None
+        if actual_focused == prediction.key:
+            self.pending = None
+            self.confirmed += 1
+            self.confirmation_latency.add(self._clock() - prediction.started)
+            return prediction
+        if actual_focused != prediction.focused_before:
+            # Possibly transient (Hyprland focuses the monitor first); judged on expiry.
+            prediction.diverged = True
+        return None
+
+    def fail(self, prediction: FocusPrediction) -> bool:
+        if self.pending is not prediction:
+            return False
+        self.pending = None
+        self.failed += 1
+        return True
+
+    def expire(self, prediction: FocusPrediction) -> bool:
+        if self.pending is not prediction:
+            return False
+        self.pending = None
+        if prediction.diverged:
+            self.mispredicted += 1
+        else:
+            self.timed_out += 1
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        wrong = self.mispredicted + self.failed + self.timed_out
+        return {
+            "predictions": self.predictions,
+            "confirmed": self.confirmed,
+            "mispredicted": self.mispredicted,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "superseded": self.superseded,
+            "wrong_ratio": wrong / self.predictions if self.predictions else 0.0,
+            "confirmation_latency": self.confirmation_latency.summary(),
+        }
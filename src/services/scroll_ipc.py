@@ -1,15 +1,34 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
+import socket
+import struct
 import subprocess
 import threading
+import time
 from dataclasses import dataclass
 from typing import Any, Callable
 
+from services.metrics import Metrics
+from services.workspace_table import WorkspaceRecord, WorkspaceTable
+
 logger = logging.getLogger("py_desktop.scroll_ipc")
 
+# i3/sway IPC framing: "i3-ipc" magic, payload length, message type (native byte order).
+I3_IPC_MAGIC = b"i3-ipc"
+I3_IPC_HEADER = struct.Struct("=6sII")
+I3_IPC_MESSAGE_TYPES = {
+    "command": 0,
+    "get_workspaces": 1,
+    "subscribe": 2,
+    "get_outputs": 3,
+}
+# Seconds to use scrollmsg after a failed socket request before trying the socket again.
+SOCKET_RETRY_BACKOFF = 5.0
+
 
 @dataclass(frozen=True)
 class ScrollOutput:
@@ -24,6 +43,20 @@ class ScrollWorkspace:
     output: str | None
     focused: bool
     visible: bool
+    id: int | None = None
+    urgent: bool = False
+
+    def to_record(self) -> WorkspaceRecord:
+        # The container id survives renames and renumbering; fall back to num without it.
+        return WorkspaceRecord(
+            key=self.id if self.id is not None else self.num,
+            id=self.num,
+            name=self.name,
+            output=self.output,
+            active=self.visible,
+            focused=self.focused,
+            urgent=self.urgent,
+        )
 
 
 def parse_outputs(payload: str) -> list[ScrollOutput]:
@@ -42,38 +75,287 @@ def parse_outputs(payload: str) -> list[ScrollOutput]:
     return result
 
 
+def workspace_from_json(item: dict[str, Any]) -> ScrollWorkspace:
+    num = int(item.get("num", 0))
+    name = str(item.get("name", num))
+    output = item.get("output")
+    con_id = item.get("id")
+    return ScrollWorkspace(
+        num=num,
+        name=name,
+        output=str(output) if output is not None else None,
+        focused=bool(item.get("focused", False)),
+        visible=bool(item.get("visible", False)),
+        id=int(con_id) if con_id is not None else None,
+        urgent=bool(item.get("urgent", False)),
+    )
+
+
 def parse_workspaces(payload: str) -> list[ScrollWorkspace]:
     data = json.loads(payload)
-    result = []
-    for item in data:
-        num = int(item.get("num", 0))
-        name = str(item.get("name", num))
-        output = item.get("output")
-        result.append(
-            ScrollWorkspace(
-                num=num,
-                name=name,
-                output=str(output) if output is not None else None,
-                focused=bool(item.get("focused", False)),
-                visible=bool(item.get("visible", False)),
+    return [workspace_from_json(item) for item in data]
+
+
+def is_output_event(event: Any) -> bool:
+    # Workspace events always carry "current" (null on reload); output events only "change".
+    return isinstance(event, dict) and "change" in event and "current" not in event
+
+
+def apply_workspace_event(table: WorkspaceTable, event: Any) -> set | None:
+    """Apply one subscribe payload to ``table``.
+
+    Returns the keys that changed, or ``None`` when the event cannot be applied
+    as a delta and the caller has to run a full ``get_workspaces`` resync.
+    """
+    if not isinstance(event, dict):
+        return None
+    current = event.get("current")
+    if not isinstance(current, dict):
+        # Output events and workspace "reload" carry no usable workspace body.
+        return None
+
+    record = workspace_from_json(current).to_record()
+    match event.get("change"):
+        case "init":
+            return table.upsert(record)
+        case "empty":
+            return table.remove(record.key)
+        case "focus":
+            changed = set()
+            if record.key not in table:
+                changed |= table.upsert(record)
+            return changed | table.activate(record.key, focused=True)
+        case "rename" | "move":
+            existing = table.get(record.key)
+            if existing is None:
+                return None
+            # The payload state flags are not reliable for these changes; keep the tracked ones.
+            return table.update(
+                record.key,
+                id=record.id,
+                name=record.name,
+                output=record.output,
             )
+        case "urgent":
+            if record.key not in table:
+                return None
+            return table.update(record.key, urgent=record.urgent)
+        case _:
+            return None
+
+
+def pack_message(msg_type: int, payload: str = "") -> bytes:
+    body = payload.encode("utf-8")
+    return I3_IPC_HEADER.pack(I3_IPC_MAGIC, len(body), msg_type) + body
+
+
+def unpack_header(header: bytes) -> tuple[int, int]:
+    magic, length, msg_type = I3_IPC_HEADER.unpack(header)
+    if magic != I3_IPC_MAGIC:
+        raise ValueError(f"invalid i3-ipc magic: {magic!r}")
+    return length, msg_type
+
+
+def command_error(payload: str) -> str | None:
+    # RUN_COMMAND replies with one result object per command; scrollmsg signals failure
+    # through its exit code, the socket only through "success": false.
+    try:
+        results = json.loads(payload)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(results, list):
+        return None
+    for result in results:
+        if isinstance(result, dict) and result.get("success") is False:
+            return str(result.get("error") or "command failed")
+    return None
+
+
+class I3IPCClient:
+    """Request/reply client for the i3-ipc protocol over one persistent socket."""
+
+    def __init__(self, socket_path: str, timeout: float = 2.0) -> None:
+        self._socket_path = socket_path
+        self._timeout = timeout
+        self._sock: socket.socket | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def connect(self) -> None:
+        if self._sock is not None:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self._timeout)
+        try:
+            sock.connect(self._socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+
+    def close(self) -> None:
+        sock = self._sock
+        self._sock = None
+        if sock is not None:
+            sock.close()
+
+    def request(self, msg_type: int, payload: str = "") -> str:
+        with self._lock:
+            try:
+                return self._request(msg_type, payload)
+            except (OSError, ValueError):
+                # The compositor may have closed an idle connection; retry once on a fresh one.
+                self.close()
+                return self._request(msg_type, payload)
+
+    def _request(self, msg_type: int, payload: str) -> str:
+        self.connect()
+        assert self._sock is not None
+        self._sock.sendall(pack_message(msg_type, payload))
+        length, reply_type = unpack_header(self._recv_exact(I3_IPC_HEADER.size))
+        body = self._recv_exact(length)
+        if reply_type != msg_type:
+            raise ValueError(f"unexpected i3-ipc reply type {reply_type} for request {msg_type}")
+        return body.decode("utf-8")
+
+    def _recv_exact(self, size: int) -> bytes:
+        assert self._sock is not None
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            chunk = self._sock.recv(remaining)
+            if not chunk:
+                raise ConnectionError("i3-ipc socket closed")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+
+class AsyncI3IPCClient:
+    """asyncio counterpart of :class:`I3IPCClient`; requests never block the loop."""
+
+    def __init__(self, socket_path: str, timeout: float = 2.0) -> None:
+        self._socket_path = socket_path
+        self._timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def connect(self) -> None:
+        if self._writer is not None:
+            return
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(self._socket_path),
+            timeout=self._timeout,
         )
-    return result
+
+    def close(self) -> None:
+        writer = self._writer
+        self._reader = None
+        self._writer = None
+        if writer is not None:
+            writer.close()
+
+    async def request(self, msg_type: int, payload: str = "") -> str:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._request(msg_type, payload), timeout=self._timeout)
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                self.close()
+                return await asyncio.wait_for(self._request(msg_type, payload), timeout=self._timeout)
+
+    async def _request(self, msg_type: int, payload: str) -> str:
+        await self.connect()
+        assert self._reader is not None and self._writer is not None
+        self._writer.write(pack_message(msg_type, payload))
+        await self._writer.drain()
+        length, reply_type = unpack_header(await self._reader.readexactly(I3_IPC_HEADER.size))
+        body = await self._reader.readexactly(length)
+        if reply_type != msg_type:
+            raise ValueError(f"unexpected i3-ipc reply type {reply_type} for request {msg_type}")
+        return body.decode("utf-8")
 
 
 class ScrollIPC:
-    def __init__(self) -> None:
-        self._socket = os.environ.get("SWAYSOCK") or os.environ.get("SCROLLSOCK")
+    compositor_type = "scroll"
+    monitor_source = "scroll"
+
+    def __init__(
+        self,
+        socket_path: str | None = None,
+        native: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._socket = socket_path or os.environ.get("SWAYSOCK") or os.environ.get("SCROLLSOCK")
+        self._client = I3IPCClient(self._socket) if native and self._socket else None
+        self._async_client = AsyncI3IPCClient(self._socket) if native and self._socket else None
+        self._clock = clock
+        self._socket_retry_at = 0.0
         self._monitor_proc: subprocess.Popen[str] | None = None
         self._monitor_thread: threading.Thread | None = None
 
+    def _socket_usable(self, client: Any) -> bool:
+        return client is not None and self._clock() >= self._socket_retry_at
+
+    def _socket_failed(self, client: Any, err: Exception) -> None:
+        # Only this request and those within the backoff use scrollmsg; the client reconnects afterwards.
+        logger.warning(
+            "Scroll IPC socket request failed, using scrollmsg for %.0f s: %s", SOCKET_RETRY_BACKOFF, err
+        )
+        client.close()
+        self._socket_retry_at = self._clock() + SOCKET_RETRY_BACKOFF
+
     def _run(self, msg_type: str, message: str | None = None) -> str:
+        if self._socket_usable(self._client):
+            try:
+                payload = self._client.request(I3_IPC_MESSAGE_TYPES[msg_type], message or "")
+            except (OSError, ValueError) as err:
+                self._socket_failed(self._client, err)
+            else:
+                if msg_type == "command" and (error := command_error(payload)):
+                    raise RuntimeError(error)
+                return payload
+        return self._run_scrollmsg(msg_type, message)
+
+    async def _run_async(self, msg_type: str, message: str | None = None) -> str:
+        if self._socket_usable(self._async_client):
+            try:
+                payload = await self._async_client.request(I3_IPC_MESSAGE_TYPES[msg_type], message or "")
+            except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError) as err:
+                self._socket_failed(self._async_client, err)
+            else:
+                if msg_type == "command" and (error := command_error(payload)):
+                    raise RuntimeError(error)
+                return payload
+
+        command = self._scrollmsg_command(msg_type, message)
+        Metrics.get_default().count_spawn(command)
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(stderr.decode().strip() or stdout.decode().strip() or "scrollmsg failed")
+        return stdout.decode()
+
+    def _scrollmsg_command(self, msg_type: str, message: str | None = None) -> list[str]:
         command = ["scrollmsg", "-r", "-t", msg_type]
         if self._socket:
             command.extend(["-s", self._socket])
         if message:
             command.append(message)
+        return command
 
+    def _run_scrollmsg(self, msg_type: str, message: str | None = None) -> str:
+        command = self._scrollmsg_command(msg_type, message)
+        Metrics.get_default().count_spawn(command)
         proc = subprocess.run(
             command,
             capture_output=True,
@@ -95,7 +377,7 @@ class ScrollIPC:
         try:
             self._run("command", f"workspace {workspace.name}")
             return True
-        except RuntimeError as err:
+        except (RuntimeError, OSError) as err:
             logger.warning("Failed to focus Scroll workspace %s: %s", workspace.name, err)
             return False
 
@@ -103,11 +385,52 @@ class ScrollIPC:
         try:
             self._run("command", "exit")
             return True
-        except RuntimeError as err:
+        except (RuntimeError, OSError) as err:
+            logger.warning("Failed to quit Scroll: %s", err)
+            return False
+
+    async def get_outputs_async(self) -> list[ScrollOutput]:
+        return parse_outputs(await self._run_async("get_outputs"))
+
+    async def get_workspaces_async(self) -> list[ScrollWorkspace]:
+        return parse_workspaces(await self._run_async("get_workspaces"))
+
+    async def focus_workspace_async(self, workspace: ScrollWorkspace) -> bool:
+        try:
+            await self._run_async("command", f"workspace {workspace.name}")
+            return True
+        except (RuntimeError, OSError) as err:
+            logger.warning("Failed to focus Scroll workspace %s: %s", workspace.name, err)
+            return False
+
+    async def quit_async(self) -> bool:
+        try:
+            await self._run_async("command", "exit")
+            return True
+        except (RuntimeError, OSError) as err:
             logger.warning("Failed to quit Scroll: %s", err)
             return False
 
-    def start_event_monitor(self, on_event: Callable[[], None]) -> None:
+    def apply_event(self, table: WorkspaceTable, payload: Any) -> set | None:
+        return apply_workspace_event(table, payload)
+
+    def needs_output_refresh(self, payload: Any) -> bool:
+        return is_output_event(payload)
+
+    async def get_records_async(self) -> list[WorkspaceRecord]:
+        return [workspace.to_record() for workspace in await self.get_workspaces_async()]
+
+    async def focus_record_async(self, record: WorkspaceRecord) -> bool:
+        workspace = ScrollWorkspace(
+            num=record.id,
+            name=record.name,
+            output=record.output,
+            focused=record.focused,
+            visible=record.active,
+        )
+        return await self.focus_workspace_async(workspace)
+
+    def start_event_monitor(self, on_event: Callable[[Any], None]) -> None:
         if self._monitor_proc is not None and self._monitor_proc.poll() is None:
             return
 
@@ -122,6 +445,7 @@ class ScrollIPC:
         if self._socket:
             command.extend(["-s", self._socket])
 
+        Metrics.get_default().count_spawn(command)
         self._monitor_proc = subprocess.Popen(
             command,
             stdout=subprocess.PIPE,
@@ -142,9 +466,9 @@ class ScrollIPC:
                     if isinstance(event_payload, dict) and event_payload.get("success") is True:
                         continue
                 except Exception:
-                    # keep going on malformed line
-                    pass
-                on_event()
+                    # keep going on malformed line; None asks the consumer for a full resync
+                    event_payload = None
+                on_event(event_payload)
 
         self._monitor_thread = threading.Thread(
             target=worker,
@@ -160,3 +484,10 @@ class ScrollIPC:
         if proc.poll() is None:
             proc.terminate()
         self._monitor_proc = None
+
+    def close(self) -> None:
+        self.stop_event_monitor()
+        if self._client is not None:
+            self._client.close()
+        if self._async_client is not None:
+            self._async_client.close()
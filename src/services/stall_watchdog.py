@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from services.latency_stats import LatencyHistogram, LatencyStats
+
+logger = logging.getLogger("py_desktop.stall_watchdog")
+
+STACK_DEPTH = 15
+RECENT_STALLS = 20
+
+
+@dataclass
+class StallReport:
+    # How much later than expected the main-loop heartbeat ran.
+    duration: float
+    # Main thread stack captured while the stall was still going on.
+    stack: list[str] | None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"duration_ms": round(self.duration * 1000, 1), "stack": self.stack}
+
+
+def _main_thread_stack() -> list[str] | None:
+    frame = sys._current_frames().get(threading.main_thread().ident)
+    if frame is None:
+        return None
+    return [line.rstrip("\n") for line in traceback.format_stack(frame)[-STACK_DEPTH:]]
+
+
+class StallWatchdog:
+    """Opt-in detector for main-loop iterations that block longer than ``threshold``.
+
+    A heartbeat on the main loop (``beat``) runs every ``period`` seconds. A
+    checker thread (``check``) notices when it is overdue by ``threshold`` and
+    captures the main thread's Python stack at that moment, i.e. inside the
+    callback that is blocking. When the heartbeat finally runs the stall's
+    duration goes into the histogram and is logged with that stack. A callback
+    stuck in C code that holds the GIL is only caught once it returns, so its
+    stack may be missing.
+    """
+
+    _instance: StallWatchdog | None = None
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        period: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        capture: Callable[[], list[str] | None] = _main_thread_stack,
+    ) -> None:
+        self.threshold = threshold
+        self.period = period if period is not None else threshold / 2
+        self._clock = clock
+        self._capture = capture
+        self._lock = threading.Lock()
+        self._last_beat = clock()
+        self._pending_stack: list[str] | None = None
+        self._running = False
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stalls = 0
+        self.histogram = LatencyHistogram()
+        # Lateness of every heartbeat, stalled or not: the main loop's dispatch lag.
+        self.lag = LatencyStats(limit=1000)
+        self.recent: deque[StallReport] = deque(maxlen=RECENT_STALLS)
+
+    @classmethod
+    def get_default(cls) -> StallWatchdog | None:
+        """The watchdog started by ``start_from_env``, or None when it is disabled."""
+        return cls._instance
+
+    @classmethod
+    def start_from_env(cls, timeout_add: Callable[..., Any]) -> StallWatchdog | None:
+        # e.g. PY_DESKTOP_STALL_WATCHDOG_MS=100
+        try:
+            threshold_ms = float(os.environ.get("PY_DESKTOP_STALL_WATCHDOG_MS", "0"))
+        except ValueError:
+            threshold_ms = 0
+        if threshold_ms <= 0:
+            return None
+        watchdog = cls(threshold=threshold_ms / 1000)
+        watchdog.start(timeout_add)
+        cls._instance = watchdog
+        logger.info("Stall watchdog enabled: threshold=%.0f ms", threshold_ms)
+        return watchdog
+
+    def start(self, timeout_add: Callable[..., Any]) -> None:
+        """``timeout_add`` schedules the heartbeat on the main loop, e.g. ``GLib.timeout_add``."""
+        if self._running:
+            return
+        self._running = True
+        self._stopped.clear()
+        with self._lock:
+            self._last_beat = self._clock()
+        timeout_add(max(1, int(self.period * 1000)), self._on_heartbeat)
+        self._thread = threading.Thread(target=self._check_loop, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        self._stopped.set()
+
+    def _on_heartbeat(self) -> bool:
+        if not self._running:
+            return False
+        self.beat()
+        return True
+
+    def _check_loop(self) -> None:
+        while not self._stopped.wait(self.threshold / 4):
+            self.check()
+
+    def beat(self) -> StallReport | None:
+        """Main-loop heartbeat; returns the report if the loop was stalled since the last one."""
+        now = self._clock()
+        with self._lock:
+            lateness = now - self._last_beat - self.period
+            self._last_beat = now
+            stack, self._pending_stack = self._pending_stack, None
+        self.lag.add(max(0.0, lateness))
+        if lateness < self.threshold:
+            return None
+        report = StallReport(lateness, stack)
+        self.stalls += 1
+        self.histogram.add(lateness)
+        self.recent.append(report)
+        if stack:
+            logger.warning("Main loop stalled %.0f ms in:\n%s", lateness * 1000, "\n".join(stack))
+        else:
+            logger.warning("Main loop stalled %.0f ms (no stack captured)", lateness * 1000)
+        return report
+
+    def check(self) -> bool:
+        """Checker-thread poll; captures the main thread's stack once per overdue heartbeat."""
+        now = self._clock()
+        with self._lock:
+            if self._pending_stack is not None or now - self._last_beat - self.period < self.threshold:
+                return False
+            self._pending_stack = self._capture() or []
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": True,
+            "threshold_ms": self.threshold * 1000,
+            "stalls": self.stalls,
+            "lag": self.lag.summary(),
+            "histogram": self.histogram.summary(),
+            "recent": [report.as_dict() for report in self.recent],
+        }
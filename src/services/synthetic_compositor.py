@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from services.workspace_table import WorkspaceRecord, WorkspaceTable
+
+
+@dataclass(frozen=True)
+class SyntheticOutput:
+    name: str
+    focused: bool = False
+
+
+def _int_or(value: str | int, default: int) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    return _int_or(os.environ.get(name, default), default)
+
+
+class SyntheticCompositor:
+    """Headless workspace backend generating monitors, workspaces and scripted event storms.
+
+    Selected with ``XDG_CURRENT_DESKTOP=synthetic``. It keeps its own compositor
+    state; the ``*_storm`` helpers mutate it and return the events a real
+    compositor would have sent, so a replay through Compositor ends in the same
+    state as ``get_records_async`` reports.
+    """
+
+    compositor_type = "synthetic"
+    monitor_source = "synthetic"
+
+    def __init__(self, monitors: int = 1, workspaces: int = 10, seed: int = 0) -> None:
+        self._random = random.Random(seed)
+        self._outputs: list[str] = []
+        self._output_of: dict[int, str] = {}
+        self._active: dict[str, int] = {}
+        self._focused_output: str | None = None
+        self._on_event: Callable[[Any], None] | None = None
+        self._storm_thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self.storm: tuple[str, int] | None = None
+        self.interval = 0.0
+        self.set_monitors(monitors)
+        for workspace_id in range(1, workspaces + 1):
+            output = self._outputs[(workspace_id - 1) % len(self._outputs)]
+            self._output_of[workspace_id] = output
+            self._active.setdefault(output, workspace_id)
+
+    @classmethod
+    def from_env(cls) -> SyntheticCompositor:
+        backend = cls(
+            monitors=max(1, _env_int("PY_DESKTOP_SYNTHETIC_MONITORS", 1)),
+            workspaces=max(1, _env_int("PY_DESKTOP_SYNTHETIC_WORKSPACES", 10)),
+            seed=_env_int("PY_DESKTOP_SYNTHETIC_SEED", 0),
+        )
+        # e.g. PY_DESKTOP_SYNTHETIC_STORM=focus:1000 or hotplug:20
+        kind, _, count = os.environ.get("PY_DESKTOP_SYNTHETIC_STORM", "").partition(":")
+        if kind:
+            backend.storm = (kind, _int_or(count or 100, 100))
+        backend.interval = _env_int("PY_DESKTOP_SYNTHETIC_INTERVAL_MS", 0) / 1000
+        return backend
+
+    @property
+    def outputs(self) -> list[str]:
+        return list(self._outputs)
+
+    def records(self) -> list[WorkspaceRecord]:
+        return [
+            WorkspaceRecord(
+                key=workspace_id,
+                id=workspace_id,
+                name=str(workspace_id),
+                output=output,
+                active=self._active.get(output) == workspace_id,
+                focused=output == self._focused_output and self._active.get(output) == workspace_id,
+            )
+            for workspace_id, output in sorted(self._output_of.items())
+        ]
+
+    def set_monitors(self, count: int) -> dict[str, Any]:
+        """Hotplug to ``count`` outputs; workspaces of unplugged outputs move to the first one."""
+        self._outputs = [f"SYN-{index}" for index in range(max(1, count))]
+        fallback = self._outputs[0]
+        for workspace_id, output in self._output_of.items():
+            if output not in self._outputs:
+                self._output_of[workspace_id] = fallback
+        self._active = {output: ws for output, ws in self._active.items() if output in self._outputs}
+        for workspace_id, output in sorted(self._output_of.items()):
+            self._active.setdefault(output, workspace_id)
+        if self._focused_output not in self._outputs:
+            self._focused_output = fallback
+        return {"change": "outputs", "outputs": self.outputs}
+
+    def focus(self, workspace_id: int) -> dict[str, Any]:
+        output = self._output_of[workspace_id]
+        self._active[output] = workspace_id
+        self._focused_output = output
+        return {"change": "focus", "id": workspace_id}
+
+    def focus_storm(self, count: int) -> list[dict[str, Any]]:
+        return list(self._focus_events(count))
+
+    def hotplug_storm(self, cycles: int) -> list[dict[str, Any]]:
+        """Dock/undock: drop to one output and back, ``cycles`` times."""
+        return list(self._hotplug_events(cycles))
+
+    def _focus_events(self, count: int) -> Iterator[dict[str, Any]]:
+        workspace_ids = list(self._output_of)
+        for _ in range(count):
+            yield self.focus(self._random.choice(workspace_ids))
+
+    def _hotplug_events(self, cycles: int) -> Iterator[dict[str, Any]]:
+        docked = len(self._outputs)
+        for _ in range(cycles):
+            yield self.set_monitors(1)
+            yield self.set_monitors(docked)
+
+    def apply_event(self, table: WorkspaceTable, payload: Any) -> set | None:
+        if not isinstance(payload, dict) or payload.get("change") != "focus":
+            return None
+        if payload.get("id") not in table:
+            return None
+        return table.activate(payload["id"], focused=True)
+
+    def needs_output_refresh(self, payload: Any) -> bool:
+        return isinstance(payload, dict) and payload.get("change") == "outputs"
+
+    async def get_outputs_async(self) -> list[SyntheticOutput]:
+        return [SyntheticOutput(name, name == self._focused_output) for name in self._outputs]
+
+    async def get_records_async(self) -> list[WorkspaceRecord]:
+        return self.records()
+
+    async def focus_record_async(self, record: WorkspaceRecord) -> bool:
+        self.emit([self.focus(record.id)])
+        return True
+
+    async def quit_async(self) -> bool:
+        self.stop_event_monitor()
+        return True
+
+    def emit(self, events: list[dict[str, Any]]) -> None:
+        if self._on_event is None:
+            return
+        for event in events:
+            self._on_event(event)
+
+    def start_event_monitor(self, on_event: Callable[[Any], None]) -> None:
+        self._on_event = on_event
+        if self.storm is None or self._storm_thread is not None:
+            return
+        kind, count = self.storm
+        self._stopped.clear()
+
+        def worker() -> None:
+            # Generated lazily so the state queried by a resync matches the events sent so far.
+            events = self._hotplug_events(count) if kind == "hotplug" else self._focus_events(count)
+            for event in events:
+                if self._stopped.is_set():
+                    return
+                on_event(event)
+                if self.interval:
+                    time.sleep(self.interval)
+
+        self._storm_thread = threading.Thread(target=worker, name="synthetic-storm", daemon=True)
+        self._storm_thread.start()
+
+    def stop_event_monitor(self) -> None:
+        self._stopped.set()
+        self._on_event = None
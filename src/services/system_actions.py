@@ -1,8 +1,12 @@
 import subprocess
 
+from services.metrics import Metrics
+
 
 def _run_systemctl(action: str) -> None:
-    subprocess.Popen(["systemctl", action])
+    command = ["systemctl", action]
+    Metrics.get_default().count_spawn(command)
+    subprocess.Popen(command)
 
 
 def reboot() -> None:
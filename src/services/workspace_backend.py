@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Protocol
+
+from services.workspace_table import WorkspaceRecord, WorkspaceTable
+
+
+class WorkspaceBackend(Protocol):
+    """An event-stream workspace source that Compositor mirrors into a WorkspaceTable.
+
+    ``start_event_monitor`` may call ``on_event`` from any thread; Compositor
+    applies the payloads on the main loop via ``apply_event``, which returns the
+    changed keys or ``None`` to request a full ``get_records_async`` resync.
+    ``get_outputs_async`` returns ``None`` when monitors come from elsewhere.
+    """
+
+    compositor_type: str
+    monitor_source: str
+
+    def apply_event(self, table: WorkspaceTable, payload: Any) -> set | None:
+        raise NotImplementedError
+
+    def needs_output_refresh(self, payload: Any) -> bool:
+        raise NotImplementedError
+
+    async def get_outputs_async(self) -> list | None:
+        raise NotImplementedError
+
+    async def get_records_async(self) -> list[WorkspaceRecord]:
+        raise NotImplementedError
+
+    async def focus_record_async(self, record: WorkspaceRecord) -> bool:
+        raise NotImplementedError
+
+    async def quit_async(self) -> bool:
+        raise NotImplementedError
+
+    def start_event_monitor(self, on_event: Callable[[Any], None]) -> None:
+        raise NotImplementedError
+
+    def stop_event_monitor(self) -> None:
+        raise NotImplementedError
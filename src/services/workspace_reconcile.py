@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Iterable
+
+
+@dataclass
+class ReconcileResult:
+    added: list[Any] = field(default_factory=list)
+    removed: list[Any] = field(default_factory=list)
+    changed: list[Any] = field(default_factory=list)
+    ordered: list[Any] = field(default_factory=list)
+    order_changed: bool = False
+
+    @property
+    def layout_changed(self) -> bool:
+        return bool(self.added or self.removed or self.order_changed)
+
+
+def reconcile(
+    items: dict[Hashable, Any],
+    natives: Iterable[Any],
+    key: Callable[[Any], Hashable],
+    create: Callable[[Any], Any],
+    update: Callable[[Any, Any], bool],
+) -> ReconcileResult:
+    """Bring ``items`` (key -> wrapper) in line with ``natives`` in place.
+
+    Wrappers whose key is still present are kept and passed to ``update``
+    (which returns whether anything changed); only new keys are created and
+    only vanished keys are dropped. ``ordered`` follows the order of ``natives``.
+    """
+    result = ReconcileResult()
+    previous_order = list(items)
+    seen: dict[Hashable, Any] = {}
+    for native in natives:
+        native_key = key(native)
+        if native_key in seen:
+            continue
+        item = items.get(native_key)
+        if item is None:
+            item = create(native)
+            result.added.append(item)
+        elif update(item, native):
+            result.changed.append(item)
+        seen[native_key] = item
+
+    for item_key, item in items.items():
+        if item_key not in seen:
+            result.removed.append(item)
+
+    items.clear()
+    items.update(seen)
+    result.ordered = list(seen.values())
+    result.order_changed = [k for k in previous_order if k in seen] != [
+        k for k in seen if k in previous_order
+    ]
+    return result
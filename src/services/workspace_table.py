@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any, Hashable, Iterable
+
+
+@dataclass(frozen=True)
+class WorkspaceRecord:
+    key: Hashable
+    id: int
+    name: str
+    output: str | None
+    active: bool = False
+    focused: bool = False
+    urgent: bool = False
+
+
+class WorkspaceTable:
+    """Keyed workspace state that event-stream backends update with deltas.
+
+    Every mutator returns the set of keys whose record was added, removed or
+    changed, so callers only touch the wrappers that actually moved.
+    """
+
+    def __init__(self) -> None:
+        self._records: dict[Hashable, WorkspaceRecord] = {}
+        self._active_by_output: dict[str | None, Hashable] = {}
+        self._focused_key: Hashable | None = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._records
+
+    def get(self, key: Hashable) -> WorkspaceRecord | None:
+        return self._records.get(key)
+
+    def records(self) -> list[WorkspaceRecord]:
+        return list(self._records.values())
+
+    def keys(self) -> list[Hashable]:
+        return list(self._records)
+
+    @property
+    def focused_key(self) -> Hashable | None:
+        return self._focused_key
+
+    def active_key(self, output: str | None) -> Hashable | None:
+        return self._active_by_output.get(output)
+
+    def replace_all(self, records: Iterable[WorkspaceRecord]) -> set[Hashable]:
+        incoming = {record.key: record for record in records}
+        changed = {key for key in self._records if key not in incoming}
+        changed.update(
+            key for key, record in incoming.items() if self._records.get(key) != record
+        )
+        self._records = incoming
+        self._active_by_output = {
+            record.output: record.key for record in incoming.values() if record.active
+        }
+        self._focused_key = next(
+            (record.key for record in incoming.values() if record.focused),
+            None,
+        )
+        return changed
+
+    def upsert(self, record: WorkspaceRecord) -> set[Hashable]:
+        previous = self._records.get(record.key)
+        if previous == record:
+            return set()
+        changed = {record.key}
+        if previous is not None and self._active_by_output.get(previous.output) == record.key:
+            del self._active_by_output[previous.output]
+        if record.active:
+            changed |= self._set_active(record.output, record.key)
+        if record.focused:
+            changed |= self._set_focused(record.key)
+        elif self._focused_key == record.key:
+            self._focused_key = None
+        self._records[record.key] = record
+        return changed
+
+    def remove(self, key: Hashable) -> set[Hashable]:
+        record = self._records.pop(key, None)
+        if record is None:
+            return set()
+        if self._active_by_output.get(record.output) == key:
+            del self._active_by_output[record.output]
+        if self._focused_key == key:
+            self._focused_key = None
+        return {key}
+
+    def activate(self, key: Hashable, focused: bool = False) -> set[Hashable]:
+        record = self._records.get(key)
+        if record is None:
+            return set()
+        changed = self._set_active(record.output, key)
+        if focused:
+            changed |= self._set_focused(key)
+        return changed
+
+    def update(self, key: Hashable, **fields: Any) -> set[Hashable]:
+        record = self._records.get(key)
+        if record is None:
+            return set()
+        return self.upsert(replace(record, **fields))
+
+    def _set_active(self, output: str | None, key: Hashable) -> set[Hashable]:
+        changed = set()
+        previous_key = self._active_by_output.get(output)
+        if previous_key is not None and previous_key != key:
+            previous = self._records.get(previous_key)
+            if previous is not None and previous.active:
+                self._records[previous_key] = replace(previous, active=False)
+                changed.add(previous_key)
+        self._active_by_output[output] = key
+        record = self._records.get(key)
+        if record is not None and not record.active:
+            self._records[key] = replace(record, active=True)
+            changed.add(key)
+        return changed
+
+    def _set_focused(self, key: Hashable) -> set[Hashable]:
+        changed = set()
+        previous_key = self._focused_key
+        if previous_key is not None and previous_key != key:
+            previous = self._records.get(previous_key)
+            if previous is not None and previous.focused:
+                self._records[previous_key] = replace(previous, focused=False)
+                changed.add(previous_key)
+        self._focused_key = key
+        record = self._records.get(key)
+        if record is not None and not record.focused:
+            self._records[key] = replace(record, focused=True)
+            changed.add(key)
+        return changed
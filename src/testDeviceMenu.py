@@ -3,13 +3,13 @@ import logging
 import gi
 import versions
 import pathlib
-import asyncio
 from gi.repository import Gtk, Astal, GLib
 
 from ui.quicksettings.DeviceMenu import DeviceMenu
 from ui.quicksettings.BrightnessMenu import BrightnessMenu
 from ui.quicksettings.VolumeMenu import VolumeMenu
 from ui.quicksettings.BluetoothMenu import BluetoothMenu
+from utils.glib_asyncio import install_glib_event_loop
 
 BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
 CSS_FILE = BASE_DIR / 'generated' / 'style.css'
@@ -34,15 +34,9 @@ class TestApp(Astal.Application):
         
         win.present()
 
-def loop_step(loop):
-    loop.call_soon(loop.stop)
-    loop.run_forever()
-    return True
 
 if __name__ == '__main__':
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    GLib.timeout_add(10, loop_step, loop)
+    install_glib_event_loop()
 
     logging.basicConfig(level=logging.INFO)
 
@@ -13,11 +13,13 @@ from gi.repository import (
     AstalPowerProfiles,
     AstalTray,
     AstalBluetooth,
+    Gdk,
 )
 
 from ui.common.WindowManager import WindowManager
 from ui.bar.Workspaces import Workspaces
 from ui.bar.Launcher import Launcher
+from ui.common.scroll_accumulator import ScrollAccumulator
 from utils import Blueprint
 
 SYNC = GObject.BindingFlags.SYNC_CREATE
@@ -45,6 +47,8 @@ class Bar(Astal.Window):
         super().__init__(**kwargs)
         
         self.window_manager = window_manager
+        # Volume steps are cheap; allow faster repeats than workspace switching.
+        self._volume_scroll = ScrollAccumulator(max_rate=20)
 
         # clock
         timer = AstalIO.Time.interval(1000, self.set_clock)
@@ -170,12 +174,15 @@ class Bar(Astal.Window):
             self.window_manager.toggle_device_menu(self.get_monitor())
 
     @Gtk.Template.Callback()
-    def on_volume_scroll(self, _controller, _dx, dy) -> None:
+    def on_volume_scroll(self, controller, _dx, dy) -> None:
+        step = self._volume_scroll.push(dy, pixels=controller.get_unit() == Gdk.ScrollUnit.SURFACE)
+        if not step:
+            return
         speaker = AstalWp.get_default().get_default_speaker()
         if not speaker:
             return
 
-        if dy > 0:
+        if step > 0:
             speaker.set_volume(max(0, speaker.get_volume() - 0.05))
         else:
             speaker.set_volume(min(1.0, speaker.get_volume() + 0.05))
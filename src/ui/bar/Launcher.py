@@ -3,6 +3,7 @@ import subprocess
 import versions
 from gi.repository import Gtk
 from utils import Blueprint
+from services.metrics import Metrics
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +16,9 @@ class Launcher(Gtk.Button):
 
     @Gtk.Template.Callback()
     def on_clicked(self, _button: Gtk.Button) -> None:
+        command = ["wofi", "--show", "drun", "--allow-images", "--columns", "3", "--gtk-dark"]
         try:
-            subprocess.Popen(
-                ["wofi", "--show", "drun", "--allow-images", "--columns", "3", "--gtk-dark"]
-            )
+            Metrics.get_default().count_spawn(command)
+            subprocess.Popen(command)
         except Exception as error:
             logger.error(f"Failed to launch wofi: {error}")
\ No newline at end of file
@@ -1,8 +1,12 @@
 import logging
+import os
 import versions
-from gi.repository import Gtk, GObject, Gdk
+from gi.repository import Gtk, GObject, Gdk, Gsk, Graphene
 from utils import Blueprint
 from services.Compositor import Compositor
+from services.workspace_reconcile import reconcile
+from ui.bar.strip_layout import PILL_SIZE, hit_test, layout_pills, strip_width
+from ui.common.scroll_accumulator import ScrollAccumulator
 
 _log = logging.getLogger("py_desktop.workspaces")
 if not logging.getLogger().handlers:
@@ -16,37 +20,52 @@ class WorkspaceButton(Gtk.Button):
     name = GObject.Property(type=str, default="")
     id_string = GObject.Property(type=str, default="")
 
+    # Buttons built since startup, across every bar.
+    constructed = 0
 
-    def __init__(self, workspace):
+    def __init__(self, workspace, on_active=None):
         super().__init__()
+        WorkspaceButton.constructed += 1
         self.workspace = workspace
-        workspace.bind_property("id", self, "id", GObject.BindingFlags.SYNC_CREATE)
-        workspace.bind_property(
-            "id",
-            self,
-            "id_string",
-            GObject.BindingFlags.SYNC_CREATE,
-            lambda _binding, value: (True, str(value) if value is not None else ""),
-        )
-        workspace.bind_property("name", self, "name", GObject.BindingFlags.SYNC_CREATE)
-        workspace.bind_property(
-            "name",
-            self,
-            "tooltip_text",
-            GObject.BindingFlags.SYNC_CREATE,
-            lambda _binding, value: (True, str(value) if value is not None else ""),
-        )
+        self._on_active = on_active
+        self._bindings = [
+            workspace.bind_property("id", self, "id", GObject.BindingFlags.SYNC_CREATE),
+            workspace.bind_property(
+                "id",
+                self,
+                "id_string",
+                GObject.BindingFlags.SYNC_CREATE,
+                lambda _binding, value: (True, str(value) if value is not None else ""),
+            ),
+            workspace.bind_property("name", self, "name", GObject.BindingFlags.SYNC_CREATE),
+            workspace.bind_property(
+                "name",
+                self,
+                "tooltip_text",
+                GObject.BindingFlags.SYNC_CREATE,
+                lambda _binding, value: (True, str(value) if value is not None else ""),
+            ),
+        ]
         
         self.connect("clicked", self.on_clicked)
         
         # Listen for active state changes (specifically for Niri)
-        self.workspace.connect("notify::is-active", self._update_state)
+        self._active_handler = self.workspace.connect("notify::is-active", self._update_state)
         self._update_state()
-        _log.info("WorkspaceButton init id=%s name=%s", self.id, self.name)
+        _log.debug("WorkspaceButton init id=%s name=%s", self.id, self.name)
+
+    def dispose(self):
+        """Drop the bindings and handler held on the workspace; called once the button is removed."""
+        for binding in self._bindings:
+            binding.unbind()
+        self._bindings = []
+        if self._active_handler:
+            self.workspace.disconnect(self._active_handler)
+            self._active_handler = 0
 
     def on_clicked(self, _):
         _log.info("WorkspaceButton clicked id=%s name=%s", self.id, self.name)
-        self.workspace.focus()
+        Compositor.get_default().focus_workspace(self.workspace)
         
     def _update_state(self, *args):
         is_active = self.workspace.get_property("is-active")
@@ -55,15 +74,164 @@ class WorkspaceButton(Gtk.Button):
             self.add_css_class("active")
         else:
             self.remove_css_class("active")
+        if self._on_active is not None:
+            self._on_active(self, is_active)
+
+def _with_alpha(color, alpha):
+    faded = color.copy()
+    faded.alpha = color.alpha * alpha
+    return faded
+
+
+class WorkspaceStrip(Gtk.Widget):
+    """All of a bar's workspaces as pills drawn in one snapshot, for setups with many workspaces.
+
+    Selected with ``PY_DESKTOP_WORKSPACES=strip``. Instead of a button, bindings
+    and CSS node per workspace there is one widget; it watches only is-active
+    and is-urgent and repaints when that state (or the hovered pill) changes.
+    """
+
+    __gtype_name__ = "WorkspaceStrip"
+
+    # Totals across every bar, reported by the status request.
+    snapshots = 0
+    repaints = 0
+
+    def __init__(self):
+        super().__init__()
+        self.add_css_class("workspace-strip")
+        self.workspaces = []
+        self.active_index = -1
+        self._handlers = []
+        self._states = ()
+        self._pills = None
+        self._pills_height = None
+        self._hover = None
+
+        click = Gtk.GestureClick()
+        click.connect("released", self._on_released)
+        self.add_controller(click)
+        motion = Gtk.EventControllerMotion()
+        motion.connect("motion", self._on_motion)
+        motion.connect("leave", self._on_leave)
+        self.add_controller(motion)
+        self.set_has_tooltip(True)
+        self.connect("query-tooltip", self._on_query_tooltip)
+
+    def set_workspaces(self, workspaces):
+        if workspaces == self.workspaces:
+            return
+        for workspace, handler_id in self._handlers:
+            workspace.disconnect(handler_id)
+        self.workspaces = list(workspaces)
+        self._handlers = [
+            (workspace, workspace.connect(signal, self._refresh_states))
+            for workspace in self.workspaces
+            for signal in ("notify::is-active", "notify::is-urgent")
+        ]
+        self._refresh_states()
+
+    def _refresh_states(self, *args):
+        states = tuple((workspace.is_active, workspace.is_urgent) for workspace in self.workspaces)
+        if states == self._states:
+            return
+        previous_width = strip_width([active for active, _urgent in self._states])
+        self._states = states
+        self._pills = None
+        self.active_index = next((i for i, (active, _urgent) in enumerate(states) if active), -1)
+        WorkspaceStrip.repaints += 1
+        if strip_width([active for active, _urgent in states]) != previous_width:
+            self.queue_resize()
+        else:
+            self.queue_draw()
+
+    def _layout(self):
+        height = self.get_height()
+        if self._pills is None or self._pills_height != height:
+            self._pills = layout_pills([active for active, _urgent in self._states], height)
+            self._pills_height = height
+        return self._pills
+
+    def do_measure(self, orientation, for_size):
+        if orientation == Gtk.Orientation.HORIZONTAL:
+            width = strip_width([active for active, _urgent in self._states])
+            return width, width, -1, -1
+        return PILL_SIZE, PILL_SIZE, -1, -1
+
+    def do_snapshot(self, snapshot):
+        WorkspaceStrip.snapshots += 1
+        foreground = self.get_color()
+        accent = self._named_color("accent_color", foreground)
+        urgent = self._named_color("error_color", foreground)
+        for index, (pill, (is_active, is_urgent)) in enumerate(zip(self._layout(), self._states)):
+            if is_active:
+                color = accent
+            elif is_urgent:
+                color = urgent
+            else:
+                color = _with_alpha(foreground, 0.5 if index == self._hover else 0.2)
+            rect = Graphene.Rect().init(pill.x, pill.y, pill.width, pill.height)
+            rounded = Gsk.RoundedRect()
+            rounded.init_from_rect(rect, pill.height / 2)
+            snapshot.push_rounded_clip(rounded)
+            snapshot.append_color(color, rect)
+            snapshot.pop()
+
+    def _named_color(self, name, fallback):
+        found, color = self.get_style_context().lookup_color(name)
+        return color if found else fallback
+
+    def _on_released(self, _gesture, _n_press, x, y):
+        index = hit_test(self._layout(), x, y)
+        if index is not None:
+            Compositor.get_default().focus_workspace(self.workspaces[index])
+
+    def _on_motion(self, _controller, x, y):
+        self._set_hover(hit_test(self._layout(), x, y))
+
+    def _on_leave(self, _controller):
+        self._set_hover(None)
+
+    def _set_hover(self, index):
+        if index != self._hover:
+            self._hover = index
+            self.queue_draw()
+
+    def _on_query_tooltip(self, _widget, x, y, _keyboard, tooltip):
+        index = hit_test(self._layout(), x, y)
+        if index is None:
+            return False
+        tooltip.set_text(self.workspaces[index].name or str(self.workspaces[index].id))
+        return True
+
 
 @Blueprint("bar/Workspaces.blp")
 class Workspaces(Gtk.Box):
     __gtype_name__ = "Workspaces"
 
+    # Totals across every bar, reported by the status request.
+    updates = 0
+    buttons_created = 0
+    buttons_removed = 0
+    buttons_moved = 0
+
     def __init__(self):
         super().__init__()
+        # Workspace -> its button; buttons are kept across updates.
+        self._buttons = {}
+        # Shown buttons in order, their positions and the active one, kept for scrolling.
+        self._ordered = []
+        self._positions = {}
+        self._active_button = None
+        self._scroll = ScrollAccumulator.from_env()
+        # PY_DESKTOP_WORKSPACES=strip draws every workspace in one widget instead of buttons.
+        self._strip = None
+        if os.environ.get("PY_DESKTOP_WORKSPACES", "buttons") == "strip":
+            self._strip = WorkspaceStrip()
+            self.append(self._strip)
+        self.last_update = {"created": 0, "removed": 0, "moved": 0}
         self.compositor = Compositor.get_default()
-        self.compositor.connect("workspaces-changed", self.on_workspaces_changed)
+        self._changed_handler = self.compositor.connect("workspaces-changed", self.on_workspaces_changed)
         
         # Scroll to switch workspaces
         scroll = Gtk.EventControllerScroll(flags=Gtk.EventControllerScrollFlags.VERTICAL)
@@ -76,8 +244,23 @@ class Workspaces(Gtk.Box):
     def _on_map(self, *args):
         # Run once
         self.disconnect_by_func(self._on_map)
+        self._subscribe_to_monitor()
         self.on_workspaces_changed()
 
+    def _subscribe_to_monitor(self):
+        """Listen only to workspaces-changed::<connector> of the monitor this bar is on."""
+        root = self.get_root()
+        if root is None or not hasattr(root, "get_monitor"):
+            return
+        monitor = self.compositor.get_monitor_for_gdk_id(root.get_monitor())
+        if monitor is None or not monitor.name:
+            # Unknown monitor: keep hearing every change.
+            return
+        self.compositor.disconnect(self._changed_handler)
+        self._changed_handler = self.compositor.connect(
+            f"workspaces-changed::{monitor.name}", self.on_workspaces_changed
+        )
+
     def on_workspaces_changed(self, *args):
         root = self.get_root()
         if root is None:
@@ -90,48 +273,81 @@ class Workspaces(Gtk.Box):
         gdk_monitor_id = root.get_monitor()
         _log.info("Workspaces changed gdk_monitor_id=%s", gdk_monitor_id)
 
-        # Clear existing children
-        while child := self.get_first_child():
-            self.remove(child)
-        
         workspaces_to_show = self.compositor.get_workspaces_for_monitor(gdk_id=gdk_monitor_id)
         _log.info("Workspaces to show count=%s ids=%s", len(workspaces_to_show), [w.id for w in workspaces_to_show])
-            
-        for ws in workspaces_to_show:
-            self.append(WorkspaceButton(ws))
-        
-        child = self.get_first_child()
-        while child:
-            if isinstance(child, WorkspaceButton):
-                child._update_state()
-            child = child.get_next_sibling()
+        if self._strip is not None:
+            self._strip.set_workspaces(workspaces_to_show)
+            return
+
+        result = reconcile(
+            self._buttons,
+            workspaces_to_show,
+            key=lambda ws: ws,
+            create=lambda ws: WorkspaceButton(ws, on_active=self._on_button_active),
+            # Bindings keep existing buttons current; nothing to refresh.
+            update=lambda _button, _ws: False,
+        )
+        for button in result.removed:
+            self.remove(button)
+            button.dispose()
+            if button is self._active_button:
+                self._active_button = None
+
+        moved = 0
+        previous = None
+        for button in result.ordered:
+            if button.get_parent() is None:
+                self.insert_child_after(button, previous)
+            elif button.get_prev_sibling() is not previous:
+                self.reorder_child_after(button, previous)
+                moved += 1
+            previous = button
+        self._ordered = result.ordered
+        self._positions = {button: index for index, button in enumerate(result.ordered)}
+
+        self._record_update(len(result.added), len(result.removed), moved)
+
+    def _record_update(self, created, removed, moved):
+        self.last_update = {"created": created, "removed": removed, "moved": moved}
+        Workspaces.updates += 1
+        Workspaces.buttons_created += created
+        Workspaces.buttons_removed += removed
+        Workspaces.buttons_moved += moved
+        _log.debug("Workspaces update created=%s removed=%s moved=%s", created, removed, moved)
+
+    @classmethod
+    def widget_stats(cls):
+        return {
+            "updates": cls.updates,
+            "buttons_created": cls.buttons_created,
+            "buttons_removed": cls.buttons_removed,
+            "buttons_moved": cls.buttons_moved,
+            "buttons_constructed": WorkspaceButton.constructed,
+            "strip_repaints": WorkspaceStrip.repaints,
+            "strip_snapshots": WorkspaceStrip.snapshots,
+        }
+
+    def _on_button_active(self, button, is_active):
+        if is_active:
+            self._active_button = button
+        elif button is self._active_button:
+            self._active_button = None
 
     def on_scroll(self, controller, dx, dy):
-        _log.info("Workspaces scroll dx=%s dy=%s", dx, dy)
-        children = []
-        child = self.get_first_child()
-        while child:
-            if isinstance(child, WorkspaceButton):
-                children.append(child)
-            child = child.get_next_sibling()
-            
-        if not children:
-            _log.info("Workspaces scroll ignored: no children")
+        pixels = controller.get_unit() == Gdk.ScrollUnit.SURFACE
+        step = self._scroll.push(dy, pixels=pixels)
+        if not step:
             return
 
-        active_index = -1
-        for i, btn in enumerate(children):
-            if btn.has_css_class("active"):
-                active_index = i
-                break
-        _log.info("Workspaces scroll active_index=%s total=%s", active_index, len(children))
-        
-        target_index = active_index
-        if dy > 0: target_index += 1
-        elif dy < 0: target_index -= 1
-        _log.info("Workspaces scroll target_index=%s", target_index)
-        
-        if 0 <= target_index < len(children):
-            target = children[target_index]
+        if self._strip is not None:
+            shown = self._strip.workspaces
+            active_index = self._strip.active_index
+        else:
+            shown = self._ordered
+            active_index = self._positions.get(self._active_button, -1)
+        target_index = active_index + step
+        _log.debug("Workspaces scroll active_index=%s target_index=%s", active_index, target_index)
+        if 0 <= target_index < len(shown):
+            target = shown[target_index]
             _log.info("Workspaces scroll focus id=%s name=%s", target.id, target.name)
-            children[target_index].workspace.focus()
+            self.compositor.focus_workspace(target if self._strip is not None else target.workspace)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+# Same geometry as the .workspace-button.dot CSS, so both modes look alike.
+PILL_SIZE = 12
+ACTIVE_WIDTH = 32
+MARGIN = 4
+
+
+@dataclass(frozen=True)
+class Pill:
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+def strip_width(active: Sequence[bool]) -> int:
+    return sum((ACTIVE_WIDTH if is_active else PILL_SIZE) + 2 * MARGIN for is_active in active)
+
+
+def layout_pills(active: Sequence[bool], height: float) -> list[Pill]:
+    """One pill per workspace, left to right, vertically centred in ``height``."""
+    y = max(0.0, (height - PILL_SIZE) / 2)
+    pills = []
+    x = 0.0
+    for is_active in active:
+        width = ACTIVE_WIDTH if is_active else PILL_SIZE
+        pills.append(Pill(x + MARGIN, y, width, PILL_SIZE))
+        x += width + 2 * MARGIN
+    return pills
+
+
+def hit_test(pills: Sequence[Pill], x: float, y: float) -> int | None:
+    """Index of the pill under (x, y); the margins around a pill count as part of it."""
+    for index, pill in enumerate(pills):
+        if pill.x - MARGIN <= x < pill.x + pill.width + MARGIN:
+            if pill.y - MARGIN <= y < pill.y + pill.height + MARGIN:
+                return index
+            return None
+    return None
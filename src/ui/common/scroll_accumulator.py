@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from typing import Callable
+
+# Touchpads report SURFACE deltas in pixels; this many make one wheel notch.
+PIXELS_PER_STEP = 40.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class ScrollAccumulator:
+    """Turn a stream of scroll deltas into whole steps, at most ``max_rate`` per second.
+
+    Deltas add up until they reach ``threshold`` (1.0 is one wheel notch), so a
+    touchpad swipe of many small deltas acts once per notch's worth of travel.
+    Reversing direction starts over. Steps arriving faster than ``max_rate``
+    are dropped rather than queued, so a free-spinning wheel never leaves a
+    backlog of actions behind it.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 1.0,
+        max_rate: float = 8.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.threshold = threshold
+        self.min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self._clock = clock
+        self._delta = 0.0
+        self._last_action: float | None = None
+        self.events = 0
+        self.actions = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_env(cls) -> ScrollAccumulator:
+        return cls(
+            threshold=_env_float("PY_DESKTOP_SCROLL_THRESHOLD", 1.0),
+            max_rate=_env_float("PY_DESKTOP_SCROLL_MAX_RATE", 8.0),
+        )
+
+    def push(self, delta: float, pixels: bool = False) -> int:
+        """Add one scroll event; returns -1, 0 or 1 steps to act on now."""
+        self.events += 1
+        if pixels:
+            delta /= PIXELS_PER_STEP
+        if delta == 0:
+            return 0
+        if (delta > 0) != (self._delta > 0):
+            self._delta = 0.0
+        self._delta += delta
+        if abs(self._delta) < self.threshold:
+            return 0
+        step = 1 if self._delta > 0 else -1
+        # Keep only the partial notch; extra whole notches in one burst would be a backlog.
+        self._delta = math.fmod(self._delta, self.threshold)
+        now = self._clock()
+        if self._last_action is not None and now - self._last_action < self.min_interval:
+            self.dropped += 1
+            return 0
+        self._last_action = now
+        self.actions += 1
+        return step
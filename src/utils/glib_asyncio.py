@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import math
+
+from gi.repository import GLib
+
+_log = logging.getLogger("py_desktop.glib_asyncio")
+
+
+class GLibDrivenEventLoop(asyncio.SelectorEventLoop):
+    """asyncio loop stepped by GLib sources on the default main context instead of a polling timer.
+
+    Fallback for PyGObject builds without ``gi.events``. The selector's fd is
+    watched by a GLib fd source (call_soon_threadsafe writes to the loop's
+    self-pipe, which is registered there too), the earliest scheduled timer
+    becomes one GLib timeout, and callbacks queued from GLib handlers schedule
+    an idle step. With nothing pending the loop costs no wakeups at all.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.steps = 0
+        self._glib_attached = False
+        self._glib_fd_source = 0
+        self._glib_timer = 0
+        self._glib_timer_when = None
+        self._glib_idle = 0
+        self._glib_stepping = False
+
+    def attach(self):
+        self._glib_attached = True
+        self._glib_fd_source = GLib.unix_fd_add_full(
+            GLib.PRIORITY_DEFAULT, self._selector.fileno(), GLib.IOCondition.IN, self._on_glib_fd
+        )
+        self._schedule_glib_step()
+
+    def detach(self):
+        self._glib_attached = False
+        for source_id in (self._glib_fd_source, self._glib_timer, self._glib_idle):
+            if source_id:
+                GLib.source_remove(source_id)
+        self._glib_fd_source = self._glib_timer = self._glib_idle = 0
+        self._glib_timer_when = None
+
+    def close(self):
+        self.detach()
+        super().close()
+
+    def run_forever(self):
+        try:
+            super().run_forever()
+        finally:
+            # Callbacks queued by a direct run_until_complete still need a step afterwards.
+            if not self._glib_stepping:
+                self._schedule_glib_step()
+
+    def call_soon(self, callback, *args, context=None):
+        handle = super().call_soon(callback, *args, context=context)
+        self._wake_glib()
+        return handle
+
+    def call_at(self, when, callback, *args, context=None):
+        handle = super().call_at(when, callback, *args, context=context)
+        self._wake_glib()
+        return handle
+
+    def _wake_glib(self):
+        # Inside a step (or a run_until_complete) the loop is already being driven.
+        if self._glib_attached and not self._glib_stepping and not self.is_running():
+            self._schedule_glib_step()
+
+    def _glib_step(self):
+        self._glib_stepping = True
+        try:
+            self.steps += 1
+            # Exactly one pass: ready callbacks run and the selector is polled without blocking.
+            asyncio.SelectorEventLoop.call_soon(self, self.stop)
+            self.run_forever()
+        finally:
+            self._glib_stepping = False
+        self._schedule_glib_step()
+
+    def _on_glib_fd(self, _fd, _condition):
+        self._glib_step()
+        return GLib.SOURCE_CONTINUE
+
+    def _on_glib_idle(self):
+        self._glib_idle = 0
+        self._glib_step()
+        return GLib.SOURCE_REMOVE
+
+    def _on_glib_timer(self):
+        self._glib_timer = 0
+        self._glib_timer_when = None
+        self._glib_step()
+        return GLib.SOURCE_REMOVE
+
+    def _schedule_glib_step(self):
+        if not self._glib_attached:
+            return
+        if self._ready:
+            if not self._glib_idle:
+                self._glib_idle = GLib.idle_add(self._on_glib_idle)
+            return
+        # Cancelled handles stay in the heap until popped; stepping past them is harmless.
+        when = self._scheduled[0].when() if self._scheduled else None
+        if when == self._glib_timer_when:
+            return
+        if self._glib_timer:
+            GLib.source_remove(self._glib_timer)
+            self._glib_timer = 0
+        self._glib_timer_when = when
+        if when is not None:
+            delay_ms = max(0, math.ceil((when - self.time()) * 1000))
+            self._glib_timer = GLib.timeout_add(delay_ms, self._on_glib_timer)
+
+
+def install_glib_event_loop():
+    """Make the main thread's asyncio loop run from the GLib main context; returns the loop.
+
+    Uses PyGObject's ``gi.events`` integration when available, otherwise
+    ``GLibDrivenEventLoop``.
+    """
+    try:
+        from gi.events import GLibEventLoopPolicy
+    except ImportError:
+        loop = GLibDrivenEventLoop()
+        asyncio.set_event_loop(loop)
+        loop.attach()
+        _log.info("asyncio driven by GLib sources (GLibDrivenEventLoop)")
+        return loop
+    policy = GLibEventLoopPolicy()
+    asyncio.set_event_loop_policy(policy)
+    _log.info("asyncio driven by gi.events.GLibEventLoopPolicy")
+    return policy.get_event_loop()
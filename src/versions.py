@@ -1,6 +1,8 @@
 import gi
 gi.require_version('Gtk', '4.0')
 gi.require_version('Gdk', '4.0')
+gi.require_version('Gsk', '4.0')
+gi.require_version('Graphene', '1.0')
 gi.require_version('Astal','4.0')
 gi.require_version('AstalTray', '0.1')
 gi.require_version('AstalPowerProfiles', '0.1')
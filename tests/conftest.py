@@ -0,0 +1,72 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from services.scroll_ipc import I3_IPC_HEADER, pack_message, unpack_header
+
+
+class FakeI3Server:
+    """Minimal i3-ipc server on a local socket that answers from canned replies."""
+
+    def __init__(self, path, replies):
+        self.path = str(path)
+        self.replies = replies
+        self.requests = []
+        self.connections = 0
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                header = self._recv_exact(conn, I3_IPC_HEADER.size)
+                if header is None:
+                    return
+                length, msg_type = unpack_header(header)
+                payload = self._recv_exact(conn, length) or b""
+                self.requests.append((msg_type, payload.decode("utf-8")))
+                reply = self.replies.get(msg_type, [])
+                if callable(reply):
+                    reply = reply(payload.decode("utf-8"))
+                conn.sendall(pack_message(msg_type, json.dumps(reply)))
+
+    @staticmethod
+    def _recv_exact(conn, size):
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def close(self):
+        self._server.close()
+
+
+@pytest.fixture
+def fake_i3_server(tmp_path):
+    servers = []
+
+    def start(replies):
+        server = FakeI3Server(tmp_path / f"i3-{len(servers)}.sock", replies)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
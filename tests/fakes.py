@@ -0,0 +1,120 @@
+"""Fakes shared by the unit and perf tests."""
+
+from services.active_workspace import ActiveWorkspaceTracker
+
+
+class Props:
+    """Attribute bag standing in for a GObject's ``props``."""
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+class FakeBinding:
+    # Bindings created and not yet unbound, across all fakes.
+    live = 0
+
+    def __init__(self):
+        FakeBinding.live += 1
+        self._bound = True
+
+    def unbind(self):
+        if self._bound:
+            self._bound = False
+            FakeBinding.live -= 1
+
+
+class FakeNiriOutput:
+    def __init__(self, name):
+        self.props = Props(name=name)
+
+    def bind_property(self, source_property, target, target_property, _flags):
+        target.set_property(target_property, getattr(self.props, source_property))
+        return FakeBinding()
+
+
+class FakeNiri:
+    def __init__(self, outputs=(), workspaces=()):
+        self.outputs = list(outputs)
+        self.workspaces = list(workspaces)
+        self.get_outputs_calls = 0
+        # Handler id -> (signal, callback) for every live connection.
+        self.handlers = {}
+        self._next_handler = 0
+
+    def connect(self, signal, callback):
+        self._next_handler += 1
+        self.handlers[self._next_handler] = (signal, callback)
+        return self._next_handler
+
+    def disconnect(self, handler_id):
+        self.handlers.pop(handler_id, None)
+
+    def get_outputs(self):
+        self.get_outputs_calls += 1
+        return list(self.outputs)
+
+    def get_workspaces(self):
+        return list(self.workspaces)
+
+    def hotplug(self, outputs):
+        self.outputs = outputs
+        for signal, callback in list(self.handlers.values()):
+            if signal == "notify::outputs":
+                callback(self, None)
+
+
+class FakeNiriWorkspace:
+    """Stands in for AstalNiri.Workspace and counts what wrappers leave attached to it."""
+
+    # Signal handlers connected and not yet disconnected, across all instances.
+    live_handlers = 0
+
+    def __init__(self, id, output="eDP-1", is_active=False, is_focused=False):
+        self.props = Props(
+            id=id,
+            name=str(id),
+            is_active=is_active,
+            is_focused=is_focused,
+            is_urgent=False,
+            output=output,
+        )
+        self._handlers = {}
+        self._next_handler = 0
+
+    def bind_property(self, source_property, target, target_property, _flags):
+        target.set_property(target_property, getattr(self.props, source_property))
+        return FakeBinding()
+
+    def connect(self, _signal, callback):
+        self._next_handler += 1
+        self._handlers[self._next_handler] = callback
+        FakeNiriWorkspace.live_handlers += 1
+        return self._next_handler
+
+    def disconnect(self, handler_id):
+        if self._handlers.pop(handler_id, None) is not None:
+            FakeNiriWorkspace.live_handlers -= 1
+
+
+class Ws:
+    """Workspace as seen by ActiveWorkspaceTracker: a key and an active flag."""
+
+    def __init__(self, key):
+        self.key = key
+        self.active = False
+
+
+def active_tracker(monitors, per_monitor):
+    """Tracker over ``monitors`` x ``per_monitor`` workspaces keyed ``monitor * 1000 + n``.
+
+    Returns the workspaces by key, the list of keys written by each activation, and the tracker.
+    """
+    workspaces = {m * 1000 + n: Ws(m * 1000 + n) for m in range(monitors) for n in range(per_monitor)}
+    writes = []
+
+    def set_active(ws, value):
+        writes.append(ws.key)
+        ws.active = value
+
+    return workspaces, writes, ActiveWorkspaceTracker(workspaces.get, set_active)
@@ -0,0 +1,23 @@
+import time
+
+from fakes import active_tracker
+
+
+def test_switch_cost_is_independent_of_workspace_count():
+    def per_switch(per_monitor):
+        _workspaces, writes, tracker = active_tracker(4, per_monitor)
+        keys = [[m * 1000 + n for n in range(per_monitor)] for m in range(4)]
+        rounds = 20000
+        started = time.perf_counter()
+        for i in range(rounds):
+            m = i % 4
+            tracker.activate(m, keys[m][i % per_monitor])
+        elapsed = (time.perf_counter() - started) / rounds
+        return elapsed, len(writes) / rounds
+
+    small_time, small_writes = min(per_switch(8) for _ in range(3))
+    large_time, large_writes = min(per_switch(64) for _ in range(3))
+
+    print(f"active switch: {small_time * 1e6:.2f} us @8/monitor, {large_time * 1e6:.2f} us @64/monitor")
+    assert small_writes <= 2 and large_writes <= 2
+    assert large_time < small_time * 3
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+from gi.repository import GLib
+
+from services.Compositor import Compositor
+
+STORM_EVENTS = 2000
+MAX_P99_MS = 20.0
+
+
+def _run_until(loop, predicate, timeout=30):
+    """Drive GLib and asyncio together the way main.py does until ``predicate`` holds."""
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        context.iteration(False)
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+
+
+def test_recorded_storm_replays_with_latency_percentiles(tmp_path, monkeypatch):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    recording = tmp_path / "storm.jsonl.gz"
+    try:
+        # Record a synthetic focus storm as a live session would.
+        monkeypatch.setenv("XDG_CURRENT_DESKTOP", "synthetic")
+        monkeypatch.setenv("PY_DESKTOP_SYNTHETIC_MONITORS", "4")
+        monkeypatch.setenv("PY_DESKTOP_SYNTHETIC_WORKSPACES", "100")
+        monkeypatch.setenv("PY_DESKTOP_SYNTHETIC_STORM", f"focus:{STORM_EVENTS}")
+        monkeypatch.setenv("PY_DESKTOP_RECORD_EVENTS", str(recording))
+        Compositor._instance = None
+        live = Compositor()
+        _run_until(loop, lambda: live.event_stats["events_received"] == STORM_EVENTS and not live._backend_events.pending)
+        live.backend.stop_event_monitor()
+        live.stop_recording()
+        expected = [(ws.id, ws.is_active, ws.is_focused) for ws in live.workspaces]
+
+        # Replay it back to back through the same path.
+        monkeypatch.setenv("XDG_CURRENT_DESKTOP", "replay")
+        monkeypatch.setenv("PY_DESKTOP_REPLAY", str(recording))
+        monkeypatch.setenv("PY_DESKTOP_REPLAY_SPEED", "0")
+        monkeypatch.delenv("PY_DESKTOP_RECORD_EVENTS")
+        Compositor._instance = None
+        replay = Compositor()
+        _run_until(loop, lambda: replay.event_latency["count"] == STORM_EVENTS)
+    finally:
+        Compositor._instance = None
+        asyncio.set_event_loop(None)
+        loop.close()
+
+    latency = replay.event_latency
+    print(f"replay {STORM_EVENTS} focus events: {latency}")
+    assert [(ws.id, ws.is_active, ws.is_focused) for ws in replay.workspaces] == expected
+    assert latency["p99_ms"] < MAX_P99_MS
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from gi.repository import GLib
+
+from utils.glib_asyncio import GLibDrivenEventLoop
+
+IDLE_SECONDS = 1.0
+
+
+def _run_glib_for(seconds, until=None):
+    """Run the default main context for ``seconds`` or until ``until()`` holds."""
+    main_loop = GLib.MainLoop()
+    GLib.timeout_add(int(seconds * 1000), main_loop.quit)
+    if until is not None:
+
+        def check():
+            if until():
+                main_loop.quit()
+                return GLib.SOURCE_REMOVE
+            return GLib.SOURCE_CONTINUE
+
+        GLib.idle_add(check)
+    main_loop.run()
+
+
+@pytest.fixture
+def glib_loop():
+    loop = GLibDrivenEventLoop()
+    asyncio.set_event_loop(loop)
+    loop.attach()
+    yield loop
+    loop.close()
+    asyncio.set_event_loop(None)
+
+
+def test_idle_wakeups_polling_bridge_vs_glib_loop(glib_loop):
+    # What main.py used to do: step the loop from a 10 ms GLib timer.
+    polling_loop = asyncio.new_event_loop()
+    polled = 0
+
+    def loop_step():
+        nonlocal polled
+        polled += 1
+        polling_loop.call_soon(polling_loop.stop)
+        polling_loop.run_forever()
+        return True
+
+    source = GLib.timeout_add(10, loop_step)
+    _run_glib_for(IDLE_SECONDS)
+    GLib.source_remove(source)
+    polling_loop.close()
+
+    steps_before = glib_loop.steps
+    _run_glib_for(IDLE_SECONDS)
+    idle_steps = glib_loop.steps - steps_before
+
+    print(
+        f"idle wakeups/s: polling bridge {polled / IDLE_SECONDS:.0f}, "
+        f"GLib-driven loop {idle_steps / IDLE_SECONDS:.0f}"
+    )
+    assert polled > 50
+    assert idle_steps == 0
+
+
+def test_awaited_io_resumes_without_polling_delay(glib_loop):
+    read_fd, write_fd = os.pipe()
+    written = []
+    resumed = []
+
+    async def wait_for_pipe():
+        ready = glib_loop.create_future()
+        glib_loop.add_reader(read_fd, ready.set_result, None)
+        await ready
+        glib_loop.remove_reader(read_fd)
+        resumed.append(time.perf_counter())
+
+    def writer():
+        time.sleep(0.05)
+        written.append(time.perf_counter())
+        os.write(write_fd, b"x")
+
+    # Created from a GLib callback, as signal handlers do via Compositor._spawn.
+    GLib.idle_add(lambda: glib_loop.create_task(wait_for_pipe()) and GLib.SOURCE_REMOVE)
+    threading.Thread(target=writer, daemon=True).start()
+    _run_glib_for(5, until=lambda: resumed)
+    os.close(read_fd)
+    os.close(write_fd)
+
+    latency_ms = (resumed[0] - written[0]) * 1000
+    print(f"pipe readable -> coroutine resumed: {latency_ms:.2f} ms")
+    assert latency_ms < 5
+
+
+def test_timers_fire_on_time(glib_loop):
+    fired = []
+
+    async def sleeper():
+        started = time.perf_counter()
+        await asyncio.sleep(0.02)
+        fired.append(time.perf_counter() - started)
+
+    GLib.idle_add(lambda: glib_loop.create_task(sleeper()) and GLib.SOURCE_REMOVE)
+    _run_glib_for(5, until=lambda: fired)
+
+    assert 0.02 <= fired[0] < 0.03
@@ -0,0 +1,25 @@
+import time
+
+from fakes import FakeNiri, FakeNiriOutput
+from services.Compositor import MonitorManager
+
+
+def test_niri_lookup_cost_stays_flat_as_workspaces_grow():
+    outputs = [FakeNiriOutput(f"DP-{i}") for i in range(8)]
+    niri = FakeNiri(outputs)
+    manager = MonitorManager(None, niri=niri)
+
+    def sync_cost(workspace_count):
+        connectors = [f"DP-{i % len(outputs)}" for i in range(workspace_count)]
+        started = time.perf_counter()
+        for connector in connectors:
+            manager.get_monitor_for_niri_connector(connector)
+        return (time.perf_counter() - started) / workspace_count
+
+    sync_cost(100)
+    small = min(sync_cost(10) for _ in range(5))
+    large = min(sync_cost(2000) for _ in range(5))
+
+    print(f"niri connector lookup: {small * 1e6:.2f} us @10 ws, {large * 1e6:.2f} us @2000 ws")
+    assert niri.get_outputs_calls == 1
+    assert large < small * 3
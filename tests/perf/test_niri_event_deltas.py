@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from fakes import FakeNiri, FakeNiriWorkspace
+from services.Compositor import Compositor
+from services.niri_ipc import apply_niri_event, parse_workspaces
+from services.workspace_table import WorkspaceTable
+
+WORKSPACE_COUNT = 100
+OUTPUTS = 4
+EVENTS = 500
+
+
+def _workspaces():
+    return [
+        {
+            "id": workspace_id,
+            "idx": workspace_id,
+            "name": None,
+            "output": f"DP-{workspace_id % OUTPUTS}",
+            "is_urgent": False,
+            "is_active": workspace_id < OUTPUTS,
+            "is_focused": workspace_id == 0,
+            "active_window_id": None,
+        }
+        for workspace_id in range(WORKSPACE_COUNT)
+    ]
+
+
+@pytest.fixture
+def niri_compositor(monkeypatch):
+    monkeypatch.setenv("XDG_CURRENT_DESKTOP", "")
+    Compositor._instance = None
+    compositor = Compositor()
+    yield compositor
+    Compositor._instance = None
+
+
+def test_event_deltas_against_astal_niri_sync(niri_compositor):
+    workspaces = _workspaces()
+    events = [{"WorkspaceActivated": {"id": i % WORKSPACE_COUNT, "focused": True}} for i in range(EVENTS)]
+
+    # Event-stream path: patch the table from each event.
+    table = WorkspaceTable()
+    table.replace_all(parse_workspaces({"Workspaces": workspaces}))
+    started = time.perf_counter()
+    delta_touched = sum(len(apply_niri_event(table, event)) for event in events)
+    delta_time = time.perf_counter() - started
+
+    # AstalNiri path: natives are updated in place, then notify::workspaces runs the real sync.
+    # AstalNiri keeps these objects across changes and updates their props in place.
+    natives = [
+        FakeNiriWorkspace(item["id"], item["output"], is_active=item["is_active"], is_focused=item["is_focused"])
+        for item in workspaces
+    ]
+    niri_compositor._niri = FakeNiri(workspaces=natives)
+    niri_compositor._sync_niri_workspaces()
+    rebound = []
+    niri_compositor.connect("workspace-changed", lambda _c, workspace: rebound.append(workspace))
+    started = time.perf_counter()
+    for event in events:
+        activated = natives[event["WorkspaceActivated"]["id"]]
+        for native in natives:
+            if native.props.output == activated.props.output:
+                native.props.is_active = native is activated
+            native.props.is_focused = native is activated
+        niri_compositor._sync_niri_workspaces()
+    sync_time = time.perf_counter() - started
+
+    print(
+        f"niri events={EVENTS} workspaces={WORKSPACE_COUNT}: "
+        f"delta {delta_time * 1e6 / EVENTS:.1f} us/event touched={delta_touched}, "
+        f"astal sync {sync_time * 1e6 / EVENTS:.1f} us/event rebound={len(rebound)}"
+    )
+    assert delta_touched <= 4 * EVENTS
+    # Wrappers survive syncs: the same natives are never re-bound, but every sync still walks the list.
+    assert rebound == []
+    assert delta_time < sync_time
@@ -0,0 +1,26 @@
+import time
+
+from services.scroll_ipc import ScrollIPC
+
+WORKSPACES_REPLY = [
+    {"num": 1, "name": "1", "focused": True, "visible": True, "output": "eDP-1"},
+    {"num": 2, "name": "2", "focused": False, "visible": False, "output": "eDP-1"},
+]
+
+
+def test_native_query_latency(fake_i3_server):
+    server = fake_i3_server({1: WORKSPACES_REPLY})
+    ipc = ScrollIPC(socket_path=server.path)
+    ipc.get_workspaces()
+
+    rounds = 200
+    started = time.perf_counter()
+    for _ in range(rounds):
+        ipc.get_workspaces()
+    per_query_ms = (time.perf_counter() - started) * 1000 / rounds
+
+    print(f"native get_workspaces: {per_query_ms:.3f} ms/query")
+    # A scrollmsg fork+exec costs several milliseconds; a socket round trip must stay well below.
+    assert per_query_ms < 5.0
+    assert server.connections == 1
+    ipc.close()
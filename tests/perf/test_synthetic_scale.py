@@ -0,0 +1,151 @@
+import asyncio
+import time
+import tracemalloc
+
+import pytest
+
+from services.Compositor import Compositor
+
+MONITOR_COUNTS = (1, 4, 16)
+WORKSPACE_COUNTS = (10, 100, 1000)
+FOCUS_EVENTS = 200
+HOTPLUG_CYCLES = 5
+
+# Regression thresholds; generous enough for CI machines, tight enough to catch O(n^2) paths.
+MAX_SYNC_MS_PER_WORKSPACE = 0.5
+MAX_FOCUS_MS_PER_EVENT = 1.0
+MAX_MONITOR_LOOKUP_MS = 5.0
+MAX_HOTPLUG_MS = 50.0 + 0.5 * max(WORKSPACE_COUNTS)
+MAX_SYNC_BYTES_PER_WORKSPACE = 8 * 1024
+
+
+@pytest.fixture
+def synthetic(monkeypatch):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    created = []
+
+    def start(monitors, workspaces):
+        monkeypatch.setenv("XDG_CURRENT_DESKTOP", "synthetic")
+        monkeypatch.setenv("PY_DESKTOP_SYNTHETIC_MONITORS", str(monitors))
+        monkeypatch.setenv("PY_DESKTOP_SYNTHETIC_WORKSPACES", str(workspaces))
+        Compositor._instance = None
+        compositor = Compositor()
+        created.append(compositor)
+        return compositor
+
+    def settle(compositor):
+        # Resyncs run as tasks on the loop main.py normally drives.
+        task = compositor._backend_resync_task
+        if task is not None:
+            loop.run_until_complete(task)
+
+    yield start, settle
+    for compositor in created:
+        compositor.backend.stop_event_monitor()
+    Compositor._instance = None
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+def _report(name, monitors, workspaces, value, unit):
+    print(f"synthetic {name} monitors={monitors} workspaces={workspaces}: {value:.3f} {unit}")
+
+
+@pytest.mark.parametrize("monitors", MONITOR_COUNTS)
+@pytest.mark.parametrize("workspaces", WORKSPACE_COUNTS)
+def test_initial_sync(synthetic, monitors, workspaces):
+    start, settle = synthetic
+    tracemalloc.start()
+    started = time.perf_counter()
+    compositor = start(monitors, workspaces)
+    settle(compositor)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    _report("sync", monitors, workspaces, elapsed_ms, "ms")
+    _report("sync alloc", monitors, workspaces, peak / 1024, "KiB peak")
+    assert len(compositor.workspaces) == workspaces
+    assert len(compositor.monitors) == monitors
+    assert elapsed_ms < 20 + MAX_SYNC_MS_PER_WORKSPACE * workspaces
+    assert peak < 256 * 1024 + MAX_SYNC_BYTES_PER_WORKSPACE * workspaces
+
+
+@pytest.mark.parametrize("monitors", MONITOR_COUNTS)
+@pytest.mark.parametrize("workspaces", WORKSPACE_COUNTS)
+def test_focus_storm(synthetic, monitors, workspaces):
+    start, settle = synthetic
+    compositor = start(monitors, workspaces)
+    settle(compositor)
+    events = compositor.backend.focus_storm(FOCUS_EVENTS)
+
+    started = time.perf_counter()
+    for event in events:
+        compositor.feed_backend_events([event])
+    per_event_ms = (time.perf_counter() - started) * 1000 / len(events)
+
+    _report("focus", monitors, workspaces, per_event_ms, "ms/event")
+    focused = [ws for ws in compositor.workspaces if ws.is_focused]
+    assert [ws.id for ws in focused] == [events[-1]["id"]]
+    assert per_event_ms < MAX_FOCUS_MS_PER_EVENT
+
+
+@pytest.mark.parametrize("monitors", MONITOR_COUNTS)
+@pytest.mark.parametrize("workspaces", WORKSPACE_COUNTS)
+def test_per_monitor_workspace_lookup(synthetic, monitors, workspaces):
+    start, settle = synthetic
+    compositor = start(monitors, workspaces)
+    settle(compositor)
+
+    # The per-monitor query behind each bar's workspace list; widget work is in test_workspace_strip.py.
+    started = time.perf_counter()
+    shown = [compositor.get_workspaces_for_monitor(monitor) for monitor in compositor.monitors]
+    per_monitor_ms = (time.perf_counter() - started) * 1000 / monitors
+
+    _report("per-monitor lookup", monitors, workspaces, per_monitor_ms, "ms/monitor")
+    assert sum(len(listed) for listed in shown) == workspaces
+    assert per_monitor_ms < MAX_MONITOR_LOOKUP_MS
+
+
+@pytest.mark.parametrize("monitors", (4, 16))
+@pytest.mark.parametrize("workspaces", WORKSPACE_COUNTS)
+def test_hotplug_storm(synthetic, monitors, workspaces):
+    start, settle = synthetic
+    compositor = start(monitors, workspaces)
+    settle(compositor)
+    events = compositor.backend.hotplug_storm(HOTPLUG_CYCLES)
+
+    started = time.perf_counter()
+    for event in events:
+        compositor.feed_backend_events([event])
+        settle(compositor)
+    per_event_ms = (time.perf_counter() - started) * 1000 / len(events)
+
+    _report("hotplug", monitors, workspaces, per_event_ms, "ms/event")
+    assert len(compositor.monitors) == monitors
+    assert len(compositor.workspaces) == workspaces
+    assert per_event_ms < MAX_HOTPLUG_MS
+
+
+@pytest.mark.parametrize("monitors", (4, 16))
+def test_layout_change_reaches_only_affected_bars(synthetic, monitors):
+    start, settle = synthetic
+    compositor = start(monitors, 100)
+    settle(compositor)
+    calls = {monitor.name: 0 for monitor in compositor.monitors}
+
+    def on_changed(_compositor, connector):
+        calls[connector] += 1
+
+    for connector in calls:
+        compositor.connect(f"workspaces-changed::{connector}", on_changed, connector)
+
+    table = compositor._backend_table
+    # Workspace 1 moves SYN-0 -> SYN-1, then workspace 3 (on SYN-2) goes away.
+    compositor._apply_backend_changes(table.update(1, output="SYN-1"))
+    compositor._apply_backend_changes(table.remove(3))
+
+    touched = {"SYN-0": 1, "SYN-1": 1, "SYN-2": 1}
+    assert calls == {connector: touched.get(connector, 0) for connector in calls}
+    assert 1 in [ws.id for ws in compositor.get_workspaces_for_monitor(compositor.get_monitor_for_connector("SYN-1"))]
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+from gi.repository import Gdk, GLib, Gtk
+
+from services.Compositor import Workspace
+from ui.bar.Workspaces import WorkspaceButton, WorkspaceStrip
+
+WORKSPACE_COUNTS = (10, 50, 200)
+SWITCHES = 100
+
+
+def _workspaces(count):
+    workspaces = []
+    for workspace_id in range(1, count + 1):
+        workspace = Workspace(None)
+        workspace.id = workspace_id
+        workspace.name = str(workspace_id)
+        workspaces.append(workspace)
+    workspaces[0].is_active = True
+    return workspaces
+
+
+def _buttons_view(workspaces):
+    box = Gtk.Box(spacing=4)
+    box.add_css_class("workspaces")
+    for workspace in workspaces:
+        box.append(WorkspaceButton(workspace))
+    return box
+
+
+def _strip_view(workspaces):
+    strip = WorkspaceStrip()
+    strip.set_workspaces(workspaces)
+    return strip
+
+
+def _count_widgets(widget):
+    count = 1
+    child = widget.get_first_child()
+    while child is not None:
+        count += _count_widgets(child)
+        child = child.get_next_sibling()
+    return count
+
+
+def _present(view):
+    window = Gtk.Window()
+    window.set_child(view)
+    window.present()
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + 5
+    while not view.get_mapped():
+        assert time.monotonic() < deadline
+        context.iteration(False)
+    return window
+
+
+def _switch_cost(view, window, workspaces):
+    """Mean time to re-measure, re-allocate and re-snapshot the view after one workspace switch."""
+    height = view.measure(Gtk.Orientation.VERTICAL, -1)[1]
+    elapsed = 0.0
+    for switch in range(SWITCHES):
+        previous = workspaces[switch % len(workspaces)]
+        current = workspaces[(switch + 1) % len(workspaces)]
+        previous.is_active = False
+        current.is_active = True
+
+        started = time.perf_counter()
+        width = view.measure(Gtk.Orientation.HORIZONTAL, -1)[1]
+        view.allocate(width, height, -1, None)
+        snapshot = Gtk.Snapshot()
+        window.snapshot_child(view, snapshot)
+        snapshot.to_node()
+        elapsed += time.perf_counter() - started
+    return elapsed * 1e6 / SWITCHES
+
+
+@pytest.mark.parametrize("count", WORKSPACE_COUNTS)
+def test_strip_switch_is_cheaper_than_buttons(count):
+    if Gdk.Display.get_default() is None:
+        pytest.skip("needs a display")
+
+    costs = {}
+    widgets = {}
+    for mode, build in (("buttons", _buttons_view), ("strip", _strip_view)):
+        workspaces = _workspaces(count)
+        view = build(workspaces)
+        window = _present(view)
+        try:
+            widgets[mode] = _count_widgets(view)
+            costs[mode] = _switch_cost(view, window, workspaces)
+        finally:
+            window.destroy()
+
+    print(
+        f"workspaces={count}: buttons {costs['buttons']:.1f} us/switch widgets={widgets['buttons']}, "
+        f"strip {costs['strip']:.1f} us/switch widgets={widgets['strip']}"
+    )
+    assert widgets["strip"] == 1
+    assert costs["strip"] < costs["buttons"]
@@ -0,0 +1,46 @@
+from fakes import active_tracker
+
+
+def test_switch_touches_previous_and_new_only():
+    workspaces, writes, tracker = active_tracker(1, 10)
+    tracker.activate("eDP-1", 0)
+    writes.clear()
+
+    assert tracker.activate("eDP-1", 3) == 2
+    assert writes == [0, 3]
+    assert [ws.key for ws in workspaces.values() if ws.active] == [3]
+    assert tracker.activate("eDP-1", 3) == 0
+
+
+def test_monitors_are_independent():
+    workspaces, _writes, tracker = active_tracker(2, 5)
+    tracker.activate("eDP-1", 1)
+    tracker.activate("DP-1", 1001)
+
+    tracker.activate("eDP-1", 2)
+
+    assert workspaces[1001].active is True
+    assert tracker.active("DP-1") == 1001
+
+
+def test_workspace_moved_to_other_monitor_is_not_deactivated():
+    workspaces, _writes, tracker = active_tracker(1, 5)
+    tracker.activate("eDP-1", 1)
+    tracker.activate("DP-1", 1)
+
+    tracker.activate("eDP-1", 2)
+
+    assert workspaces[1].active is True
+    assert tracker.active("DP-1") == 1
+
+
+def test_switch_writes_are_independent_of_workspace_count():
+    for per_monitor in (8, 64):
+        _workspaces, writes, tracker = active_tracker(4, per_monitor)
+        keys = [[m * 1000 + n for n in range(per_monitor)] for m in range(4)]
+        rounds = 2000
+        for i in range(rounds):
+            m = i % 4
+            tracker.activate(m, keys[m][i % per_monitor])
+
+        assert len(writes) <= 2 * rounds
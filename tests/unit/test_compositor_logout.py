@@ -1,3 +1,5 @@
+import asyncio
+
 from services.Compositor import Compositor
 
 
@@ -9,7 +11,7 @@ class DummyScroll:
     def stop_event_monitor(self):
         self.stop_called = True
 
-    def quit(self):
+    async def quit_async(self):
         self.quit_called = True
         return True
 
@@ -21,7 +23,14 @@ def test_logout_scroll_stops_monitor_and_quits():
     compositor._niri = None
     compositor._scroll = DummyScroll()
 
-    Compositor.logout(compositor)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        Compositor.logout(compositor)
+        loop.run_until_complete(asyncio.sleep(0))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
 
     assert compositor._scroll.stop_called is True
     assert compositor._scroll.quit_called is True
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from services.event_bus import EventBus, StreamSubscriber, encode_event, parse_topics
+
+
+def test_parse_topics():
+    assert parse_topics("") is None
+    assert parse_topics("popup, workspace") == {"popup", "workspace"}
+    with pytest.raises(ValueError, match="unknown topics: nope"):
+        parse_topics("popup nope")
+
+
+def test_encode_event_is_one_json_line():
+    line = encode_event("volume", {"volume": 0.5, "mute": False}, ts=12.3456)
+
+    assert line.endswith("\n") and "\n" not in line[:-1]
+    assert json.loads(line) == {"topic": "volume", "ts": 12.346, "volume": 0.5, "mute": False}
+
+
+def test_publish_reaches_matching_subscribers_only():
+    bus = EventBus()
+    everything, popups = [], []
+    bus.subscribe(everything.append)
+    token = bus.subscribe(popups.append, {"popup"})
+
+    assert bus.publish("popup", {"event": "open"}) == 2
+    assert bus.publish("brightness", {"brightness": 40}) == 1
+    bus.unsubscribe(token)
+    assert bus.publish("popup", {"event": "close"}) == 1
+
+    assert [json.loads(line)["topic"] for line in everything] == ["popup", "brightness", "popup"]
+    assert len(popups) == 1
+    assert popups[0] is everything[0]
+
+
+def test_publish_without_subscribers_encodes_nothing():
+    bus = EventBus()
+    bus.subscribe(lambda line: None, {"volume"})
+
+    assert not bus.has_subscribers("workspace")
+    assert bus.publish("workspace", {"id": 1}) == 0
+    assert bus.published == 0
+
+
+class FakeConnection:
+    def __init__(self):
+        self.writes = []
+        self.pending = None
+        self.closed = False
+
+    def write(self, data, done):
+        assert self.pending is None, "one write in flight at a time"
+        self.writes.append(data)
+        self.pending = done
+
+    def complete(self, ok=True):
+        done, self.pending = self.pending, None
+        done(ok)
+
+    def close(self):
+        self.closed = True
+
+
+def test_subscriber_batches_lines_while_a_write_is_in_flight():
+    conn = FakeConnection()
+    subscriber = StreamSubscriber(conn.write, conn.close)
+
+    subscriber.push("a\n")
+    subscriber.push("b\n")
+    subscriber.push("c\n")
+    conn.complete()
+    conn.complete()
+
+    assert conn.writes == [b"a\n", b"b\nc\n"]
+    assert conn.pending is None
+
+
+def test_subscriber_closes_on_failed_write_and_unsubscribes():
+    bus = EventBus()
+    conn = FakeConnection()
+    subscriber = StreamSubscriber(conn.write, conn.close)
+    token = bus.subscribe(subscriber.push)
+    subscriber.on_closed = lambda: bus.unsubscribe(token)
+
+    bus.publish("popup", {"event": "open"})
+    conn.complete(ok=False)
+
+    assert conn.closed and subscriber.closed
+    assert not bus.has_subscribers("popup")
+
+
+def test_slow_subscriber_is_dropped_instead_of_buffering():
+    conn = FakeConnection()
+    subscriber = StreamSubscriber(conn.write, conn.close, max_pending=3)
+
+    for index in range(5):
+        subscriber.push(f"{index}\n")
+
+    assert conn.writes == [b"0\n"]
+    assert conn.closed
@@ -0,0 +1,65 @@
+import threading
+
+from services.event_coalescer import EventCoalescer
+
+
+class ManualLoop:
+    def __init__(self):
+        self.callbacks = []
+
+    def schedule(self, callback):
+        self.callbacks.append(callback)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def test_burst_collapses_into_one_flush():
+    loop = ManualLoop()
+    batches = []
+    coalescer = EventCoalescer(loop.schedule, batches.append)
+
+    for event in range(5):
+        coalescer.push(event)
+    loop.run_pending()
+
+    assert len(loop.callbacks) == 0
+    assert batches == [[0, 1, 2, 3, 4]]
+    assert coalescer.stats() == {
+        "events_received": 5,
+        "syncs_performed": 1,
+        "events_coalesced": 4,
+    }
+
+
+def test_events_after_flush_schedule_again():
+    loop = ManualLoop()
+    batches = []
+    coalescer = EventCoalescer(loop.schedule, batches.append)
+
+    coalescer.push("a")
+    loop.run_pending()
+    coalescer.push("b")
+    coalescer.push("c")
+    loop.run_pending()
+
+    assert batches == [["a"], ["b", "c"]]
+    assert coalescer.flushes == 2
+
+
+def test_push_from_threads_schedules_once():
+    loop = ManualLoop()
+    batches = []
+    coalescer = EventCoalescer(loop.schedule, batches.append)
+
+    threads = [threading.Thread(target=lambda: [coalescer.push() for _ in range(100)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loop.callbacks) == 1
+    loop.run_pending()
+    assert len(batches[0]) == 400
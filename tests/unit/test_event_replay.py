@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+from services.event_replay import EventRecorder, ReplayBackend, read_recording
+from services.synthetic_compositor import SyntheticCompositor
+from services.workspace_table import WorkspaceTable
+
+
+def test_recording_round_trips_events_and_snapshots(tmp_path):
+    backend = SyntheticCompositor(monitors=2, workspaces=6)
+    initial = backend.records()
+    events = backend.focus_storm(20)
+    path = tmp_path / "session.jsonl.gz"
+
+    # Snapshot first so the file starts from the pre-storm state.
+    recorder = EventRecorder(str(path), backend)
+    recorder.snapshot(None, initial)
+    for event in events:
+        recorder.event(event)
+    recorder.close()
+    recording = read_recording(str(path))
+
+    assert recording.backend == "synthetic"
+    assert recording.monitor_source == "synthetic"
+    assert [event for _t, event in recording.events] == events
+    assert recording.snapshots == [(None, initial)]
+
+
+def test_replay_reaches_recorded_end_state(tmp_path):
+    source = SyntheticCompositor(monitors=4, workspaces=40, seed=7)
+    path = tmp_path / "session.jsonl"
+    recorder = EventRecorder(str(path), source)
+    recorder.snapshot(None, source.records())
+    for event in source.focus_storm(200):
+        recorder.event(event)
+    recorder.close()
+
+    replay = ReplayBackend(read_recording(str(path)), speed=0)
+    table = WorkspaceTable()
+    table.replace_all(asyncio.run(replay.get_records_async()))
+    done = threading.Event()
+    received = []
+    replay.on_finished = done.set
+    replay.start_event_monitor(received.append)
+    assert done.wait(5)
+
+    for event in received:
+        assert replay.apply_event(table, event) is not None
+
+    assert len(received) == 200
+    assert table.records() == source.records()
+
+
+def test_from_env_falls_back_on_malformed_speed(tmp_path, monkeypatch):
+    backend = SyntheticCompositor(monitors=1, workspaces=2)
+    path = tmp_path / "session.jsonl.gz"
+    recorder = EventRecorder(str(path), backend)
+    recorder.snapshot(None, backend.records())
+    recorder.close()
+    monkeypatch.setenv("PY_DESKTOP_REPLAY", str(path))
+    monkeypatch.setenv("PY_DESKTOP_REPLAY_SPEED", "fast")
+
+    assert ReplayBackend.from_env().speed == 1.0
+
+
+def test_unclosed_gzip_recording_keeps_flushed_lines(tmp_path):
+    backend = SyntheticCompositor(monitors=1, workspaces=4)
+    path = tmp_path / "session.jsonl.gz"
+    recorder = EventRecorder(str(path), backend)
+    recorder.snapshot(None, backend.records())
+    events = backend.focus_storm(5)
+    for event in events:
+        recorder.event(event)
+    # The session died here: no close(), so no gzip end-of-stream marker.
+
+    recording = read_recording(str(path))
+
+    assert [event for _t, event in recording.events] == events
+    assert len(recording.snapshots) == 1
+    recorder.close()
@@ -0,0 +1,217 @@
+import asyncio
+import json
+import socket
+import threading
+
+import pytest
+
+from services.hyprland_ipc import (
+    HyprlandEventState,
+    HyprlandIPC,
+    apply_hyprland_event,
+    hyprland_socket_dir,
+    parse_event,
+    parse_state,
+)
+from services.workspace_table import WorkspaceTable
+
+WORKSPACES = [
+    {"id": 1, "name": "1", "monitor": "eDP-1"},
+    {"id": 2, "name": "2", "monitor": "eDP-1"},
+    {"id": 3, "name": "web, mail", "monitor": "DP-1"},
+    {"id": -98, "name": "special:scratch", "monitor": "DP-1"},
+]
+MONITORS = [
+    {"name": "eDP-1", "focused": True, "activeWorkspace": {"id": 1, "name": "1"}},
+    {"name": "DP-1", "focused": False, "activeWorkspace": {"id": 3, "name": "web, mail"}},
+]
+
+# Captured from a Hyprland session: create 4 on DP-1, switch to it, move it, destroy 2.
+RECORDED_EVENTS = [
+    "focusedmon>>DP-1,web, mail",
+    "focusedmonv2>>DP-1,3",
+    "createworkspace>>4",
+    "createworkspacev2>>4,4",
+    "workspace>>4",
+    "workspacev2>>4,4",
+    "activewindow>>kitty,~",
+    "moveworkspace>>4,eDP-1",
+    "moveworkspacev2>>4,4,eDP-1",
+    "destroyworkspace>>2",
+    "destroyworkspacev2>>2,2",
+]
+
+
+def _table():
+    table = WorkspaceTable()
+    records, focused_output = parse_state(json.dumps(WORKSPACES), json.dumps(MONITORS))
+    table.replace_all(records)
+    return table, HyprlandEventState(focused_output)
+
+
+class FakeHyprland:
+    """Hyprland instance directory with a request socket and a socket2 replaying recorded lines."""
+
+    def __init__(self, directory, events, replies):
+        self.directory = str(directory)
+        self.events = events
+        self.replies = replies
+        self.requests = []
+        self._request_server = self._listen(directory / ".socket.sock")
+        self._event_server = self._listen(directory / ".socket2.sock")
+        threading.Thread(target=self._serve_requests, daemon=True).start()
+        threading.Thread(target=self._serve_events, daemon=True).start()
+
+    @staticmethod
+    def _listen(path):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(path))
+        server.listen()
+        return server
+
+    def _serve_requests(self):
+        while True:
+            try:
+                conn, _ = self._request_server.accept()
+            except OSError:
+                return
+            with conn:
+                request = conn.recv(4096).decode("utf-8")
+                self.requests.append(request)
+                conn.sendall(self.replies.get(request, "unknown request").encode("utf-8"))
+
+    def _serve_events(self):
+        try:
+            conn, _ = self._event_server.accept()
+        except OSError:
+            return
+        with conn:
+            # Split mid-line to exercise the reader's buffering.
+            data = "".join(f"{line}\n" for line in self.events).encode("utf-8")
+            conn.sendall(data[:17])
+            conn.sendall(data[17:])
+
+    def close(self):
+        self._request_server.close()
+        self._event_server.close()
+
+
+@pytest.fixture
+def fake_hyprland(tmp_path):
+    server = FakeHyprland(
+        tmp_path,
+        RECORDED_EVENTS,
+        {
+            "j/workspaces": json.dumps(WORKSPACES),
+            "j/monitors": json.dumps(MONITORS),
+            "dispatch workspace 3": "ok",
+        },
+    )
+    yield server
+    server.close()
+
+
+def test_socket_dir_uses_signature_and_runtime_dir():
+    assert hyprland_socket_dir("abc", "/run/user/1000") == "/run/user/1000/hypr/abc"
+
+
+def test_parse_event_keeps_commas_in_names():
+    assert parse_event("workspacev2>>3,web, mail") == ("workspacev2", ["3", "web, mail"])
+    assert parse_event("moveworkspacev2>>3,web, mail,DP-1") == ("moveworkspacev2", ["3", "web, mail", "DP-1"])
+    assert parse_event("focusedmonv2>>DP-1,3") == ("focusedmonv2", ["DP-1", "3"])
+    assert parse_event("garbage") is None
+
+
+def test_parse_state_skips_special_workspaces_and_marks_active():
+    records, focused_output = parse_state(json.dumps(WORKSPACES), json.dumps(MONITORS))
+
+    assert focused_output == "eDP-1"
+    assert [record.key for record in records] == [1, 2, 3]
+    assert [(record.active, record.focused) for record in records] == [(True, True), (False, False), (True, False)]
+
+
+def test_workspace_switch_only_touches_old_and_new_workspace():
+    table, state = _table()
+
+    changed = apply_hyprland_event(table, state, "workspacev2>>2,2")
+
+    assert changed == {1, 2}
+    assert table.active_key("eDP-1") == 2
+    assert table.focused_key == 2
+    assert table.active_key("DP-1") == 3
+
+
+def test_focused_monitor_moves_focus_but_keeps_active_per_monitor():
+    table, state = _table()
+
+    changed = apply_hyprland_event(table, state, "focusedmonv2>>DP-1,3")
+
+    assert changed == {1, 3}
+    assert state.focused_output == "DP-1"
+    assert table.get(1).active is True
+    assert table.get(1).focused is False
+    assert table.focused_key == 3
+
+
+def test_unrelated_events_are_ignored_and_hotplug_requests_resync():
+    table, state = _table()
+
+    assert apply_hyprland_event(table, state, "activewindow>>kitty,~") == set()
+    assert apply_hyprland_event(table, state, "workspacev2>>-98,special:scratch") == set()
+    assert apply_hyprland_event(table, state, "monitoraddedv2>>2,HDMI-A-1,desc") is None
+    assert apply_hyprland_event(table, state, "workspacev2>>42,42") is None
+
+
+def test_rename_updates_name_in_place():
+    table, state = _table()
+
+    assert apply_hyprland_event(table, state, "renameworkspace>>2,code") == {2}
+    assert table.get(2).name == "code"
+
+
+def test_recorded_session_replayed_through_socket2(fake_hyprland):
+    ipc = HyprlandIPC(fake_hyprland.directory)
+    assert ipc.available()
+    table = WorkspaceTable()
+    table.replace_all(asyncio.run(ipc.get_records_async()))
+    received = []
+    done = threading.Event()
+
+    def on_event(line):
+        received.append(line)
+        if len(received) == len(RECORDED_EVENTS):
+            done.set()
+
+    ipc.start_event_monitor(on_event)
+    assert done.wait(2)
+    ipc.stop_event_monitor()
+
+    for line in received:
+        assert ipc.apply_event(table, line) is not None
+
+    assert received == RECORDED_EVENTS
+    assert fake_hyprland.requests == ["j/workspaces", "j/monitors"]
+    assert sorted(table.keys()) == [1, 3, 4]
+    assert table.get(4).output == "eDP-1"
+    assert table.focused_key == 4
+    assert table.active_key("eDP-1") == 4
+    assert table.get(1).active is False
+    assert table.get(3).active is False
+
+
+def test_focus_dispatches_workspace_by_id(fake_hyprland):
+    ipc = HyprlandIPC(fake_hyprland.directory)
+    records = asyncio.run(ipc.get_records_async())
+
+    assert asyncio.run(ipc.focus_record_async(records[2])) is True
+    assert fake_hyprland.requests[-1] == "dispatch workspace 3"
+
+
+def test_wedged_request_socket_times_out(tmp_path):
+    # Accepts connections (via the backlog) but never answers.
+    server = FakeHyprland._listen(tmp_path / ".socket.sock")
+    ipc = HyprlandIPC(str(tmp_path), timeout=0.1)
+
+    with pytest.raises(OSError, match="timed out"):
+        asyncio.run(ipc.get_records_async())
+    server.close()
@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+from services.ipc_requests import batch_reply, split_batch
+
+
+def test_single_command_is_not_a_batch():
+    assert split_batch("status") is None
+
+
+def test_batch_forms():
+    assert split_batch('["status", " metrics "]') == ["status", "metrics"]
+    assert split_batch("ping; status;") == ["ping", "status"]
+
+
+def test_invalid_json_batch():
+    with pytest.raises(ValueError, match="invalid batch"):
+        split_batch('["status", 1]')
+    with pytest.raises(ValueError, match="invalid batch"):
+        split_batch('["status"')
+
+
+def test_batch_reply_embeds_json_replies():
+    reply = batch_reply(["pong", '{"bars": 2}', "unknown request: {x"])
+
+    assert json.loads(reply) == ["pong", {"bars": 2}, "unknown request: {x"]
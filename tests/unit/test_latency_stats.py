@@ -0,0 +1,37 @@
+from services.latency_stats import LatencyHistogram, LatencyStats
+
+
+def test_latency_percentiles():
+    stats = LatencyStats()
+    for ms in range(1, 101):
+        stats.add(ms / 1000)
+
+    summary = stats.summary()
+
+    assert summary["count"] == 100
+    assert round(summary["p50_ms"]) == 51
+    assert round(summary["p99_ms"]) == 99
+    assert round(summary["max_ms"]) == 100
+
+
+def test_latency_window_drops_oldest_samples():
+    stats = LatencyStats(limit=10)
+    for _ in range(10):
+        stats.add(1.0)
+    for _ in range(10):
+        stats.add(0.001)
+
+    assert stats.count == 20
+    assert stats.summary()["max_ms"] == 1.0
+
+
+def test_histogram_buckets_keep_the_long_tail():
+    histogram = LatencyHistogram(bounds_ms=(50, 100))
+    for seconds in (0.01, 0.05, 0.07, 2.0):
+        histogram.add(seconds)
+
+    summary = histogram.summary()
+
+    assert summary["buckets"] == {"<=50": 2, "<=100": 1, ">100": 1}
+    assert summary["count"] == 4
+    assert summary["max_ms"] == 2000
@@ -0,0 +1,45 @@
+from services.list_diff import list_splices
+
+
+def apply_splices(splices, splice):
+    for position, n_removed, added in splices:
+        splice(position, n_removed, added)
+
+
+def _apply(old, new):
+    result = list(old)
+
+    def splice(position, n_removed, added):
+        result[position : position + n_removed] = added
+
+    splices = list_splices(old, new)
+    apply_splices(splices, splice)
+    return result, splices
+
+
+def test_identical_lists_produce_no_splices():
+    assert list_splices([1, 2, 3], [1, 2, 3]) == []
+
+
+def test_single_insert_is_positional():
+    result, splices = _apply([1, 2, 4], [1, 2, 3, 4])
+
+    assert splices == [(2, 0, [3])]
+    assert result == [1, 2, 3, 4]
+
+
+def test_single_removal_is_positional():
+    result, splices = _apply([1, 2, 3, 4], [1, 3, 4])
+
+    assert splices == [(1, 1, [])]
+    assert result == [1, 3, 4]
+
+
+def test_multiple_changes_apply_in_order():
+    old = ["a", "b", "c", "d", "e"]
+    new = ["x", "b", "d", "e", "f"]
+
+    result, splices = _apply(old, new)
+
+    assert result == new
+    assert sum(n_removed for _, n_removed, _ in splices) == 2
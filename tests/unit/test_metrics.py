@@ -0,0 +1,62 @@
+import json
+import threading
+
+from services.metrics import Metrics, counter_deltas, rss_bytes
+
+
+def test_counters_and_durations_snapshot():
+    metrics = Metrics()
+    metrics.increment("compositor.workspace_syncs")
+    metrics.increment("compositor.workspace_syncs", 2)
+    metrics.observe("ddc.read", 0.040)
+    with metrics.timed("ddc.write"):
+        pass
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["counters"] == {"compositor.workspace_syncs": 3}
+    assert round(snapshot["durations"]["ddc.read"]["max_ms"]) == 40
+    assert snapshot["durations"]["ddc.write"]["count"] == 1
+    json.dumps(snapshot)
+
+
+def test_spawns_are_counted_per_executable():
+    metrics = Metrics()
+    metrics.count_spawn(["/usr/bin/ddcutil", "detect"])
+    metrics.count_spawn(["ddcutil", "getvcp", "10"])
+    metrics.count_spawn(["scrollmsg", "-t", "get_workspaces"])
+
+    assert metrics.counter("subprocess.spawns") == 3
+    assert metrics.counter("subprocess.spawns.ddcutil") == 2
+    assert metrics.counter("subprocess.spawns.scrollmsg") == 1
+
+
+def test_increment_is_thread_safe():
+    metrics = Metrics()
+
+    def worker():
+        for _ in range(10000):
+            metrics.increment("events")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.counter("events") == 40000
+
+
+def test_rss_is_reported():
+    assert rss_bytes() > 0
+
+
+def test_counter_deltas_report_only_counters_that_moved():
+    metrics = Metrics()
+    metrics.increment("ddc.reads")
+    metrics.increment("subprocess.spawns")
+    before = metrics.counters()
+    metrics.increment("ddc.reads", 2)
+    metrics.increment("compositor.workspace_syncs")
+
+    assert counter_deltas(before, metrics.counters()) == {"compositor.workspace_syncs": 1, "ddc.reads": 2}
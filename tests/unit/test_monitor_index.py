@@ -0,0 +1,91 @@
+from services.monitor_index import MonitorBuckets
+
+
+class Ws:
+    def __init__(self, id):
+        self.id = id
+
+
+def test_items_are_bucketed_in_order():
+    buckets = MonitorBuckets(order=lambda ws: ws.id)
+    ws3, ws1, ws2 = Ws(3), Ws(1), Ws(2)
+
+    for ws in (ws3, ws1, ws2):
+        buckets.assign(ws, "eDP-1")
+
+    assert buckets.get("eDP-1") == [ws1, ws2, ws3]
+    assert buckets.get("HDMI-A-1") == []
+
+
+def test_move_touches_only_two_buckets():
+    buckets = MonitorBuckets(order=lambda ws: ws.id)
+    ws1, ws2 = Ws(1), Ws(2)
+    buckets.assign(ws1, "eDP-1")
+    buckets.assign(ws2, "eDP-1")
+
+    assert buckets.assign(ws2, "HDMI-A-1") is True
+    assert buckets.assign(ws2, "HDMI-A-1") is False
+
+    assert buckets.get("eDP-1") == [ws1]
+    assert buckets.get("HDMI-A-1") == [ws2]
+    assert buckets.key_of(ws2) == "HDMI-A-1"
+
+
+def test_unassign_remove_and_drop():
+    buckets = MonitorBuckets(order=lambda ws: ws.id)
+    ws1, ws2 = Ws(1), Ws(2)
+    buckets.assign(ws1, "eDP-1")
+    buckets.assign(ws2, "DP-1")
+
+    assert buckets.assign(ws1, None) is True
+    assert buckets.get("eDP-1") == []
+    assert buckets.drop("DP-1") == [ws2]
+    assert buckets.key_of(ws2) is None
+    assert len(buckets) == 0
+
+
+def test_reorder_after_id_change():
+    buckets = MonitorBuckets(order=lambda ws: ws.id)
+    ws1, ws2 = Ws(1), Ws(2)
+    buckets.assign(ws1, "eDP-1")
+    buckets.assign(ws2, "eDP-1")
+
+    ws1.id = 5
+    buckets.reorder(ws1)
+
+    assert buckets.get("eDP-1") == [ws2, ws1]
+
+
+def test_touched_keys_cover_only_changed_buckets():
+    buckets = MonitorBuckets(order=lambda ws: ws.id)
+    ws1, ws2, ws3 = Ws(1), Ws(2), Ws(3)
+    buckets.assign(ws1, "eDP-1")
+    buckets.assign(ws2, "DP-1")
+    buckets.assign(ws3, "DP-2")
+    buckets.take_touched()
+
+    buckets.assign(ws2, "eDP-1")
+    assert buckets.take_touched() == {"DP-1", "eDP-1"}
+    assert buckets.take_touched() == set()
+
+    buckets.remove(ws3)
+    buckets.drop("DP-2")
+    assert buckets.take_touched() == set()
+
+
+def test_filling_a_bucket_reads_each_order_key_once():
+    calls = []
+
+    def order(ws):
+        calls.append(ws)
+        return ws.id
+
+    buckets = MonitorBuckets(order=order)
+    items = [Ws(i) for i in reversed(range(1000))]
+    for ws in items:
+        buckets.assign(ws, "eDP-1")
+    for ws in items[::2]:
+        buckets.remove(ws)
+
+    assert len(calls) == len(items)
+    assert [ws.id for ws in buckets.get("eDP-1")] == list(range(0, 1000, 2))
@@ -0,0 +1,106 @@
+import gc
+import tracemalloc
+
+from fakes import FakeBinding, FakeNiri, FakeNiriOutput
+from services.Compositor import MonitorManager
+from services.scroll_ipc import ScrollOutput
+
+
+def test_scroll_connector_lookup_uses_output_index():
+    manager = MonitorManager(None)
+    manager.sync_scroll_outputs([ScrollOutput("eDP-1", True), ScrollOutput("HDMI-A-1", False)])
+
+    monitor = manager.get_monitor_for_scroll_connector("HDMI-A-1")
+
+    assert monitor is manager.get_monitor_for_scroll_connector("HDMI-A-1")
+    assert monitor.name == "HDMI-A-1"
+    assert monitor.compositor_type == "scroll"
+    assert len(manager.monitors) == 2
+
+
+def test_scroll_output_index_only_changes_on_hotplug():
+    manager = MonitorManager(None)
+    outputs = [ScrollOutput("eDP-1", True)]
+
+    assert manager.sync_scroll_outputs(outputs) is True
+    assert manager.sync_scroll_outputs(outputs) is False
+    assert manager.sync_scroll_outputs(outputs + [ScrollOutput("DP-2", False)]) is True
+    assert manager.get_monitor_for_scroll_connector("DP-2").name == "DP-2"
+
+
+def test_niri_connector_lookup_does_not_query_outputs():
+    niri = FakeNiri([FakeNiriOutput("eDP-1"), FakeNiriOutput("DP-1")])
+    manager = MonitorManager(None, niri=niri)
+    calls_after_sync = niri.get_outputs_calls
+
+    for _ in range(100):
+        monitor = manager.get_monitor_for_niri_connector("DP-1")
+
+    assert monitor.name == "DP-1"
+    assert monitor.native is niri.outputs[1]
+    assert niri.get_outputs_calls == calls_after_sync
+
+
+def test_niri_connector_map_is_rebuilt_on_outputs_notify():
+    niri = FakeNiri([FakeNiriOutput("eDP-1")])
+    manager = MonitorManager(None, niri=niri)
+    placeholder = manager.get_monitor_for_niri_connector("HDMI-A-1")
+
+    niri.hotplug([FakeNiriOutput("eDP-1"), FakeNiriOutput("HDMI-A-1")])
+
+    monitor = manager.get_monitor_for_niri_connector("HDMI-A-1")
+    assert monitor is placeholder
+    assert monitor.native is niri.outputs[1]
+
+
+def test_niri_lookups_for_many_workspaces_query_outputs_once():
+    outputs = [FakeNiriOutput(f"DP-{i}") for i in range(8)]
+    niri = FakeNiri(outputs)
+    manager = MonitorManager(None, niri=niri)
+
+    monitors = {manager.get_monitor_for_niri_connector(f"DP-{i % len(outputs)}") for i in range(2000)}
+
+    assert niri.get_outputs_calls == 1
+    assert len(monitors) == len(outputs)
+
+
+def test_removed_output_prunes_monitor_and_bindings():
+    removed = []
+    niri = FakeNiri([FakeNiriOutput("eDP-1"), FakeNiriOutput("DP-1")])
+    manager = MonitorManager(None, niri=niri, on_monitor_removed=removed.append)
+    dock = manager.get_monitor_for_niri_connector("DP-1")
+    live_before = FakeBinding.live
+
+    niri.hotplug([FakeNiriOutput("eDP-1")])
+
+    assert removed == [dock]
+    assert dock not in manager.monitors
+    assert dock.native is None
+    assert FakeBinding.live == live_before - 1
+
+
+def test_dock_undock_soak_keeps_monitors_bindings_and_memory_flat():
+    niri = FakeNiri([FakeNiriOutput("eDP-1")])
+    manager = MonitorManager(None, niri=niri)
+
+    def churn(rounds):
+        for i in range(rounds):
+            niri.hotplug([FakeNiriOutput("eDP-1"), FakeNiriOutput(f"DP-{i % 3}"), FakeNiriOutput(f"HDMI-A-{i}")])
+            niri.hotplug([FakeNiriOutput("eDP-1")])
+
+    churn(50)
+    live_bindings = FakeBinding.live
+    handlers = len(niri.handlers)
+    assert handlers >= 1
+    tracemalloc.start()
+    gc.collect()
+    baseline, _ = tracemalloc.get_traced_memory()
+    churn(2000)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert [monitor.name for monitor in manager.monitors] == ["eDP-1"]
+    assert FakeBinding.live == live_bindings
+    assert len(niri.handlers) == handlers
+    assert current - baseline < 64 * 1024
@@ -0,0 +1,45 @@
+import tracemalloc
+
+from services.monitor_sources import MonitorSources
+
+
+def test_connector_survives_while_any_source_reports_it():
+    sources = MonitorSources()
+    sources.update("gdk", ["eDP-1", "DP-1"])
+    sources.update("niri", ["eDP-1", "DP-1"])
+
+    assert sources.update("gdk", ["eDP-1"]) == []
+    assert sources.sources("DP-1") == {"niri"}
+    assert sources.update("niri", ["eDP-1"]) == ["DP-1"]
+    assert "DP-1" not in sources
+
+
+def test_rename_drops_old_connector():
+    sources = MonitorSources()
+    sources.update("hyprland", ["DP-1"])
+
+    assert sources.update("hyprland", ["DP-2"]) == ["DP-1"]
+    assert sources.sources("DP-2") == {"hyprland"}
+
+
+def test_dock_undock_churn_stays_flat():
+    sources = MonitorSources()
+    sources.update("gdk", ["eDP-1"])
+
+    def churn(rounds):
+        for i in range(rounds):
+            docked = ["eDP-1", f"DP-{i % 7}", f"HDMI-A-{i}"]
+            sources.update("gdk", docked)
+            sources.update("niri", docked)
+            sources.update("gdk", ["eDP-1"])
+            sources.update("niri", ["eDP-1"])
+
+    churn(100)
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    churn(5000)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(sources) == 1
+    assert current - baseline < 16 * 1024
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import socket
+import threading
+
+import pytest
+
+from services.niri_ipc import NiriIPC, apply_niri_event, parse_workspaces
+from services.workspace_table import WorkspaceTable
+
+
+def _workspace(workspace_id, output="eDP-1", active=False, focused=False, name=None):
+    return {
+        "id": workspace_id,
+        "idx": workspace_id,
+        "name": name,
+        "output": output,
+        "is_urgent": False,
+        "is_active": active,
+        "is_focused": focused,
+        "active_window_id": None,
+    }
+
+
+WORKSPACES = [
+    _workspace(1, active=True, focused=True),
+    _workspace(2),
+    _workspace(3, output="DP-1", active=True, name="web"),
+]
+
+
+class FakeNiriSocket:
+    """Niri IPC socket: answers one JSON request per line and streams ``events`` after EventStream."""
+
+    def __init__(self, path, workspaces, events):
+        self.path = str(path)
+        self.workspaces = workspaces
+        self.events = events
+        self.requests = []
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn, conn.makefile("rwb") as stream:
+            request = json.loads(stream.readline())
+            self.requests.append(request)
+            if request == "EventStream":
+                stream.write(b'{"Ok":"Handled"}\n')
+                for event in self.events:
+                    stream.write(json.dumps(event).encode("utf-8") + b"\n")
+            elif request == "Workspaces":
+                stream.write(json.dumps({"Ok": {"Workspaces": self.workspaces}}).encode("utf-8") + b"\n")
+            elif isinstance(request, dict) and "Action" in request:
+                stream.write(b'{"Ok":"Handled"}\n')
+            else:
+                stream.write(b'{"Err":"unknown request"}\n')
+            stream.flush()
+
+    def close(self):
+        self._server.close()
+
+
+@pytest.fixture
+def fake_niri_socket(tmp_path):
+    servers = []
+
+    def start(workspaces=WORKSPACES, events=()):
+        server = FakeNiriSocket(tmp_path / "niri.sock", workspaces, list(events))
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def _collect_events(ipc, expected):
+    received = []
+    done = threading.Event()
+
+    def on_event(payload):
+        received.append(payload)
+        if len(received) == expected:
+            done.set()
+
+    ipc.start_event_monitor(on_event)
+    assert done.wait(5)
+    ipc.stop_event_monitor()
+    return received
+
+
+def _table(workspaces=WORKSPACES):
+    table = WorkspaceTable()
+    table.replace_all(parse_workspaces({"Workspaces": workspaces}))
+    return table
+
+
+def test_workspace_activated_touches_only_old_and_new():
+    table = _table()
+
+    changed = apply_niri_event(table, {"WorkspaceActivated": {"id": 2, "focused": True}})
+
+    assert changed == {1, 2}
+    assert table.active_key("eDP-1") == 2
+    assert table.focused_key == 2
+    assert table.active_key("DP-1") == 3
+
+
+def test_activation_without_focus_keeps_focused_workspace():
+    table = _table(WORKSPACES + [_workspace(4, output="DP-1")])
+
+    changed = apply_niri_event(table, {"WorkspaceActivated": {"id": 4, "focused": False}})
+
+    assert changed == {3, 4}
+    assert table.focused_key == 1
+
+
+def test_active_window_change_touches_nothing():
+    table = _table()
+
+    assert apply_niri_event(table, {"WorkspaceActiveWindowChanged": {"workspace_id": 1, "active_window_id": 7}}) == set()
+    assert apply_niri_event(table, {"WindowFocusChanged": {"id": 7}}) == set()
+
+
+def test_workspaces_changed_is_a_keyed_diff():
+    table = _table()
+    renamed = dict(WORKSPACES[1], name="code")
+
+    changed = apply_niri_event(
+        table,
+        {"WorkspacesChanged": {"workspaces": [WORKSPACES[0], renamed, _workspace(5, output="DP-1")]}},
+    )
+
+    assert changed == {2, 3, 5}
+    assert table.get(2).name == "code"
+
+
+def test_unknown_workspace_or_malformed_event_requests_resync():
+    table = _table()
+
+    assert apply_niri_event(table, {"WorkspaceActivated": {"id": 99, "focused": True}}) is None
+    assert apply_niri_event(table, None) is None
+
+
+def test_event_stream_is_read_from_niri_socket(fake_niri_socket):
+    events = [
+        {"WorkspaceActivated": {"id": 2, "focused": True}},
+        {"WorkspaceActiveWindowChanged": {"workspace_id": 2, "active_window_id": 4}},
+        {"WorkspaceUrgencyChanged": {"id": 3, "urgent": True}},
+    ]
+    server = fake_niri_socket(events=events)
+    ipc = NiriIPC(server.path)
+    table = WorkspaceTable()
+    table.replace_all(asyncio.run(ipc.get_records_async()))
+
+    received = _collect_events(ipc, len(events))
+    for payload in received:
+        ipc.apply_event(table, payload)
+
+    assert received == events
+    assert server.requests[:2] == ["Workspaces", "EventStream"]
+    assert table.focused_key == 2
+    assert table.get(3).urgent is True
+
+
+def test_focus_sends_focus_workspace_action(fake_niri_socket):
+    server = fake_niri_socket()
+    ipc = NiriIPC(server.path)
+    record = asyncio.run(ipc.get_records_async())[2]
+
+    assert asyncio.run(ipc.focus_record_async(record)) is True
+    assert server.requests[-1] == {"Action": {"FocusWorkspace": {"reference": {"Id": 3}}}}
+
+
+def test_event_stream_deltas_touch_only_affected_workspaces(fake_niri_socket):
+    workspace_count = 100
+    workspaces = [_workspace(i, output=f"DP-{i % 4}", active=i < 4) for i in range(workspace_count)]
+    events = [{"WorkspaceActivated": {"id": i % workspace_count, "focused": True}} for i in range(500)]
+    server = fake_niri_socket(workspaces=workspaces, events=events)
+    received = _collect_events(NiriIPC(server.path), len(events))
+
+    table = _table(workspaces)
+    touched = [len(apply_niri_event(table, event)) for event in received]
+
+    # Old/new active on the output plus old/new focused, never the whole list.
+    assert max(touched) <= 4
+    assert table.focused_key == events[-1]["WorkspaceActivated"]["id"]
+
+
+def test_wedged_socket_times_out(tmp_path):
+    # Accepts connections (via the backlog) but never answers.
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(tmp_path / "niri.sock"))
+    server.listen()
+    ipc = NiriIPC(str(tmp_path / "niri.sock"), timeout=0.1)
+
+    with pytest.raises(OSError, match="timed out"):
+        asyncio.run(ipc.get_records_async())
+    server.close()
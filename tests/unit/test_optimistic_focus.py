@@ -0,0 +1,80 @@
+from services.optimistic_focus import OptimisticFocus
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_confirmation_records_latency():
+    clock = FakeClock()
+    focus = OptimisticFocus(clock=clock)
+    prediction = focus.predict(3, focused_before=1)
+
+    clock.now = 0.025
+    assert focus.observe(1) is None
+    assert focus.observe(3) is prediction
+
+    stats = focus.stats()
+    assert focus.pending is None
+    assert stats["confirmed"] == 1
+    assert stats["wrong_ratio"] == 0.0
+    assert round(stats["confirmation_latency"]["p50_ms"]) == 25
+
+
+def test_failed_request_rolls_back_once():
+    focus = OptimisticFocus()
+    prediction = focus.predict(3, focused_before=1, touched=["a", "b"])
+
+    assert focus.fail(prediction) is True
+    assert focus.expire(prediction) is False
+    assert prediction.touched == ["a", "b"]
+    assert focus.stats()["failed"] == 1
+
+
+def test_focus_elsewhere_counts_as_misprediction_on_expiry():
+    focus = OptimisticFocus()
+    prediction = focus.predict(3, focused_before=1)
+
+    # Hyprland may report the target's monitor first; that alone is not final.
+    assert focus.observe(2) is None
+    assert focus.pending is prediction
+    assert focus.expire(prediction) is True
+
+    stats = focus.stats()
+    assert stats["mispredicted"] == 1
+    assert stats["timed_out"] == 0
+    assert stats["wrong_ratio"] == 1.0
+
+
+def test_unanswered_prediction_times_out():
+    focus = OptimisticFocus()
+    prediction = focus.predict(3, focused_before=1)
+
+    assert focus.expire(prediction) is True
+    assert focus.stats()["timed_out"] == 1
+
+
+def test_newer_click_supersedes_pending_prediction():
+    focus = OptimisticFocus()
+    first = focus.predict(2, focused_before=1)
+    second = focus.predict(3, focused_before=1)
+
+    # The first one's timer must not roll back the second click.
+    assert focus.expire(first) is False
+    assert focus.observe(3) is second
+    assert focus.stats()["superseded"] == 1
+
+
+def test_superseded_prediction_wrappers_are_rolled_back_too():
+    focus = OptimisticFocus()
+    previous, first, second = object(), object(), object()
+    focus.predict("a", focused_before="p", touched=[first, previous])
+    prediction = focus.predict("b", focused_before="p", touched=[second, first])
+
+    assert focus.fail(prediction) is True
+    assert prediction.touched == [second, first, previous]
+    assert focus.stats()["superseded"] == 1
@@ -0,0 +1,64 @@
+from ui.common.scroll_accumulator import PIXELS_PER_STEP, ScrollAccumulator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_small_deltas_add_up_to_one_step():
+    scroll = ScrollAccumulator(threshold=1.0, max_rate=0)
+
+    assert [scroll.push(0.25) for _ in range(8)] == [0, 0, 0, 1, 0, 0, 0, 1]
+
+
+def test_reversing_direction_starts_over():
+    scroll = ScrollAccumulator(threshold=1.0, max_rate=0)
+
+    assert scroll.push(0.75) == 0
+    assert scroll.push(-0.5) == 0
+    assert scroll.push(-0.5) == -1
+
+
+def test_big_burst_acts_once():
+    scroll = ScrollAccumulator(threshold=1.0, max_rate=0)
+
+    assert scroll.push(5.5) == 1
+    assert scroll.push(0.25) == 0
+    assert scroll.push(0.25) == 1
+
+
+def test_pixel_deltas_are_scaled_to_notches():
+    scroll = ScrollAccumulator(threshold=1.0, max_rate=0)
+
+    assert scroll.push(PIXELS_PER_STEP / 2, pixels=True) == 0
+    assert scroll.push(PIXELS_PER_STEP / 2, pixels=True) == 1
+
+
+def test_steps_over_the_rate_limit_are_dropped():
+    clock = FakeClock()
+    scroll = ScrollAccumulator(threshold=1.0, max_rate=10, clock=clock)
+
+    # A free-spinning wheel: one notch per millisecond for half a second.
+    steps = []
+    for _ in range(500):
+        steps.append(scroll.push(1.0))
+        clock.now += 0.001
+
+    assert sum(steps) == 5
+    assert scroll.actions == 5
+    assert scroll.dropped == 495
+    assert scroll.events == 500
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("PY_DESKTOP_SCROLL_THRESHOLD", "2")
+    monkeypatch.setenv("PY_DESKTOP_SCROLL_MAX_RATE", "bogus")
+
+    scroll = ScrollAccumulator.from_env()
+
+    assert scroll.threshold == 2.0
+    assert scroll.min_interval == 1 / 8.0
@@ -1,6 +1,18 @@
+import asyncio
 import json
+import subprocess
 
-from services.scroll_ipc import parse_outputs, parse_workspaces
+from services import scroll_ipc
+from services.scroll_ipc import (
+    I3_IPC_HEADER,
+    I3_IPC_MESSAGE_TYPES,
+    ScrollIPC,
+    ScrollWorkspace,
+    pack_message,
+    parse_outputs,
+    parse_workspaces,
+    unpack_header,
+)
 
 
 def test_parse_outputs_filters_invalid_entries():
@@ -47,3 +59,142 @@ def test_parse_workspaces_reads_sway_like_json():
     assert workspaces[0].output == "eDP-1"
     assert workspaces[0].focused is True
     assert workspaces[1].visible is False
+
+
+WORKSPACES_REPLY = [
+    {"num": 1, "name": "1", "focused": True, "visible": True, "output": "eDP-1"},
+    {"num": 2, "name": "2", "focused": False, "visible": False, "output": "eDP-1"},
+]
+
+
+def test_pack_message_round_trips_header():
+    message = pack_message(I3_IPC_MESSAGE_TYPES["command"], "workspace 2")
+
+    length, msg_type = unpack_header(message[: I3_IPC_HEADER.size])
+
+    assert message[:6] == b"i3-ipc"
+    assert length == len("workspace 2")
+    assert msg_type == 0
+    assert message[I3_IPC_HEADER.size :] == b"workspace 2"
+
+
+def test_native_client_reuses_one_connection(fake_i3_server):
+    server = fake_i3_server({1: WORKSPACES_REPLY, 3: [{"name": "eDP-1", "focused": True}]})
+    ipc = ScrollIPC(socket_path=server.path)
+
+    workspaces = ipc.get_workspaces()
+    outputs = ipc.get_outputs()
+    ipc.get_workspaces()
+
+    assert [ws.num for ws in workspaces] == [1, 2]
+    assert [output.name for output in outputs] == ["eDP-1"]
+    assert server.connections == 1
+    assert [msg_type for msg_type, _ in server.requests] == [1, 3, 1]
+    ipc.close()
+
+
+def test_native_command_failure_is_reported(fake_i3_server):
+    server = fake_i3_server({0: [{"success": False, "error": "no such workspace"}]})
+    ipc = ScrollIPC(socket_path=server.path)
+
+    ok = ipc.focus_workspace(ScrollWorkspace(num=9, name="9", output=None, focused=False, visible=False))
+
+    assert ok is False
+    assert server.requests == [(0, "workspace 9")]
+    ipc.close()
+
+
+def test_falls_back_to_scrollmsg_when_socket_is_missing(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_run(command, **_kwargs):
+        calls.append(command)
+        return subprocess.CompletedProcess(command, 0, stdout=json.dumps(WORKSPACES_REPLY), stderr="")
+
+    monkeypatch.setattr(scroll_ipc.subprocess, "run", fake_run)
+    ipc = ScrollIPC(socket_path=str(tmp_path / "missing.sock"))
+
+    workspaces = ipc.get_workspaces()
+
+    assert [ws.num for ws in workspaces] == [1, 2]
+    assert calls[0][:4] == ["scrollmsg", "-r", "-t", "get_workspaces"]
+
+
+def test_socket_is_retried_after_a_failed_request(tmp_path, monkeypatch, fake_i3_server):
+    calls = []
+
+    def fake_run(command, **_kwargs):
+        calls.append(command)
+        return subprocess.CompletedProcess(command, 0, stdout=json.dumps(WORKSPACES_REPLY), stderr="")
+
+    monkeypatch.setattr(scroll_ipc.subprocess, "run", fake_run)
+    now = [0.0]
+    # The fixture's first server listens here; nothing does yet.
+    ipc = ScrollIPC(socket_path=str(tmp_path / "i3-0.sock"), clock=lambda: now[0])
+
+    ipc.get_workspaces()
+    server = fake_i3_server({1: WORKSPACES_REPLY})
+    ipc.get_workspaces()
+    assert len(calls) == 2
+    assert server.connections == 0
+
+    now[0] = scroll_ipc.SOCKET_RETRY_BACKOFF
+    workspaces = ipc.get_workspaces()
+
+    assert [ws.num for ws in workspaces] == [1, 2]
+    assert len(calls) == 2
+    assert server.connections == 1
+    ipc.close()
+
+
+def test_async_queries_share_one_connection(fake_i3_server):
+    server = fake_i3_server({1: WORKSPACES_REPLY, 3: [{"name": "eDP-1"}], 0: [{"success": True}]})
+    ipc = ScrollIPC(socket_path=server.path)
+
+    async def scenario():
+        workspaces, outputs = await asyncio.gather(ipc.get_workspaces_async(), ipc.get_outputs_async())
+        focused = await ipc.focus_workspace_async(workspaces[1])
+        ipc.close()
+        return workspaces, outputs, focused
+
+    workspaces, outputs, focused = asyncio.run(scenario())
+
+    assert [ws.num for ws in workspaces] == [1, 2]
+    assert [output.name for output in outputs] == ["eDP-1"]
+    assert focused is True
+    assert server.connections == 1
+    assert server.requests[-1] == (0, "workspace 2")
+
+
+def test_async_falls_back_to_scrollmsg_subprocess(tmp_path, monkeypatch):
+    calls = []
+
+    class FakeProc:
+        returncode = 0
+
+        async def communicate(self):
+            return json.dumps(WORKSPACES_REPLY).encode(), b""
+
+    async def fake_exec(*command, **_kwargs):
+        calls.append(list(command))
+        return FakeProc()
+
+    monkeypatch.setattr(scroll_ipc.asyncio, "create_subprocess_exec", fake_exec)
+    ipc = ScrollIPC(socket_path=str(tmp_path / "missing.sock"))
+
+    workspaces = asyncio.run(ipc.get_workspaces_async())
+
+    assert [ws.num for ws in workspaces] == [1, 2]
+    assert calls[0][:4] == ["scrollmsg", "-r", "-t", "get_workspaces"]
+
+
+def test_missing_scrollmsg_is_reported_not_raised(tmp_path, monkeypatch):
+    async def missing_exec(*command, **_kwargs):
+        raise FileNotFoundError(command[0])
+
+    monkeypatch.setattr(scroll_ipc.asyncio, "create_subprocess_exec", missing_exec)
+    ipc = ScrollIPC(socket_path=str(tmp_path / "missing.sock"))
+    workspace = ScrollWorkspace(num=2, name="2", output=None, focused=False, visible=False)
+
+    assert asyncio.run(ipc.focus_workspace_async(workspace)) is False
+    assert asyncio.run(ipc.quit_async()) is False
@@ -0,0 +1,74 @@
+import time
+
+from services.stall_watchdog import StallWatchdog
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_on_time_heartbeats_are_not_stalls():
+    clock = FakeClock()
+    watchdog = StallWatchdog(threshold=0.1, period=0.05, clock=clock, capture=lambda: ["frame"])
+
+    for _ in range(10):
+        clock.now += 0.06
+        assert watchdog.check() is False
+        assert watchdog.beat() is None
+
+    assert watchdog.stalls == 0
+    assert round(watchdog.stats()["lag"]["max_ms"]) == 10
+
+
+def test_stall_is_reported_with_the_stack_captured_during_it():
+    clock = FakeClock()
+    captured = []
+
+    def capture():
+        captured.append(clock.now)
+        return ["blocking_callback()"]
+
+    watchdog = StallWatchdog(threshold=0.1, period=0.05, clock=clock, capture=capture)
+
+    clock.now = 0.2
+    assert watchdog.check() is True
+    clock.now = 0.3
+    assert watchdog.check() is False
+    clock.now = 0.55
+    report = watchdog.beat()
+
+    assert captured == [0.2]
+    assert round(report.duration, 3) == 0.5
+    assert report.stack == ["blocking_callback()"]
+    stats = watchdog.stats()
+    assert stats["stalls"] == 1
+    assert stats["histogram"]["buckets"]["<=500"] == 1
+    assert stats["recent"] == [{"duration_ms": 500.0, "stack": ["blocking_callback()"]}]
+
+
+def blocking_callback():
+    time.sleep(0.3)
+
+
+def test_checker_thread_attributes_a_real_blocking_call():
+    watchdog = StallWatchdog(threshold=0.05, period=0.01)
+    watchdog.start(lambda _interval, _callback: 0)
+    try:
+        blocking_callback()
+        report = watchdog.beat()
+    finally:
+        watchdog.stop()
+
+    assert report is not None
+    assert report.duration >= 0.2
+    assert any("blocking_callback" in line for line in report.stack)
+
+
+def test_disabled_unless_threshold_is_set(monkeypatch):
+    monkeypatch.delenv("PY_DESKTOP_STALL_WATCHDOG_MS", raising=False)
+
+    assert StallWatchdog.start_from_env(lambda *_args: 0) is None
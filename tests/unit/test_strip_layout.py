@@ -0,0 +1,25 @@
+from ui.bar.strip_layout import ACTIVE_WIDTH, MARGIN, PILL_SIZE, hit_test, layout_pills, strip_width
+
+
+def test_pills_are_laid_out_left_to_right_and_centred():
+    pills = layout_pills([False, True, False], height=30)
+
+    assert [pill.x for pill in pills] == [
+        MARGIN,
+        PILL_SIZE + 3 * MARGIN,
+        PILL_SIZE + ACTIVE_WIDTH + 5 * MARGIN,
+    ]
+    assert [pill.width for pill in pills] == [PILL_SIZE, ACTIVE_WIDTH, PILL_SIZE]
+    assert {pill.y for pill in pills} == {(30 - PILL_SIZE) / 2}
+    assert strip_width([False, True, False]) == pills[-1].x + PILL_SIZE + MARGIN
+
+
+def test_hit_test_includes_margins():
+    pills = layout_pills([False, True, False], height=PILL_SIZE)
+
+    assert hit_test(pills, 0, 5) == 0
+    assert hit_test(pills, pills[1].x + ACTIVE_WIDTH - 1, 5) == 1
+    assert hit_test(pills, pills[2].x + PILL_SIZE + MARGIN - 1, 5) == 2
+    assert hit_test(pills, strip_width([False, True, False]), 5) is None
+    assert hit_test(pills, 5, PILL_SIZE + MARGIN) is None
+    assert hit_test([], 0, 0) is None
@@ -0,0 +1,61 @@
+import asyncio
+
+from services.synthetic_compositor import SyntheticCompositor
+from services.workspace_table import WorkspaceTable
+
+
+def _table(backend):
+    table = WorkspaceTable()
+    table.replace_all(asyncio.run(backend.get_records_async()))
+    return table
+
+
+def test_workspaces_are_spread_over_monitors():
+    backend = SyntheticCompositor(monitors=4, workspaces=10)
+    records = backend.records()
+
+    assert backend.outputs == ["SYN-0", "SYN-1", "SYN-2", "SYN-3"]
+    assert len(records) == 10
+    assert {record.output for record in records} == set(backend.outputs)
+    assert sum(record.active for record in records) == 4
+    assert sum(record.focused for record in records) == 1
+
+
+def test_focus_storm_events_replay_to_backend_state():
+    backend = SyntheticCompositor(monitors=4, workspaces=100, seed=3)
+    table = _table(backend)
+
+    for event in backend.focus_storm(500):
+        assert backend.apply_event(table, event) is not None
+
+    assert table.records() == backend.records()
+
+
+def test_hotplug_storm_requests_output_refresh_and_keeps_workspaces():
+    backend = SyntheticCompositor(monitors=4, workspaces=20)
+
+    events = backend.hotplug_storm(3)
+
+    assert len(events) == 6
+    assert all(backend.needs_output_refresh(event) for event in events)
+    assert backend.outputs == ["SYN-0", "SYN-1", "SYN-2", "SYN-3"]
+    assert len(backend.records()) == 20
+    assert {record.output for record in backend.records()} == {"SYN-0"}
+
+
+def test_from_env_reads_scale_and_storm(monkeypatch):
+    monkeypatch.setenv("PY_DESKTOP_SYNTHETIC_MONITORS", "16")
+    monkeypatch.setenv("PY_DESKTOP_SYNTHETIC_WORKSPACES", "1000")
+    monkeypatch.setenv("PY_DESKTOP_SYNTHETIC_STORM", "hotplug:20")
+
+    backend = SyntheticCompositor.from_env()
+
+    assert len(backend.outputs) == 16
+    assert len(backend.records()) == 1000
+    assert backend.storm == ("hotplug", 20)
+
+
+def test_from_env_falls_back_on_malformed_storm_count(monkeypatch):
+    monkeypatch.setenv("PY_DESKTOP_SYNTHETIC_STORM", "focus:lots")
+
+    assert SyntheticCompositor.from_env().storm == ("focus", 100)
@@ -0,0 +1,78 @@
+import gc
+import weakref
+
+from fakes import FakeBinding, FakeNiri, FakeNiriWorkspace
+from services.Compositor import Compositor
+
+
+def _compositor():
+    compositor = Compositor()
+    compositor._niri = FakeNiri()
+    return compositor
+
+
+def test_removed_workspace_releases_native_handlers_and_bindings():
+    compositor = _compositor()
+    native = FakeNiriWorkspace(1)
+    compositor._niri.workspaces = [native]
+    compositor._sync_niri_workspaces()
+    assert native._handlers
+
+    compositor._niri.workspaces = []
+    compositor._sync_niri_workspaces()
+
+    assert native._handlers == {}
+    assert compositor.workspaces == []
+
+
+def test_thousands_of_syncs_keep_handlers_and_objects_flat():
+    compositor = _compositor()
+    wrappers = weakref.WeakSet()
+    created = []
+    compositor.connect("workspace-added", lambda _c, workspace: wrappers.add(workspace))
+    compositor.connect("workspace-added", lambda _c, workspace: created.append(weakref.ref(workspace)))
+
+    def churn(rounds):
+        for i in range(rounds):
+            # Niri hands out fresh native objects on every change, some ids come and go.
+            compositor._niri.workspaces = [FakeNiriWorkspace(n) for n in range(1, 6)]
+            compositor._niri.workspaces.append(FakeNiriWorkspace(100 + i % 10))
+            compositor._sync_niri_workspaces()
+
+    churn(20)
+    gc.collect()
+    baseline = (FakeNiriWorkspace.live_handlers, FakeBinding.live, len(wrappers))
+
+    churn(2000)
+    gc.collect()
+
+    assert (FakeNiriWorkspace.live_handlers, FakeBinding.live, len(wrappers)) == baseline
+    assert len(compositor.workspaces) == 6
+    # Every wrapper this test created is dead except the ones still in use.
+    alive = [ref() for ref in created if ref() is not None]
+    assert len(created) > len(compositor.workspaces)
+    assert sorted(map(id, alive)) == sorted(map(id, compositor.workspaces))
+
+
+def test_workspace_models_emit_positional_items_changed():
+    compositor = _compositor()
+    natives = {n: FakeNiriWorkspace(n) for n in (1, 2, 3)}
+    dock = FakeNiriWorkspace(10, output="DP-1")
+    compositor._niri.workspaces = [*natives.values(), dock]
+    compositor._sync_niri_workspaces()
+    monitor = compositor.get_monitor_for_niri_connector("eDP-1")
+    model = compositor.get_workspace_model(monitor)
+    dock_model = compositor.get_workspace_model(compositor.get_monitor_for_niri_connector("DP-1"))
+    emitted = {"all": [], "eDP-1": [], "DP-1": []}
+    for name, observed in (("all", compositor.workspace_model), ("eDP-1", model), ("DP-1", dock_model)):
+        observed.connect(
+            "items-changed",
+            lambda _model, position, removed, added, name=name: emitted[name].append((position, removed, added)),
+        )
+
+    # Workspace 2 goes away and 5 appears; the wrappers of 1, 3 and 10 are kept.
+    compositor._niri.workspaces = [natives[1], natives[3], FakeNiriWorkspace(5), dock]
+    compositor._sync_niri_workspaces()
+
+    assert emitted == {"all": [(1, 1, 0), (2, 0, 1)], "eDP-1": [(1, 1, 0), (2, 0, 1)], "DP-1": []}
+    assert [model.get_item(i).id for i in range(model.get_n_items())] == [1, 3, 5]
@@ -0,0 +1,75 @@
+from services.workspace_reconcile import reconcile
+
+
+class Native:
+    def __init__(self, key, name=""):
+        self.key = key
+        self.name = name
+
+
+class Wrapper:
+    created = 0
+
+    def __init__(self, native):
+        Wrapper.created += 1
+        self.native = native
+        self.name = native.name
+
+    def update(self, native):
+        self.native = native
+        if self.name == native.name:
+            return False
+        self.name = native.name
+        return True
+
+
+def _reconcile(items, natives):
+    return reconcile(items, natives, lambda n: n.key, Wrapper, Wrapper.update)
+
+
+def test_initial_reconcile_creates_everything():
+    items = {}
+
+    result = _reconcile(items, [Native(1), Native(2)])
+
+    assert [w.native.key for w in result.added] == [1, 2]
+    assert result.layout_changed is True
+    assert list(items) == [1, 2]
+
+
+def test_unchanged_natives_keep_wrappers():
+    items = {}
+    _reconcile(items, [Native(1), Native(2)])
+    wrappers = dict(items)
+    created = Wrapper.created
+
+    result = _reconcile(items, [Native(1), Native(2)])
+
+    assert Wrapper.created == created
+    assert result.layout_changed is False
+    assert result.changed == []
+    assert items == wrappers
+
+
+def test_only_differences_are_added_removed_or_changed():
+    items = {}
+    _reconcile(items, [Native(1), Native(2, "b"), Native(3)])
+    kept = items[2]
+
+    result = _reconcile(items, [Native(2, "renamed"), Native(4)])
+
+    assert [w.native.key for w in result.added] == [4]
+    assert sorted(w.native.key for w in result.removed) == [1, 3]
+    assert result.changed == [kept]
+    assert items[2] is kept
+    assert [w.native.key for w in result.ordered] == [2, 4]
+
+
+def test_reorder_is_reported():
+    items = {}
+    _reconcile(items, [Native(1), Native(2)])
+
+    result = _reconcile(items, [Native(2), Native(1)])
+
+    assert result.order_changed is True
+    assert result.added == [] and result.removed == []
@@ -0,0 +1,110 @@
+from services.scroll_ipc import apply_workspace_event, is_output_event
+from services.workspace_table import WorkspaceRecord, WorkspaceTable
+
+
+def _ws_json(con_id, num, output="eDP-1", **flags):
+    return {"id": con_id, "num": num, "name": str(num), "output": output, **flags}
+
+
+def _table():
+    table = WorkspaceTable()
+    table.replace_all(
+        [
+            WorkspaceRecord(key=10, id=1, name="1", output="eDP-1", active=True, focused=True),
+            WorkspaceRecord(key=20, id=2, name="2", output="eDP-1"),
+            WorkspaceRecord(key=30, id=3, name="3", output="HDMI-A-1", active=True),
+        ]
+    )
+    return table
+
+
+def test_replace_all_reports_only_differences():
+    table = _table()
+
+    changed = table.replace_all(
+        [
+            WorkspaceRecord(key=10, id=1, name="1", output="eDP-1", active=True, focused=True),
+            WorkspaceRecord(key=20, id=2, name="two", output="eDP-1"),
+        ]
+    )
+
+    assert changed == {20, 30}
+
+
+def test_focus_event_touches_two_records():
+    table = _table()
+
+    changed = apply_workspace_event(
+        table,
+        {"change": "focus", "current": _ws_json(20, 2), "old": _ws_json(10, 1)},
+    )
+
+    assert changed == {10, 20}
+    assert table.get(20).active and table.get(20).focused
+    assert not table.get(10).active and not table.get(10).focused
+    assert table.get(30).active
+
+
+def test_focus_on_other_output_keeps_previous_visible():
+    table = _table()
+
+    changed = apply_workspace_event(
+        table,
+        {"change": "focus", "current": _ws_json(30, 3, output="HDMI-A-1")},
+    )
+
+    assert changed == {10, 30}
+    assert table.get(10).active is True
+    assert table.get(10).focused is False
+    assert table.focused_key == 30
+
+
+def test_init_and_empty_add_and_remove():
+    table = _table()
+
+    assert apply_workspace_event(table, {"change": "init", "current": _ws_json(40, 4)}) == {40}
+    assert apply_workspace_event(table, {"change": "empty", "current": _ws_json(40, 4)}) == {40}
+    assert 40 not in table
+
+
+def test_rename_and_move_keep_tracked_state():
+    table = _table()
+
+    apply_workspace_event(table, {"change": "rename", "current": {**_ws_json(10, 5), "name": "5:web"}})
+    changed = apply_workspace_event(
+        table,
+        {"change": "move", "current": {**_ws_json(10, 5, output="HDMI-A-1"), "name": "5:web"}},
+    )
+
+    record = table.get(10)
+    assert record.name == "5:web"
+    assert record.id == 5
+    assert record.output == "HDMI-A-1"
+    assert record.focused is True
+    assert changed == {10, 30}
+    assert table.active_key("HDMI-A-1") == 10
+
+
+def test_urgent_updates_single_record():
+    table = _table()
+
+    changed = apply_workspace_event(table, {"change": "urgent", "current": _ws_json(20, 2, urgent=True)})
+
+    assert changed == {20}
+    assert table.get(20).urgent is True
+
+
+def test_unappliable_events_request_resync():
+    table = _table()
+
+    assert apply_workspace_event(table, None) is None
+    assert apply_workspace_event(table, {"change": "unspecified"}) is None
+    assert apply_workspace_event(table, {"change": "reload", "current": None}) is None
+    assert apply_workspace_event(table, {"change": "rename", "current": _ws_json(99, 9)}) is None
+
+
+def test_output_events_are_told_apart_from_workspace_events():
+    assert is_output_event({"change": "unspecified"}) is True
+    assert is_output_event({"change": "reload", "current": None}) is False
+    assert is_output_event({"change": "focus", "current": _ws_json(10, 1)}) is False
+    assert is_output_event(None) is False
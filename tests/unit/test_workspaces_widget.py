@@ -0,0 +1,148 @@
+from gi.repository import Gdk
+
+from ui.bar import Workspaces as workspaces_module
+from ui.bar.Workspaces import Workspaces
+from ui.common.scroll_accumulator import ScrollAccumulator
+
+
+class FakeWorkspace:
+    def __init__(self, workspace_id):
+        self.id = workspace_id
+
+
+class FakeButton:
+    created = 0
+
+    def __init__(self, workspace, on_active=None):
+        FakeButton.created += 1
+        self.workspace = workspace
+        self.on_active = on_active
+        self.parent = None
+        self.disposed = False
+
+    def get_parent(self):
+        return self.parent
+
+    def get_prev_sibling(self):
+        children = self.parent.children
+        index = children.index(self)
+        return children[index - 1] if index else None
+
+    def dispose(self):
+        self.disposed = True
+
+
+class FakeRoot:
+    def get_monitor(self):
+        return 0
+
+
+class FakeCompositor:
+    def __init__(self):
+        self.workspaces = []
+
+        self.focused = []
+
+    def get_workspaces_for_monitor(self, gdk_id=None):
+        return list(self.workspaces)
+
+    def focus_workspace(self, workspace):
+        self.focused.append(workspace)
+
+
+class FakeScrollController:
+    def __init__(self, unit=Gdk.ScrollUnit.WHEEL):
+        self.unit = unit
+
+    def get_unit(self):
+        return self.unit
+
+
+class FakeBar:
+    """Stands in for the Gtk.Box side of Workspaces."""
+
+    def __init__(self):
+        self.children = []
+        self._buttons = {}
+        self._ordered = []
+        self._positions = {}
+        self._active_button = None
+        self._scroll = ScrollAccumulator(max_rate=0)
+        self._strip = None
+        self.last_update = {}
+        self.compositor = FakeCompositor()
+
+    def get_root(self):
+        return FakeRoot()
+
+    def remove(self, child):
+        self.children.remove(child)
+        child.parent = None
+
+    def insert_child_after(self, child, sibling):
+        self.children.insert(self.children.index(sibling) + 1 if sibling else 0, child)
+        child.parent = self
+
+    def reorder_child_after(self, child, sibling):
+        self.children.remove(child)
+        self.insert_child_after(child, sibling)
+
+    def _record_update(self, created, removed, moved):
+        Workspaces._record_update(self, created, removed, moved)
+
+    def _on_button_active(self, button, is_active):
+        Workspaces._on_button_active(self, button, is_active)
+
+    def update(self, workspaces):
+        self.compositor.workspaces = workspaces
+        Workspaces.on_workspaces_changed(self)
+        return [button.workspace for button in self.children]
+
+
+def test_switching_reuses_every_button(monkeypatch):
+    monkeypatch.setattr(workspaces_module, "WorkspaceButton", FakeButton)
+    bar = FakeBar()
+    workspaces = [FakeWorkspace(n) for n in range(1, 6)]
+    bar.update(workspaces)
+    created = FakeButton.created
+
+    for _ in range(50):
+        assert bar.update(workspaces) == workspaces
+
+    assert FakeButton.created == created
+    assert bar.last_update == {"created": 0, "removed": 0, "moved": 0}
+
+
+def test_only_differences_are_inserted_removed_and_moved(monkeypatch):
+    monkeypatch.setattr(workspaces_module, "WorkspaceButton", FakeButton)
+    bar = FakeBar()
+    one, two, three, four = (FakeWorkspace(n) for n in range(1, 5))
+    bar.update([one, two, three])
+    kept = {button.workspace: button for button in bar.children}
+
+    assert bar.update([three, one, four]) == [three, one, four]
+
+    assert bar.last_update["created"] == 1
+    assert bar.last_update["removed"] == 1
+    assert kept[two].disposed is True
+    assert bar.children[0] is kept[three]
+    assert bar.children[1] is kept[one]
+
+
+def test_scroll_steps_from_the_tracked_active_button(monkeypatch):
+    monkeypatch.setattr(workspaces_module, "WorkspaceButton", FakeButton)
+    bar = FakeBar()
+    workspaces = [FakeWorkspace(n) for n in range(1, 5)]
+    bar.update(workspaces)
+    second = bar.children[1]
+    second.on_active(second, True)
+
+    Workspaces.on_scroll(bar, FakeScrollController(), 0, 1.0)
+    Workspaces.on_scroll(bar, FakeScrollController(Gdk.ScrollUnit.SURFACE), 0, -10.0)
+
+    assert bar.compositor.focused == [workspaces[2]]
+
+    second.on_active(second, False)
+    Workspaces.on_scroll(bar, FakeScrollController(), 0, 1.0)
+
+    assert bar.compositor.focused == [workspaces[2], workspaces[0]]